@@ -0,0 +1,125 @@
+// Service worker for the built site. tools/build_dist.py fills in the
+// placeholders and writes it to dist/sw.js; edit this file, not the output.
+//
+// - Pages: network first (with a timeout), falling back to the cached copy.
+// - News data (news/*.json, latest.json, feeds): stale-while-revalidate.
+// - Hashed assets (name.<hash>.ext): cache first; their content never changes.
+// - Article images under assets/news/ live in their own, smaller cache.
+// Runtime caches are bounded and drop their oldest entries first.
+
+const VERSION = "{{VERSION}}";
+const MANIFEST = "{{MANIFEST}}";
+const PRECACHE = `precache-${VERSION}`;
+const CACHES = {
+  pages: { name: "pages-v1", limit: 40 },
+  data: { name: "news-data-v1", limit: 80 },
+  assets: { name: "assets-v1", limit: 200 },
+  articles: { name: "news-images-v1", limit: 60 },
+};
+const NETWORK_TIMEOUT_MS = 4000;
+const HASHED_RE = /\.[0-9a-f]{{{HASH_LENGTH}}}\.[a-z0-9]+$/;
+const DATA_RE = /^(news\/.+\.json|latest\.json|feed\.xml|atom\.xml|feed\.json)$/;
+
+const scopePath = new URL(self.registration.scope).pathname;
+
+function sitePath(url) {
+  return url.pathname.startsWith(scopePath) ? url.pathname.slice(scopePath.length) : null;
+}
+
+async function trim(name, limit) {
+  const cache = await caches.open(name);
+  const keys = await cache.keys();
+  // Keys come back in insertion order, so the first ones are the oldest.
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - limit)).map((key) => cache.delete(key)));
+}
+
+async function store(kind, request, response) {
+  if (!response || !response.ok || response.type === "opaque") return;
+  const { name, limit } = CACHES[kind];
+  const cache = await caches.open(name);
+  await cache.put(request, response);
+  await trim(name, limit);
+}
+
+self.addEventListener("install", (event) => {
+  event.waitUntil((async () => {
+    const manifest = await (await fetch(MANIFEST, { cache: "no-cache" })).json();
+    const cache = await caches.open(PRECACHE);
+    await Promise.all(manifest.entries.map(async ({ url, revision }) => {
+      // Hashed files cached by an earlier version are reused instead of downloaded again.
+      const cached = revision === null && (await caches.match(url));
+      const response = cached || (await fetch(url, { cache: "no-cache" }));
+      if (!response.ok) throw new Error(`precache ${url}: ${response.status}`);
+      await cache.put(url, response);
+    }));
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil((async () => {
+    const keep = new Set([PRECACHE, ...Object.values(CACHES).map((entry) => entry.name)]);
+    const names = await caches.keys();
+    await Promise.all(names.filter((name) => !keep.has(name)).map((name) => caches.delete(name)));
+    await self.clients.claim();
+  })());
+});
+
+async function networkFirst(event, path) {
+  const fallback = async () => {
+    const runtime = await caches.open(CACHES.pages.name);
+    return (await runtime.match(event.request, { ignoreSearch: true }))
+      || (await caches.match(path || "index.html", { ignoreSearch: true }));
+  };
+  const network = fetch(event.request).then((response) => {
+    event.waitUntil(store("pages", event.request, response.clone()));
+    return response;
+  });
+  const timeout = new Promise((resolve) => setTimeout(resolve, NETWORK_TIMEOUT_MS));
+  try {
+    const first = await Promise.race([network, timeout.then(fallback)]);
+    return first || (await network);
+  } catch (error) {
+    return (await fallback()) || Response.error();
+  }
+}
+
+async function staleWhileRevalidate(event) {
+  const runtime = await caches.open(CACHES.data.name);
+  // The runtime copy is newer than the precached one whenever both exist.
+  const cached = (await runtime.match(event.request)) || (await caches.match(event.request));
+  const network = fetch(event.request).then((response) => {
+    event.waitUntil(store("data", event.request, response.clone()));
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => undefined));
+    return cached;
+  }
+  return network;
+}
+
+async function cacheFirst(event, kind) {
+  const cached = await caches.match(event.request);
+  if (cached) return cached;
+  const response = await fetch(event.request);
+  event.waitUntil(store(kind, event.request, response.clone()));
+  return response;
+}
+
+self.addEventListener("fetch", (event) => {
+  const { request } = event;
+  if (request.method !== "GET" || request.headers.has("range")) return;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+  const path = sitePath(url);
+  if (path === null) return;
+
+  if (request.mode === "navigate") {
+    event.respondWith(networkFirst(event, path));
+  } else if (DATA_RE.test(path)) {
+    event.respondWith(staleWhileRevalidate(event));
+  } else if (path.startsWith("assets/") && HASHED_RE.test(path)) {
+    event.respondWith(cacheFirst(event, path.startsWith("assets/news/") ? "articles" : "assets"));
+  }
+});
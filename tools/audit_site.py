@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Check the site for broken references, unused and duplicate assets and page weight.
+
+Every page in the site root, every HTML file and stylesheet under ``assets/``
+and the published news JSON (``latest.json``, ``news/**/*.json``) is parsed
+on a thread pool, and each local reference is resolved against the files on
+disk:
+
+* ``src``, ``href``, ``poster``, ``srcset`` and ``imagesrcset`` attributes,
+  including ``<use href>`` icon references;
+* ``url()`` in stylesheets, ``<style>`` blocks and ``style`` attributes;
+* string literals naming a local file in inline scripts and JSON, such as
+  ``fetch('./news/manifest.json')`` or a fallback image path. Paths built
+  at runtime (template literals with ``${...}``) are skipped.
+
+The report lists references with no file behind them, files under
+``assets/`` that nothing references, files with identical contents and the
+transfer weight of each top-level page: the HTML plus everything it loads
+up front (stylesheets, scripts, images, preloads and fetched JSON, each
+counted once). An image with responsive candidates is weighed as the widest
+candidate of its first ``<source>`` (or of its own ``srcset``), which is what
+a large screen downloads; the ``src`` fallback and the other candidates are
+checked but not weighed, nor are links to other pages.
+
+The exit status is 1 when any reference is broken or a page is heavier than
+``--budget`` KB. ``--allow-broken`` still lists broken references but only
+fails on the budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from build_dist import SKIP
+
+ROOT = Path(__file__).resolve().parents[1]
+ASSETS_DIR = ROOT / "assets"
+DATA_FILES = ("latest.json",)
+DATA_DIRS = ("news",)
+DEFAULT_BUDGET_KB = 1500
+
+FILE_EXTENSIONS = (
+    "html", "css", "js", "json", "svg", "png", "jpg", "jpeg", "gif", "webp", "avif",
+    "ico", "mp4", "webm", "pdf", "woff", "woff2", "ttf",
+)
+EXTENSION = r"\.(?:" + "|".join(FILE_EXTENSIONS) + r")"
+# A quoted path to a local file: './assets/a.png', "news/manifest.json".
+LITERAL_RE = re.compile(r"([\"'`])((?:\.{1,2}/)?[\w][\w ./()%-]*" + EXTENSION + r")\1", re.I)
+LOCAL_PATH_RE = re.compile(r"^(?:\.{1,2}/)?[\w][\w ./()%-]*" + EXTENSION + r"$", re.I)
+CSS_URL_RE = re.compile(r"url\(\s*([\"']?)([^\"')\s]+)\1\s*\)")
+EXTERNAL_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*:|//|#)", re.I)
+# Tags whose src/href the browser fetches while loading the page.
+LOAD_LINK_RELS = {"stylesheet", "icon", "shortcut icon", "preload", "modulepreload", "apple-touch-icon"}
+
+
+@dataclass
+class Reference:
+    target: str  # resolved path relative to ROOT
+    raw: str
+    # "load" for resources fetched with the page, "link" for navigation.
+    kind: str
+
+
+@dataclass
+class Scan:
+    source: str
+    size: int
+    digest: str
+    references: List[Reference] = field(default_factory=list)
+
+
+def rel_path(path: Path) -> str:
+    return path.relative_to(ROOT).as_posix()
+
+
+def resolve(base: str, url: str) -> Optional[str]:
+    """Path of ``url`` relative to ROOT, or None for external, in-page and runtime-built URLs."""
+    url = url.strip()
+    if not url or "${" in url or EXTERNAL_RE.match(url):
+        return None
+    url = re.split(r"[?#]", url, maxsplit=1)[0]
+    if not url:
+        return None
+    url = unquote(url)
+    path = url.lstrip("/") if url.startswith("/") else posixpath.join(base, url)
+    return posixpath.normpath(path)
+
+
+def srcset_urls(value: str) -> List[str]:
+    return [candidate.split()[0] for candidate in value.split(",") if candidate.split()]
+
+
+def widest(value: str) -> Optional[str]:
+    """The candidate of a ``srcset`` with the largest ``w`` descriptor (the first if none has one)."""
+    best: Optional[Tuple[float, str]] = None
+    for candidate in value.split(","):
+        parts = candidate.split()
+        if not parts:
+            continue
+        width = float(parts[1][:-1]) if len(parts) > 1 and parts[1].endswith("w") else 0.0
+        if best is None or width > best[0]:
+            best = (width, parts[0])
+    return best[1] if best else None
+
+
+class PageParser(HTMLParser):
+    """Collects the references in one HTML document."""
+
+    def __init__(self, base: str) -> None:
+        super().__init__(convert_charrefs=True)
+        self.base = base
+        self.references: List[Reference] = []
+        self.in_script = False
+        self.in_style = False
+        # srcset of the first <source> in the open <picture>.
+        self.picture: Optional[str] = None
+
+    def add(self, url: str, kind: str) -> None:
+        target = resolve(self.base, url)
+        if target:
+            self.references.append(Reference(target, url, kind))
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        values = {name: value or "" for name, value in attrs}
+        self.in_script = tag == "script" and "src" not in values
+        self.in_style = tag == "style"
+        rel = values.get("rel", "").lower()
+        if tag == "picture":
+            self.picture = ""
+        elif tag == "source" and self.picture == "" and values.get("srcset"):
+            self.picture = values["srcset"]
+        responsive = self.picture or values.get("srcset") or values.get("imagesrcset")
+        for name in ("src", "poster", "data-src"):
+            if name in values:
+                self.add(values[name], "link" if tag == "img" and responsive else "load")
+        for name in ("srcset", "imagesrcset"):
+            if name in values:
+                for url in srcset_urls(values[name]):
+                    self.add(url, "link")
+        if tag == "img" and responsive:
+            self.add(widest(responsive) or "", "load")
+        if "href" in values:
+            loads = tag == "use" or (tag == "link" and rel in LOAD_LINK_RELS)
+            self.add(values["href"], "load" if loads else "link")
+        if "style" in values:
+            for match in CSS_URL_RE.finditer(values["style"]):
+                self.add(match.group(2), "load")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "picture":
+            self.picture = None
+        if tag in ("script", "style"):
+            self.in_script = self.in_style = False
+
+    def handle_data(self, data: str) -> None:
+        if self.in_script:
+            for match in LITERAL_RE.finditer(data):
+                self.add(match.group(2), "load")
+        elif self.in_style:
+            for match in CSS_URL_RE.finditer(data):
+                self.add(match.group(2), "load")
+
+
+def json_strings(value: object) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from json_strings(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from json_strings(item)
+
+
+def scan_file(path: Path) -> Scan:
+    data = path.read_bytes()
+    source = rel_path(path)
+    scan = Scan(source, len(data), hashlib.sha256(data).hexdigest())
+    base = posixpath.dirname(source)
+    # The legacy programme pages are TIS-620; references are ASCII either way.
+    text = data.decode("utf-8", errors="replace")
+    suffix = path.suffix.lower()
+    if suffix == ".html":
+        parser = PageParser(base)
+        parser.feed(text)
+        parser.close()
+        scan.references = parser.references
+    elif suffix == ".css":
+        for match in CSS_URL_RE.finditer(text):
+            target = resolve(base, match.group(2))
+            if target:
+                scan.references.append(Reference(target, match.group(2), "load"))
+    elif suffix == ".json":
+        # Paths in the published data are used by the pages in the site root.
+        for value in json_strings(json.loads(text)):
+            if LOCAL_PATH_RE.match(value):
+                target = resolve("", value)
+                if target:
+                    scan.references.append(Reference(target, value, "load"))
+    return scan
+
+
+def file_digest(path: Path) -> Tuple[str, str, int]:
+    data = path.read_bytes()
+    return rel_path(path), hashlib.sha256(data).hexdigest(), len(data)
+
+
+def site_pages() -> List[Path]:
+    return [path for path in sorted(ROOT.glob("*.html")) if not path.name.startswith("_")]
+
+
+def scan_sources() -> List[Path]:
+    sources = site_pages()
+    sources += sorted(path for path in ASSETS_DIR.rglob("*") if path.suffix.lower() in (".html", ".css") and path.is_file())
+    sources += [ROOT / name for name in DATA_FILES if (ROOT / name).exists()]
+    for folder in DATA_DIRS:
+        sources += sorted((ROOT / folder).rglob("*.json"))
+    return sources
+
+
+def asset_files() -> List[Path]:
+    return [path for path in sorted(ASSETS_DIR.rglob("*")) if path.is_file() and rel_path(path) not in SKIP]
+
+
+def page_weight(scan: Scan, sizes: Dict[str, int], scans: Dict[str, Scan]) -> Tuple[int, int]:
+    """Bytes of the page plus everything it loads, and the number of loaded files."""
+    loaded = {ref.target for ref in scan.references if ref.kind == "load" and ref.target in sizes}
+    # Stylesheets pull in their own url() references.
+    for target in [target for target in loaded if target.endswith(".css") and target in scans]:
+        loaded.update(ref.target for ref in scans[target].references if ref.target in sizes)
+    loaded.discard(scan.source)
+    return scan.size + sum(sizes[target] for target in loaded), len(loaded)
+
+
+def kb(size: int) -> str:
+    return f"{size / 1024:,.1f} KB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ตรวจลิงก์เสีย ไฟล์ที่ไม่ได้ใช้ ไฟล์ซ้ำ และน้ำหนักของแต่ละหน้า")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_KB, help=f"น้ำหนักสูงสุดต่อหน้า (KB, ค่าเริ่มต้น {DEFAULT_BUDGET_KB})")
+    parser.add_argument("--allow-broken", action="store_true", help="แสดงลิงก์เสียแต่ไม่จบด้วยสถานะ 1")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 4, help="จำนวนเธรดที่ใช้อ่านไฟล์")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    sources = scan_sources()
+    assets = asset_files()
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        scans = list(pool.map(scan_file, sources))
+        digests = list(pool.map(file_digest, assets))
+
+    sizes: Dict[str, int] = {rel: size for rel, _, size in digests}
+    hashes: Dict[str, str] = {rel: digest for rel, digest, _ in digests}
+    for scan in scans:
+        sizes[scan.source] = scan.size
+        hashes[scan.source] = scan.digest
+    by_source = {scan.source: scan for scan in scans}
+
+    referenced: Set[str] = set()
+    missing: Dict[str, Set[str]] = defaultdict(set)
+    for scan in scans:
+        for ref in scan.references:
+            referenced.add(ref.target)
+            if not (ROOT / ref.target).is_file():
+                missing[ref.target].add(scan.source)
+
+    print(f"ไฟล์ที่ถูกอ้างถึงแต่ไม่มีอยู่ ({len(missing)}):")
+    for target in sorted(missing):
+        print(f"  {target}  ← {', '.join(sorted(missing[target]))}")
+
+    orphans = [rel for rel in sizes if rel.startswith("assets/") and rel not in referenced]
+    print(f"\nไฟล์ใน assets/ ที่ไม่มีหน้าไหนอ้างถึง ({len(orphans)}, {kb(sum(sizes[rel] for rel in orphans))}):")
+    for rel in sorted(orphans):
+        print(f"  {rel} ({kb(sizes[rel])})")
+
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for rel, digest in hashes.items():
+        groups[digest].append(rel)
+    duplicates = sorted(sorted(group) for group in groups.values() if len(group) > 1)
+    print(f"\nไฟล์ที่เนื้อหาซ้ำกัน ({len(duplicates)} ชุด):")
+    for group in duplicates:
+        print(f"  {' = '.join(group)} ({kb(sizes[group[0]])} ต่อไฟล์)")
+
+    print(f"\nน้ำหนักของแต่ละหน้า (HTML + ไฟล์ที่โหลดพร้อมหน้า, งบ {args.budget:,.0f} KB):")
+    over: List[str] = []
+    for path in site_pages():
+        scan = by_source[rel_path(path)]
+        weight, count = page_weight(scan, sizes, by_source)
+        flag = ""
+        if weight > args.budget * 1024:
+            over.append(scan.source)
+            flag = "  เกินงบ"
+        print(f"  {scan.source:<16} {kb(weight):>12}  (HTML {kb(scan.size)} + {count} ไฟล์){flag}")
+
+    print(f"\nตรวจ {len(scans)} ไฟล์ใน {time.perf_counter() - started:.2f} วินาที")
+    if over or (missing and not args.allow_broken):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
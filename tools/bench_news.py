@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""Benchmarks for the news tools at archive sizes far past today's news.json.
+
+For each size in ``--sizes`` a synthetic archive is generated (Thai titles,
+summaries and bodies from ``thai_words.txt`` plus made-up names, three
+images and two links per entry, dates in every format ``news_dates``
+accepts) and written to a temporary directory, so the real news.json is
+never touched. The same seed always gives the same archive.
+
+Timed cases, each run ``--repeat`` times:
+
+* ``load``: ``NewsStore.load()`` of the snapshot.
+* ``normalize``: ``normalize_images`` and ``normalize_links`` over every entry.
+* ``search_build`` / ``search_query``: ``SearchIndex.build`` and a set of queries.
+* ``list_load`` / ``list_refresh``: the editor's ``NewsList`` filled with the
+  archive, then ``_refresh_list`` (search filter plus select). Skipped when
+  Tk has no display.
+* ``publish_pages`` / ``publish_items`` / ``publish_search``: the JSON that
+  ``publish_news.py`` writes, serialized the same way.
+* ``render_cards``: the card HTML ``build_site.py`` pre-renders into
+  index.html and news.html.
+* ``save_put`` / ``save_move`` / ``save_batch`` / ``save_snapshot``: one
+  edited entry through ``put`` (both editors), one whose date changed, ten
+  through ``put_many`` (import and backfill), and a full rewrite.
+
+Byte sizes of the published JSON and card HTML are recorded next to the
+timings. Results go to ``--output`` as JSON; when ``--baseline`` exists each
+case is compared with it and the run exits with status 1 if any case is
+slower, or any output larger, by more than ``--threshold`` percent.
+``--save-baseline`` stores the run as the new baseline. Compare runs from
+the same machine only, and expect the 100k archive to take several minutes:
+``search_build`` and ``publish_search`` segment every entry's text.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from news_dates import BE_OFFSET, THAI_MONTHS, apply_date_key
+from news_schema import normalize_images, normalize_links
+from news_search import WORDS_PATH, SearchIndex, build_shards
+from news_store import NewsStore
+from publish_news import LATEST_COUNT, PAGE_SIZE, build_latest, build_pages, full_fields
+from render_news import render_home_card, render_news_card
+
+ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = ROOT / ".bench"
+RESULTS_PATH = BENCH_DIR / "results.json"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+RESULTS_VERSION = 1
+DEFAULT_SIZES = "100,10000,100000"
+# Differences below this many seconds are timer noise, whatever the ratio.
+NOISE_FLOOR = 0.002
+
+TAGS = ["ข่าว/ประกาศ", "กิจกรรม", "ประชาสัมพันธ์", "รับสมัคร", "ผลงานวิจัย", "ทุนการศึกษา"]
+AUTHORS = [
+    "ดร. นพ. นรัตถพล เจริญพันธุ์",
+    "ผศ. ดร. สุภาพร ใจดี",
+    "รศ. ดร. วิทยา ศรีสุข",
+    "งานประชาสัมพันธ์ภาควิชา",
+    "อ. ดร. กมลชนก แสงทอง",
+]
+LATIN_WORDS = ["MU", "PH", "Health", "Education", "Workshop", "Zoom", "2025", "COVID-19", "SDGs", "Online"]
+CONSONANTS = "กขคงจชซดตถทนบปผพฟมยรลวสหอ"
+VOWELS = ["า", "ิ", "ี", "ุ", "ู", "ั", "ำ", "ะ", ""]
+FINALS = ["", "", "น", "ม", "ง", "ก", "ด", "บ", "ย"]
+QUERIES = ["อบรม", "สุขศึกษา", "ประชุมวิชาการ", "ทุน 2025", "workshop", "พฤติกรรม สุขภาพ", "นักศึกษา"]
+
+
+def word_pool() -> List[str]:
+    words = []
+    for line in WORDS_PATH.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            words.append(line)
+    return words
+
+
+def made_up_word(rng: random.Random) -> str:
+    """A pronounceable word the dictionary does not know, like a person's name."""
+    return "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) + rng.choice(FINALS) for _ in range(rng.randint(2, 3)))
+
+
+def phrase(rng: random.Random, words: List[str], count: int) -> str:
+    # Thai writes words together and puts spaces between phrases.
+    parts = []
+    run: List[str] = []
+    for _ in range(count):
+        roll = rng.random()
+        run.append(made_up_word(rng) if roll < 0.08 else rng.choice(LATIN_WORDS) if roll < 0.12 else rng.choice(words))
+        if len(run) >= rng.randint(3, 6):
+            parts.append("".join(run))
+            run = []
+    if run:
+        parts.append("".join(run))
+    return " ".join(parts)
+
+
+def date_text(rng: random.Random, day: date) -> str:
+    style = rng.random()
+    if style < 0.5:
+        return f"{day.day:02d}/{day.month:02d}/{day.year}"
+    if style < 0.8:
+        return f"{day.day}/{day.month}/{day.year + BE_OFFSET}"
+    month = max((name for name, number in THAI_MONTHS.items() if number == day.month), key=len)
+    return f"{day.day} {month} {day.year + BE_OFFSET}"
+
+
+def synthetic_entry(rng: random.Random, words: List[str], number: int) -> Dict[str, Any]:
+    day = date(2015, 1, 1) + timedelta(days=rng.randrange(11 * 365))
+    slug = f"{number:06d}"
+    entry = {
+        "id": f"bench{slug}",
+        "title": phrase(rng, words, rng.randint(6, 12)),
+        "date": date_text(rng, day),
+        "tag": rng.choice(TAGS),
+        "by": rng.choice(AUTHORS),
+        "summary": phrase(rng, words, rng.randint(15, 30)),
+        "body": "\n\n".join(phrase(rng, words, rng.randint(20, 40)) for _ in range(rng.randint(2, 3))),
+        "images": [f"./assets/news/{slug}-{index}.webp" for index in range(1, 4)],
+        "links": [
+            {"label": "ลงทะเบียน", "url": f"https://forms.gle/bench{slug}"},
+            {"label": "รายละเอียดเพิ่มเติม", "url": f"https://ph.mahidol.ac.th/news/{slug}"},
+        ],
+    }
+    apply_date_key(entry)
+    return entry
+
+
+def synthetic_archive(size: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(f"{seed}:{size}")
+    words = word_pool()
+    return [synthetic_entry(rng, words, number) for number in range(size)]
+
+
+def measure(action: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        action()
+        runs.append(time.perf_counter() - start)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def dumps(data: Any) -> str:
+    # Same serialization as publish_news.write_json().
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def byte_size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def news_list_factory() -> Tuple[Optional[Callable[[], Any]], str]:
+    """A constructor for the editor's ``NewsList``, or None and the reason it is unavailable."""
+    try:
+        import tkinter as tk
+
+        from news_editor_gui import NewsList
+    except ImportError as exc:  # pragma: no cover - tkinter is optional on some Pythons
+        return None, f"ไม่มี tkinter ({exc})"
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        return None, f"ไม่มีจอแสดงผลสำหรับ Tk ({exc})"
+    root.withdraw()
+    return (lambda: NewsList(root, lambda entry_id: None)), ""
+
+
+class Bench:
+    def __init__(self, workdir: Path, repeat: int, list_factory: Optional[Callable[[], Any]]) -> None:
+        self.workdir = workdir
+        self.repeat = repeat
+        self.list_factory = list_factory
+
+    def run(self, size: int, seed: int) -> Dict[str, Any]:
+        timings: Dict[str, Dict[str, Any]] = {}
+        sizes: Dict[str, int] = {}
+
+        def timed(name: str, action: Callable[[], Any], repeat: Optional[int] = None) -> None:
+            timings[name] = measure(action, repeat or self.repeat)
+            print(f"  {name:<15} {timings[name]['min'] * 1000:>11.1f} ms")
+
+        print(f"คลังข่าว {size:,} รายการ")
+        items = synthetic_archive(size, seed)
+        path = self.workdir / f"news-{size}.json"
+        NewsStore(path).rewrite(items)
+        sizes["news_json"] = path.stat().st_size
+
+        timed("load", lambda: NewsStore(path).load())
+        store = NewsStore(path)
+        items = store.load()
+
+        def normalize() -> None:
+            for entry in items:
+                normalize_images(entry)
+                normalize_links(entry)
+
+        timed("normalize", normalize)
+
+        index = SearchIndex.build(items)
+        timed("search_build", lambda: SearchIndex.build(items))
+        timed("search_query", lambda: [index.search(query) for query in QUERIES])
+
+        if self.list_factory:
+            news_list = self.list_factory()
+            news_list.set_entries(items)
+            selected = items[len(items) // 2]["id"]
+
+            def refresh() -> None:
+                # NewsEditor._refresh_list() for each query, then clearing the filter.
+                for query in QUERIES + [""]:
+                    news_list.set_filter(index.search(query) if query else None)
+                    news_list.select(selected)
+
+            timed("list_load", lambda: news_list.set_entries(items))
+            timed("list_refresh", refresh)
+            news_list.destroy()
+
+        pages: List[List[Dict[str, Any]]] = []
+
+        def publish_pages() -> None:
+            pages[:] = build_pages(items)
+            sizes["pages_json"] = sum(byte_size(dumps(page)) for page in pages)
+            sizes["latest_json"] = byte_size(dumps(build_latest(items)))
+
+        def publish_items() -> None:
+            sizes["items_json"] = sum(byte_size(dumps(full_fields(entry))) for entry in items)
+
+        def publish_search() -> None:
+            meta, shards = build_shards(items, PAGE_SIZE)
+            sizes["search_meta_json"] = byte_size(dumps(meta))
+            sizes["search_json"] = sum(byte_size(dumps(terms)) for terms in shards.values())
+
+        def render_cards() -> None:
+            # What build_site.py pre-renders: the first page on news.html, the latest on index.html.
+            lines = [line for card in pages[0] for line in render_news_card(card, "          ")]
+            lines += [line for card in pages[0][:LATEST_COUNT] for line in render_home_card(card, "          ")]
+            sizes["cards_html"] = byte_size("\n".join(lines))
+
+        timed("publish_pages", publish_pages)
+        timed("publish_items", publish_items)
+        timed("publish_search", publish_search)
+        timed("render_cards", render_cards)
+
+        edited = items[len(items) // 3]
+        batch = [dict(entry) for entry in items[len(items) // 2 :][:10]]
+
+        def save_put() -> None:
+            edited["summary"] = f"{edited['summary']} แก้ไข"
+            store.put(edited)
+
+        moving = [edited]
+
+        def save_move() -> None:
+            # Alternate between the oldest and newest end so every run moves the entry.
+            moved = dict(moving[0])
+            moved["date"] = "01/01/2014" if moved.get("dateKey", "") > "2014-01-01" else "01/01/2026"
+            store.put(moved)
+            moving[0] = moved
+
+        def save_batch() -> None:
+            for entry in batch:
+                entry["summary"] = f"{entry['summary']} แก้ไข"
+            store.put_many(batch)
+
+        timed("save_put", save_put)
+        timed("save_move", save_move)
+        timed("save_batch", save_batch)
+        timed("save_snapshot", lambda: store.rewrite(items))
+        sizes["news_json"] = path.stat().st_size
+        return {"timings": timings, "sizes": sizes}
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Human-readable regressions of ``results`` against ``baseline``."""
+    limit = 1 + threshold / 100
+    regressions: List[str] = []
+    for size, run in results["archives"].items():
+        base = baseline.get("archives", {}).get(size)
+        if not base:
+            continue
+        for name, timing in run["timings"].items():
+            before = base["timings"].get(name)
+            if not before:
+                continue
+            now, then = timing["min"], before["min"]
+            if now > then * limit and now - then > NOISE_FLOOR:
+                regressions.append(
+                    f"{size} รายการ {name}: {then * 1000:.1f} → {now * 1000:.1f} ms (+{(now / then - 1) * 100:.0f}%)"
+                )
+        for name, now in run["sizes"].items():
+            then = base["sizes"].get(name)
+            if then and now > then * limit:
+                regressions.append(f"{size} รายการ {name}: {then:,} → {now:,} ไบต์ (+{(now / then - 1) * 100:.0f}%)")
+    return regressions
+
+
+def write_results(path: Path, results: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="วัดเวลาเครื่องมือข่าวกับคลังข่าวสังเคราะห์ขนาดใหญ่")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"จำนวนข่าวในแต่ละคลัง คั่นด้วยจุลภาค (ค่าเริ่มต้น {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="จำนวนรอบต่อกรณี ใช้เวลาที่เร็วที่สุด (ค่าเริ่มต้น 3)")
+    parser.add_argument("--seed", type=int, default=1, help="seed ของข้อมูลสังเคราะห์")
+    parser.add_argument("--output", type=Path, default=RESULTS_PATH, help="ไฟล์ JSON สำหรับผลลัพธ์")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="ผลลัพธ์อ้างอิงสำหรับเปรียบเทียบ")
+    parser.add_argument("--threshold", type=float, default=25.0, help="ช้าลงหรือใหญ่ขึ้นเกินกี่เปอร์เซ็นต์จึงถือว่าถดถอย (ค่าเริ่มต้น 25)")
+    parser.add_argument("--save-baseline", action="store_true", help="บันทึกผลรอบนี้เป็นค่าอ้างอิงใหม่")
+    args = parser.parse_args()
+
+    try:
+        sizes = [int(part) for part in args.sizes.split(",") if part.strip()]
+    except ValueError:
+        parser.error("--sizes ต้องเป็นตัวเลขคั่นด้วยจุลภาค")
+    if not sizes or min(sizes) < 1 or args.repeat < 1:
+        parser.error("--sizes และ --repeat ต้องมากกว่า 0")
+
+    list_factory, reason = news_list_factory()
+    if not list_factory:
+        print(f"ข้าม list_load/list_refresh: {reason}")
+
+    results: Dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "archives": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="bench-news-") as workdir:
+        bench = Bench(Path(workdir), args.repeat, list_factory)
+        for size in sizes:
+            results["archives"][str(size)] = bench.run(size, args.seed)
+
+    write_results(args.output, results)
+    print(f"บันทึกผลลัพธ์ที่ {args.output}")
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        print(f"บันทึกค่าอ้างอิงที่ {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print("ยังไม่มีค่าอ้างอิง (ใช้ --save-baseline เพื่อสร้าง)")
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("environment") != results["environment"]:
+        print("คำเตือน: ค่าอ้างอิงวัดบนสภาพแวดล้อมอื่น ผลเปรียบเทียบอาจคลาดเคลื่อน")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"ถดถอยเกิน {args.threshold:g}% จำนวน {len(regressions)} กรณี:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print(f"ไม่พบการถดถอยเกิน {args.threshold:g}% เมื่อเทียบกับ {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
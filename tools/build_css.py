@@ -0,0 +1,683 @@
+#!/usr/bin/env python3
+"""Build ``assets/css/site.css`` from the Tailwind utility classes the pages use.
+
+The pages used to load the Tailwind Play CDN, which compiles CSS in the
+browser on every page view. This script does the same work offline: it scans
+the generated pages (markup and inline scripts alike, so class strings in the
+news card templates are found) and the card renderer in ``render_news.py``
+for every token, keeps the ones that name a utility it knows, and writes
+Tailwind's base styles plus those utilities, ordered the way Tailwind orders
+them so overrides such as ``text-sm leading-relaxed`` behave the same.
+
+Only the utilities this site needs are implemented: the v3 spacing, colour,
+typography, layout, border, shadow and transition scales, arbitrary values
+in ``[...]``, ``/NN`` colour opacity and the ``hover:``, ``focus:``,
+``group-hover:`` and breakpoint variants. Tokens it does not know are
+ignored, as Tailwind ignores them. The theme keeps the ``fontFamily.sans``
+extension from the old inline ``tailwind.config``.
+
+The pages are rebuilt with ``build_site.py`` first.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from build_site import build, rel_path
+
+ROOT = Path(__file__).resolve().parents[1]
+CSS_PATH = ROOT / "assets" / "css" / "site.css"
+EXTRA_SOURCES = [Path(__file__).with_name("render_news.py")]
+
+# theme.extend.fontFamily from the old inline tailwind.config.
+FONT_FAMILY = {
+    "sans": ["Inter", "Noto Sans Thai", "ui-sans-serif", "system-ui", "-apple-system", "Segoe UI", "Roboto", "Helvetica", "Arial", "sans-serif"],
+    "mono": ["ui-monospace", "SFMono-Regular", "Menlo", "Monaco", "Consolas", "Liberation Mono", "Courier New", "monospace"],
+}
+
+BREAKPOINTS = {"sm": "640px", "md": "768px", "lg": "1024px", "xl": "1280px", "2xl": "1536px"}
+PSEUDO_VARIANTS = {
+    "hover": ":hover",
+    "focus": ":focus",
+    "focus-visible": ":focus-visible",
+    "active": ":active",
+    "disabled": ":disabled",
+}
+
+PALETTE = {
+    "slate": "f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a 020617",
+    "gray": "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827 030712",
+    "red": "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d 450a0a",
+    "orange": "fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12 431407",
+    "green": "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d 052e16",
+    "sky": "f0f9ff e0f2fe bae6fd 7dd3fc 38bdf8 0ea5e9 0284c7 0369a1 075985 0c4a6e 082f49",
+    "blue": "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a 172554",
+    "indigo": "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81 1e1b4b",
+    "purple": "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87 3b0764",
+    "pink": "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843 500724",
+}
+SHADES = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950)
+COLORS = {f"{name}-{shade}": f"#{value}" for name, values in PALETTE.items() for shade, value in zip(SHADES, values.split())}
+COLORS.update({"white": "#ffffff", "black": "#000000"})
+KEYWORD_COLORS = {"transparent": "transparent", "current": "currentColor", "inherit": "inherit"}
+
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"),
+    "sm": ("0.875rem", "1.25rem"),
+    "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"),
+    "xl": ("1.25rem", "1.75rem"),
+    "2xl": ("1.5rem", "2rem"),
+    "3xl": ("1.875rem", "2.25rem"),
+    "4xl": ("2.25rem", "2.5rem"),
+    "5xl": ("3rem", "1"),
+    "6xl": ("3.75rem", "1"),
+}
+FONT_WEIGHTS = {"light": "300", "normal": "400", "medium": "500", "semibold": "600", "bold": "700", "extrabold": "800"}
+LEADING = {"none": "1", "tight": "1.25", "snug": "1.375", "normal": "1.5", "relaxed": "1.625", "loose": "2"}
+TRACKING = {"tighter": "-0.05em", "tight": "-0.025em", "normal": "0em", "wide": "0.025em", "wider": "0.05em", "widest": "0.1em"}
+MAX_WIDTHS = {
+    "xs": "20rem", "sm": "24rem", "md": "28rem", "lg": "32rem", "xl": "36rem", "2xl": "42rem", "3xl": "48rem",
+    "4xl": "56rem", "5xl": "64rem", "6xl": "72rem", "7xl": "80rem", "full": "100%", "none": "none",
+}
+RADII = {"none": "0px", "sm": "0.125rem", "": "0.25rem", "md": "0.375rem", "lg": "0.5rem", "xl": "0.75rem", "2xl": "1rem", "3xl": "1.5rem", "full": "9999px"}
+SHADOWS = {
+    "sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "": "0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)",
+    "md": "0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)",
+    "xl": "0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)",
+    "2xl": "0 25px 50px -12px rgb(0 0 0 / 0.25)",
+    "none": "0 0 #0000",
+}
+BLURS = {"sm": "4px", "": "8px", "md": "12px", "lg": "16px", "xl": "24px", "2xl": "40px", "3xl": "64px"}
+GRADIENT_DIRECTIONS = {
+    "t": "top", "tr": "top right", "r": "right", "br": "bottom right",
+    "b": "bottom", "bl": "bottom left", "l": "left", "tl": "top left",
+}
+EASING = {"linear": "linear", "in": "cubic-bezier(0.4, 0, 1, 1)", "out": "cubic-bezier(0, 0, 0.2, 1)", "in-out": "cubic-bezier(0.4, 0, 0.2, 1)"}
+TRANSITIONS = {
+    "": "color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter, backdrop-filter",
+    "all": "all",
+    "colors": "color, background-color, border-color, text-decoration-color, fill, stroke",
+    "opacity": "opacity",
+    "shadow": "box-shadow",
+    "transform": "transform",
+}
+SIDES = {"t": ("top",), "r": ("right",), "b": ("bottom",), "l": ("left",), "x": ("left", "right"), "y": ("top", "bottom")}
+CORNERS = {"t": ("top-left", "top-right"), "r": ("top-right", "bottom-right"), "b": ("bottom-right", "bottom-left"), "l": ("top-left", "bottom-left")}
+
+TRANSFORM = (
+    "transform: translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) "
+    "skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))"
+)
+BOX_SHADOW = "box-shadow: var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)"
+RING_SHADOW = "box-shadow: var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)"
+TIMING = "transition-timing-function: cubic-bezier(0.4, 0, 0.2, 1); transition-duration: 150ms"
+SPACE_CHILDREN = " > :not([hidden]) ~ :not([hidden])"
+
+TOKEN_RE = re.compile(r"[^\s\"'`<>={}\\;]+")
+NUMBER_RE = re.compile(r"^\d+(\.\d+)?$")
+FRACTION_RE = re.compile(r"^(\d+)/(\d+)$")
+
+# (selector suffix, declarations); the suffix lets a utility style children.
+Rule = Tuple[str, str]
+
+
+def font_stack(names: List[str]) -> str:
+    return ", ".join(f'"{name}"' if " " in name else name for name in names)
+
+
+BASE_CSS = f"""*, ::before, ::after {{
+  --tw-translate-x: 0; --tw-translate-y: 0; --tw-rotate: 0; --tw-skew-x: 0; --tw-skew-y: 0; --tw-scale-x: 1; --tw-scale-y: 1;
+  --tw-ring-inset: ; --tw-ring-offset-width: 0px; --tw-ring-offset-color: #fff; --tw-ring-color: rgb(59 130 246 / 0.5);
+  --tw-ring-offset-shadow: 0 0 #0000; --tw-ring-shadow: 0 0 #0000; --tw-shadow: 0 0 #0000;
+}}
+*, ::before, ::after {{ box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb; }}
+::before, ::after {{ --tw-content: ''; }}
+html, :host {{ line-height: 1.5; -webkit-text-size-adjust: 100%; -moz-tab-size: 4; tab-size: 4; font-family: {font_stack(FONT_FAMILY["sans"])}; font-feature-settings: normal; font-variation-settings: normal; -webkit-tap-highlight-color: transparent; }}
+body {{ margin: 0; line-height: inherit; }}
+hr {{ height: 0; color: inherit; border-top-width: 1px; }}
+abbr:where([title]) {{ text-decoration: underline dotted; }}
+h1, h2, h3, h4, h5, h6 {{ font-size: inherit; font-weight: inherit; }}
+a {{ color: inherit; text-decoration: inherit; }}
+b, strong {{ font-weight: bolder; }}
+code, kbd, samp, pre {{ font-family: {font_stack(FONT_FAMILY["mono"])}; font-feature-settings: normal; font-variation-settings: normal; font-size: 1em; }}
+small {{ font-size: 80%; }}
+sub, sup {{ font-size: 75%; line-height: 0; position: relative; vertical-align: baseline; }}
+sub {{ bottom: -0.25em; }}
+sup {{ top: -0.5em; }}
+table {{ text-indent: 0; border-color: inherit; border-collapse: collapse; }}
+button, input, optgroup, select, textarea {{ font-family: inherit; font-feature-settings: inherit; font-variation-settings: inherit; font-size: 100%; font-weight: inherit; line-height: inherit; letter-spacing: inherit; color: inherit; margin: 0; padding: 0; }}
+button, select {{ text-transform: none; }}
+button, input:where([type='button']), input:where([type='reset']), input:where([type='submit']) {{ -webkit-appearance: button; background-color: transparent; background-image: none; }}
+:-moz-focusring {{ outline: auto; }}
+:-moz-ui-invalid {{ box-shadow: none; }}
+progress {{ vertical-align: baseline; }}
+::-webkit-inner-spin-button, ::-webkit-outer-spin-button {{ height: auto; }}
+[type='search'] {{ -webkit-appearance: textfield; outline-offset: -2px; }}
+::-webkit-search-decoration {{ -webkit-appearance: none; }}
+::-webkit-file-upload-button {{ -webkit-appearance: button; font: inherit; }}
+summary {{ display: list-item; }}
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre {{ margin: 0; }}
+fieldset {{ margin: 0; padding: 0; }}
+legend {{ padding: 0; }}
+ol, ul, menu {{ list-style: none; margin: 0; padding: 0; }}
+dialog {{ padding: 0; }}
+textarea {{ resize: vertical; }}
+input::placeholder, textarea::placeholder {{ opacity: 1; color: #9ca3af; }}
+button, [role="button"] {{ cursor: pointer; }}
+:disabled {{ cursor: default; }}
+img, svg, video, canvas, audio, iframe, embed, object {{ display: block; vertical-align: middle; }}
+img, video {{ max-width: 100%; height: auto; }}
+[hidden]:where(:not([hidden="until-found"])) {{ display: none; }}
+"""
+
+
+def arbitrary(value: str) -> Optional[str]:
+    if value.startswith("[") and value.endswith("]") and len(value) > 2:
+        return value[1:-1].replace("_", " ")
+    return None
+
+
+def spacing(value: str, negative: bool = False, fractions: bool = False, extra: Optional[Dict[str, str]] = None) -> Optional[str]:
+    result = arbitrary(value)
+    if result is None and extra and value in extra:
+        result = extra[value]
+    elif result is None and value == "px":
+        result = "1px"
+    elif result is None and value == "0":
+        result = "0px"
+    elif result is None and NUMBER_RE.match(value):
+        result = f"{float(value) * 0.25:g}rem"
+    elif result is None and fractions and FRACTION_RE.match(value):
+        top, bottom = FRACTION_RE.match(value).groups()
+        result = f"{int(top) / int(bottom) * 100:g}%"
+    if result is None:
+        return None
+    if negative:
+        return result if result.startswith("-") else f"-{result}" if result[0].isdigit() else f"calc({result} * -1)"
+    return result
+
+
+def rgb(hex_value: str) -> Tuple[int, int, int]:
+    hex_value = hex_value.lstrip("#")
+    if len(hex_value) == 3:
+        hex_value = "".join(char * 2 for char in hex_value)
+    return int(hex_value[0:2], 16), int(hex_value[2:4], 16), int(hex_value[4:6], 16)
+
+
+def color(value: str, alpha: Optional[float] = None) -> Optional[str]:
+    """CSS colour for a palette name or ``[#hex]``, with an optional ``/NN`` opacity."""
+    if alpha is None and "/" in value and not value.startswith("["):
+        value, _, opacity = value.rpartition("/")
+        if not opacity.isdigit():
+            return None
+        alpha = int(opacity) / 100
+    elif alpha is None and re.match(r"^\[.*\]/\d+$", value):
+        value, _, opacity = value.rpartition("/")
+        alpha = int(opacity) / 100
+    if value in KEYWORD_COLORS:
+        return KEYWORD_COLORS[value] if alpha is None else None
+    hex_value = COLORS.get(value)
+    if hex_value is None:
+        raw = arbitrary(value)
+        if raw is None or not re.match(r"^#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})$", raw):
+            return None
+        hex_value = raw
+    red, green, blue = rgb(hex_value)
+    if alpha is None:
+        return f"rgb({red} {green} {blue})"
+    return f"rgb({red} {green} {blue} / {alpha:g})"
+
+
+def length(value: str) -> bool:
+    return bool(re.match(r"^-?[\d.]+(px|rem|em|%|vh|vw)$", value))
+
+
+# Utilities ----------------------------------------------------------------
+
+def static(table: Dict[str, str]) -> Callable[[str], Optional[Rule]]:
+    return lambda name: ("", table[name]) if name in table else None
+
+
+def prefixed(prefix: str, build_value: Callable[[str, bool], Optional[str]]) -> Callable[[str], Optional[Rule]]:
+    """``prefix-value`` and ``-prefix-value`` utilities for one property group."""
+
+    def handler(name: str) -> Optional[Rule]:
+        negative = name.startswith("-")
+        body = name[1:] if negative else name
+        if not body.startswith(prefix + "-"):
+            return None
+        declarations = build_value(body[len(prefix) + 1 :], negative)
+        return ("", declarations) if declarations else None
+
+    return handler
+
+
+def sided(prefix: str, prop: str, sides: Iterable[str], negative_ok: bool, extra: Optional[Dict[str, str]] = None, fractions: bool = False) -> List[Callable[[str], Optional[Rule]]]:
+    """``p-4``/``px-4``/``pt-4`` style utilities; one handler per group, in Tailwind's order."""
+    handlers = []
+    for group in sides:
+        def build_value(value: str, negative: bool, group: str = group) -> Optional[str]:
+            if negative and not negative_ok:
+                return None
+            amount = spacing(value, negative, fractions, extra)
+            if amount is None:
+                return None
+            names = [prop] if not group else [f"{prop}-{side}" if prop else side for side in SIDES[group]]
+            return "; ".join(f"{name}: {amount}" for name in names)
+
+        handlers.append(prefixed(prefix + group, build_value))
+    return handlers
+
+
+def inset(name: str) -> Optional[Rule]:
+    negative = name.startswith("-")
+    body = name[1:] if negative else name
+    for prefix, props in (("inset-x-", ("left", "right")), ("inset-y-", ("top", "bottom")), ("inset-", ("top", "right", "bottom", "left"))):
+        if body.startswith(prefix):
+            amount = spacing(body[len(prefix) :], negative, True, {"full": "100%", "auto": "auto"})
+            return ("", "; ".join(f"{prop}: {amount}" for prop in props)) if amount else None
+    return None
+
+
+def position_side(name: str) -> Optional[Rule]:
+    negative = name.startswith("-")
+    body = name[1:] if negative else name
+    for side in ("top", "right", "bottom", "left"):
+        if body.startswith(side + "-"):
+            amount = spacing(body[len(side) + 1 :], negative, True, {"full": "100%", "auto": "auto"})
+            return ("", f"{side}: {amount}") if amount else None
+    return None
+
+
+def z_index(name: str) -> Optional[Rule]:
+    match = re.match(r"^(-?)z-(\d+|auto|\[\d+\])$", name)
+    if not match:
+        return None
+    value = arbitrary(match.group(2)) or match.group(2)
+    return ("", f"z-index: {match.group(1)}{value}")
+
+
+def sizing(prefix: str, prop: str, extra: Dict[str, str]) -> Callable[[str], Optional[Rule]]:
+    def build_value(value: str, negative: bool) -> Optional[str]:
+        if negative:
+            return None
+        amount = spacing(value, False, True, extra)
+        return f"{prop}: {amount}" if amount else None
+
+    return prefixed(prefix, build_value)
+
+
+def aspect(name: str) -> Optional[Rule]:
+    table = {"aspect-auto": "auto", "aspect-square": "1 / 1", "aspect-video": "16 / 9"}
+    if name in table:
+        return ("", f"aspect-ratio: {table[name]}")
+    value = arbitrary(name[len("aspect-") :]) if name.startswith("aspect-") else None
+    return ("", f"aspect-ratio: {value.replace('/', ' / ')}") if value else None
+
+
+def max_width(name: str) -> Optional[Rule]:
+    if not name.startswith("max-w-"):
+        return None
+    value = name[len("max-w-") :]
+    amount = MAX_WIDTHS.get(value) or arbitrary(value)
+    return ("", f"max-width: {amount}") if amount else None
+
+
+def translate(name: str) -> Optional[Rule]:
+    match = re.match(r"^(-?)translate-([xy])-(.+)$", name)
+    if not match:
+        return None
+    amount = spacing(match.group(3), bool(match.group(1)), True, {"full": "100%"})
+    return ("", f"--tw-translate-{match.group(2)}: {amount}; {TRANSFORM}") if amount else None
+
+
+def grid_columns(name: str) -> Optional[Rule]:
+    match = re.match(r"^grid-cols-(\d+|none)$", name)
+    if not match:
+        return None
+    value = "none" if match.group(1) == "none" else f"repeat({match.group(1)}, minmax(0, 1fr))"
+    return ("", f"grid-template-columns: {value}")
+
+
+def space_between(name: str) -> Optional[Rule]:
+    match = re.match(r"^(-?)space-([xy])-(.+)$", name)
+    if not match:
+        return None
+    amount = spacing(match.group(3), bool(match.group(1)))
+    if amount is None:
+        return None
+    side = "margin-left" if match.group(2) == "x" else "margin-top"
+    return (SPACE_CHILDREN, f"{side}: {amount}")
+
+
+def rounded(name: str) -> Optional[Rule]:
+    match = re.match(r"^rounded(?:-([trbl]))?(?:-(.+))?$", name)
+    if not match:
+        return None
+    value = match.group(2) or ""
+    amount = RADII.get(value) or arbitrary(value)
+    if amount is None:
+        return None
+    if match.group(1):
+        return ("", "; ".join(f"border-{corner}-radius: {amount}" for corner in CORNERS[match.group(1)]))
+    return ("", f"border-radius: {amount}")
+
+
+def border_width(name: str) -> Optional[Rule]:
+    match = re.match(r"^border(?:-([xytrbl]))?(?:-(\d+))?$", name)
+    if not match:
+        return None
+    width = f"{match.group(2) or 1}px"
+    if match.group(1):
+        return ("", "; ".join(f"border-{side}-width: {width}" for side in SIDES[match.group(1)]))
+    return ("", f"border-width: {width}")
+
+
+def color_utility(prefix: str, prop: str) -> Callable[[str], Optional[Rule]]:
+    def handler(name: str) -> Optional[Rule]:
+        if not name.startswith(prefix + "-"):
+            return None
+        value = color(name[len(prefix) + 1 :])
+        return ("", f"{prop}: {value}") if value else None
+
+    return handler
+
+
+def gradient_direction(name: str) -> Optional[Rule]:
+    match = re.match(r"^bg-gradient-to-(t|tr|r|br|b|bl|l|tl)$", name)
+    if not match:
+        return None
+    return ("", f"background-image: linear-gradient(to {GRADIENT_DIRECTIONS[match.group(1)]}, var(--tw-gradient-stops))")
+
+
+def transparent(value: str) -> str:
+    if value.startswith("rgb("):
+        return value.split(" /")[0].rstrip(")") + " / 0)"
+    return "rgb(255 255 255 / 0)"
+
+
+def gradient_stop(name: str) -> Optional[Rule]:
+    match = re.match(r"^(from|via|to)-(.+)$", name)
+    if not match:
+        return None
+    value = color(match.group(2))
+    if value is None:
+        return None
+    stop = match.group(1)
+    if stop == "from":
+        return ("", f"--tw-gradient-from: {value}; --tw-gradient-to: {transparent(value)}; --tw-gradient-stops: var(--tw-gradient-from), var(--tw-gradient-to)")
+    if stop == "via":
+        return ("", f"--tw-gradient-to: {transparent(value)}; --tw-gradient-stops: var(--tw-gradient-from), {value}, var(--tw-gradient-to)")
+    return ("", f"--tw-gradient-to: {value}")
+
+
+def text(name: str) -> Optional[Rule]:
+    if not name.startswith("text-"):
+        return None
+    value = name[len("text-") :]
+    if value in FONT_SIZES:
+        size, line_height = FONT_SIZES[value]
+        return ("", f"font-size: {size}; line-height: {line_height}")
+    raw = arbitrary(value)
+    if raw and length(raw):
+        return ("", f"font-size: {raw}")
+    return None
+
+
+def text_color(name: str) -> Optional[Rule]:
+    if not name.startswith("text-"):
+        return None
+    value = color(name[len("text-") :])
+    return ("", f"color: {value}") if value else None
+
+
+def scale_utility(prefix: str, prop: str, table: Dict[str, str]) -> Callable[[str], Optional[Rule]]:
+    def handler(name: str) -> Optional[Rule]:
+        if not name.startswith(prefix + "-"):
+            return None
+        value = name[len(prefix) + 1 :]
+        amount = table.get(value) or arbitrary(value)
+        return ("", f"{prop}: {amount}") if amount else None
+
+    return handler
+
+
+def opacity(name: str) -> Optional[Rule]:
+    match = re.match(r"^opacity-(\d+)$", name)
+    return ("", f"opacity: {int(match.group(1)) / 100:g}") if match else None
+
+
+def shadow(name: str) -> Optional[Rule]:
+    match = re.match(r"^shadow(?:-(.+))?$", name)
+    if not match or (match.group(1) or "") not in SHADOWS:
+        return None
+    return ("", f"--tw-shadow: {SHADOWS[match.group(1) or '']}; {BOX_SHADOW}")
+
+
+def ring_width(name: str) -> Optional[Rule]:
+    match = re.match(r"^ring(?:-(\d+))?$", name)
+    if not match:
+        return None
+    width = match.group(1) or "3"
+    return (
+        "",
+        "--tw-ring-offset-shadow: var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color); "
+        f"--tw-ring-shadow: var(--tw-ring-inset) 0 0 0 calc({width}px + var(--tw-ring-offset-width)) var(--tw-ring-color); "
+        f"{RING_SHADOW}",
+    )
+
+
+def ring_color(name: str) -> Optional[Rule]:
+    if not name.startswith("ring-") or name[len("ring-") :].isdigit():
+        return None
+    value = color(name[len("ring-") :])
+    return ("", f"--tw-ring-color: {value}") if value else None
+
+
+def blur(name: str) -> Optional[Rule]:
+    match = re.match(r"^blur(?:-(.+))?$", name)
+    if not match:
+        return None
+    value = match.group(1) or ""
+    amount = BLURS.get(value) or arbitrary(value)
+    return ("", f"filter: blur({amount})") if amount else None
+
+
+def transition(name: str) -> Optional[Rule]:
+    match = re.match(r"^transition(?:-(.+))?$", name)
+    if not match or (match.group(1) or "") not in TRANSITIONS:
+        return None
+    return ("", f"transition-property: {TRANSITIONS[match.group(1) or '']}; {TIMING}")
+
+
+def duration(name: str) -> Optional[Rule]:
+    match = re.match(r"^duration-(\d+)$", name)
+    return ("", f"transition-duration: {match.group(1)}ms") if match else None
+
+
+def ease(name: str) -> Optional[Rule]:
+    value = EASING.get(name[len("ease-") :]) if name.startswith("ease-") else None
+    return ("", f"transition-timing-function: {value}") if value else None
+
+
+SR_ONLY = {
+    "sr-only": "position: absolute; width: 1px; height: 1px; padding: 0; margin: -1px; overflow: hidden; clip: rect(0, 0, 0, 0); white-space: nowrap; border-width: 0",
+    "not-sr-only": "position: static; width: auto; height: auto; padding: 0; margin: 0; overflow: visible; clip: auto; white-space: normal",
+}
+DISPLAY = {
+    "block": "display: block", "inline-block": "display: inline-block", "inline": "display: inline",
+    "flex": "display: flex", "inline-flex": "display: inline-flex", "grid": "display: grid",
+    "inline-grid": "display: inline-grid", "contents": "display: contents", "hidden": "display: none",
+}
+SIZE_EXTRA = {"full": "100%", "auto": "auto", "screen": "100vh", "fit": "fit-content", "min": "min-content", "max": "max-content"}
+WIDTH_EXTRA = dict(SIZE_EXTRA, screen="100vw")
+
+# Handlers in Tailwind's core plugin order; later rules win over earlier ones.
+UTILITIES: List[Callable[[str], Optional[Rule]]] = [
+    static(SR_ONLY),
+    static({"pointer-events-none": "pointer-events: none", "pointer-events-auto": "pointer-events: auto"}),
+    static({"visible": "visibility: visible", "invisible": "visibility: hidden"}),
+    static({name: f"position: {name}" for name in ("static", "fixed", "absolute", "relative", "sticky")}),
+    inset,
+    position_side,
+    z_index,
+    *sided("m", "margin", ("", "x", "y", "t", "r", "b", "l"), True, {"auto": "auto"}),
+    static(DISPLAY),
+    aspect,
+    sizing("h", "height", SIZE_EXTRA),
+    sizing("max-h", "max-height", {"full": "100%", "screen": "100vh", "none": "none"}),
+    sizing("min-h", "min-height", {"full": "100%", "screen": "100vh"}),
+    sizing("w", "width", WIDTH_EXTRA),
+    sizing("min-w", "min-width", {"full": "100%", "min": "min-content", "max": "max-content"}),
+    max_width,
+    static({"flex-1": "flex: 1 1 0%", "flex-auto": "flex: 1 1 auto", "flex-initial": "flex: 0 1 auto", "flex-none": "flex: none"}),
+    static({"shrink-0": "flex-shrink: 0", "shrink": "flex-shrink: 1", "grow": "flex-grow: 1", "grow-0": "flex-grow: 0"}),
+    translate,
+    static({"cursor-pointer": "cursor: pointer", "cursor-default": "cursor: default", "cursor-not-allowed": "cursor: not-allowed"}),
+    static({"select-none": "user-select: none"}),
+    static({"list-inside": "list-style-position: inside", "list-outside": "list-style-position: outside"}),
+    static({"list-none": "list-style-type: none", "list-disc": "list-style-type: disc", "list-decimal": "list-style-type: decimal"}),
+    grid_columns,
+    static({"flex-row": "flex-direction: row", "flex-row-reverse": "flex-direction: row-reverse", "flex-col": "flex-direction: column", "flex-col-reverse": "flex-direction: column-reverse"}),
+    static({"flex-wrap": "flex-wrap: wrap", "flex-nowrap": "flex-wrap: nowrap"}),
+    static({"place-items-center": "place-items: center", "place-items-start": "place-items: start", "place-items-end": "place-items: end"}),
+    static({f"items-{key}": f"align-items: {value}" for key, value in (("start", "flex-start"), ("end", "flex-end"), ("center", "center"), ("baseline", "baseline"), ("stretch", "stretch"))}),
+    static({f"justify-{key}": f"justify-content: {value}" for key, value in (("start", "flex-start"), ("end", "flex-end"), ("center", "center"), ("between", "space-between"), ("around", "space-around"), ("evenly", "space-evenly"))}),
+    *sided("gap", "gap", ("",), False),
+    *[prefixed(f"gap-{axis}", lambda value, negative, prop=prop: None if negative or spacing(value) is None else f"{prop}: {spacing(value)}") for axis, prop in (("x", "column-gap"), ("y", "row-gap"))],
+    space_between,
+    static({name: f"overflow: {name.split('-')[1]}" for name in ("overflow-auto", "overflow-hidden", "overflow-visible", "overflow-scroll")}),
+    static({f"overflow-{axis}-{mode}": f"overflow-{axis}: {mode}" for axis in "xy" for mode in ("auto", "hidden", "visible", "scroll")}),
+    static({"truncate": "overflow: hidden; text-overflow: ellipsis; white-space: nowrap"}),
+    static({f"whitespace-{mode}": f"white-space: {mode}" for mode in ("normal", "nowrap", "pre", "pre-line", "pre-wrap")}),
+    static({"break-words": "overflow-wrap: break-word", "break-all": "word-break: break-all"}),
+    rounded,
+    border_width,
+    color_utility("border", "border-color"),
+    color_utility("bg", "background-color"),
+    gradient_direction,
+    gradient_stop,
+    static({"bg-cover": "background-size: cover", "bg-contain": "background-size: contain", "bg-center": "background-position: center"}),
+    static({f"object-{mode}": f"object-fit: {mode}" for mode in ("contain", "cover", "fill", "none", "scale-down")}),
+    *sided("p", "padding", ("", "x", "y", "t", "r", "b", "l"), False),
+    static({f"text-{align}": f"text-align: {align}" for align in ("left", "center", "right", "justify")}),
+    static({"font-sans": f"font-family: {font_stack(FONT_FAMILY['sans'])}", "font-mono": f"font-family: {font_stack(FONT_FAMILY['mono'])}"}),
+    text,
+    static({f"font-{key}": f"font-weight: {value}" for key, value in FONT_WEIGHTS.items()}),
+    static({"uppercase": "text-transform: uppercase", "lowercase": "text-transform: lowercase", "capitalize": "text-transform: capitalize", "normal-case": "text-transform: none"}),
+    static({"italic": "font-style: italic", "not-italic": "font-style: normal"}),
+    scale_utility("leading", "line-height", LEADING),
+    scale_utility("tracking", "letter-spacing", TRACKING),
+    text_color,
+    static({"underline": "text-decoration-line: underline", "no-underline": "text-decoration-line: none"}),
+    opacity,
+    shadow,
+    static({"outline-none": "outline: 2px solid transparent; outline-offset: 2px"}),
+    ring_width,
+    ring_color,
+    blur,
+    transition,
+    duration,
+    ease,
+]
+
+
+def css_escape(name: str) -> str:
+    escaped = re.sub(r"([^a-zA-Z0-9_-])", r"\\\1", name)
+    if escaped[0].isdigit():
+        escaped = f"\\3{escaped[0]} {escaped[1:]}"
+    return escaped
+
+
+def compile_class(candidate: str) -> Optional[Tuple[Tuple[int, int, int], str]]:
+    """Sort key and CSS rule for one class name, or None if it is not a utility."""
+    *variants, name = candidate.split(":")
+    if not name or name.startswith(":"):
+        return None
+    for order, handler in enumerate(UTILITIES):
+        found = handler(name)
+        if found:
+            break
+    else:
+        return None
+    suffix, declarations = found
+    selector = "." + css_escape(candidate)
+    media: List[str] = []
+    state_rank = 0
+    for variant in variants:
+        if variant in BREAKPOINTS:
+            media.append(variant)
+        elif variant in PSEUDO_VARIANTS:
+            selector += PSEUDO_VARIANTS[variant]
+            state_rank = max(state_rank, list(PSEUDO_VARIANTS).index(variant) + 1)
+        elif variant == "group-hover":
+            selector = f".group:hover {selector}"
+            state_rank = max(state_rank, 1)
+        else:
+            return None
+    if len(media) > 1:
+        return None
+    rule = f"{selector}{suffix} {{ {declarations}; }}"
+    breakpoint = list(BREAKPOINTS).index(media[0]) + 1 if media else 0
+    if media:
+        rule = f"@media (min-width: {BREAKPOINTS[media[0]]}) {{ {rule} }}"
+    return (breakpoint, state_rank, order), rule
+
+
+def candidates(texts: Iterable[str]) -> Set[str]:
+    found: Set[str] = set()
+    for text in texts:
+        for token in TOKEN_RE.findall(text):
+            found.add(token.strip(",.()"))
+            # Class lists in scripts are often concatenated: 'hidden' + (x ? ' flex' : '').
+            found.update(part for part in token.split(",") if part)
+    return found
+
+
+def page_texts() -> List[str]:
+    pages = [path for path in sorted(ROOT.glob("*.html")) if not path.name.startswith("_")]
+    return [path.read_text(encoding="utf-8") for path in pages + EXTRA_SOURCES]
+
+
+def render_stylesheet(texts: Iterable[str]) -> Tuple[str, int]:
+    rules = []
+    for candidate in sorted(candidates(texts)):
+        compiled = compile_class(candidate)
+        if compiled:
+            rules.append(compiled)
+    rules.sort(key=lambda item: item[0])
+    header = "/* Generated by tools/build_css.py; do not edit. */\n"
+    return header + BASE_CSS + "\n".join(rule for _, rule in rules) + "\n", len(rules)
+
+
+def build_stylesheet() -> bool:
+    """Regenerate site.css from the current pages. Returns True if it changed."""
+    css, _ = render_stylesheet(page_texts())
+    if CSS_PATH.exists() and CSS_PATH.read_text(encoding="utf-8") == css:
+        return False
+    CSS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CSS_PATH.write_text(css, encoding="utf-8")
+    return True
+
+
+def main() -> None:
+    started = time.perf_counter()
+    for path in build():
+        print(f"อัปเดต {rel_path(path)}")
+    css, count = render_stylesheet(page_texts())
+    changed = build_stylesheet()
+    state = "อัปเดต" if changed else "ไม่เปลี่ยนแปลง"
+    print(
+        f"{state} {rel_path(CSS_PATH)}: {count} คลาส, {len(css.encode('utf-8')):,} ไบต์ "
+        f"({time.perf_counter() - started:.2f} วินาที)"
+    )
+
+
+if __name__ == "__main__":
+    main()
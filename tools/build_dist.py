@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""Copy the site into ``dist/`` with content-hashed asset names.
+
+Every file under ``assets/`` is copied as ``name.<hash>.ext``, and
+``dist/asset-manifest.json`` maps each original path to its hashed one. Asset
+URLs in the HTML pages (attributes, ``srcset`` lists and inline scripts), in
+the published news JSON and in stylesheets are rewritten to the hashed names,
+so every asset can be cached forever and a changed file simply gets a new URL.
+
+The HTML pages and the news data under ``news/`` keep their names: the pages
+are the entry points, and the news scripts build those URLs at runtime from
+entry ids and shard names. ``assets/images/program/`` holds the legacy
+programme pages, whose relative links expect the original names, so it is
+copied unchanged.
+
+Text files (HTML, JSON, CSS, JS, SVG) also get precompressed ``.gz``
+siblings, and ``.zst`` ones when the ``zstandard`` package is installed, so
+a static host or the preview server can send compressed bytes without
+compressing each response. They are compressed in parallel, and only when
+the file is newer than its sibling.
+
+``dist/sw.js`` is a service worker generated from ``_sw.js``. It precaches
+the files listed in ``dist/precache-manifest.<version>.json``: the pages,
+the assets every page loads (stylesheet, icon sprite, logo) and the newest
+news shard. The version is a hash of that list, so any change to a page or
+asset installs a new worker. Each page registers it with a short script added
+to the copies in ``dist/`` only, since the root pages have no hashed names
+for it to cache.
+
+Hashes are cached in ``.dist_cache.json`` by modification time and size, so a
+re-run only reads the assets that changed. The pages are rebuilt with
+``build_site.py`` and ``assets/css/site.css`` with ``build_css.py`` first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional, .zst files are skipped without it
+    zstandard = None
+
+from build_css import CSS_PATH, build_stylesheet
+from build_site import build
+from news_feeds import SITE_URL
+from news_store import NEWS_PATH, NewsStore
+
+ROOT = Path(__file__).resolve().parents[1]
+DIST_DIR = ROOT / "dist"
+MANIFEST_NAME = "asset-manifest.json"
+CACHE_PATH = ROOT / ".dist_cache.json"
+CACHE_VERSION = 1
+HASH_LENGTH = 10
+ASSETS_DIR = "assets"
+# Copied as they are: the legacy pages link to their neighbours by relative path.
+LEGACY_DIRS = ("assets/images/program/",)
+_STORE = NewsStore(NEWS_PATH)
+# Build bookkeeping and the news store's journal and lock file, which visitors never request.
+SKIP = {"assets/responsive/manifest.json", _STORE.journal_path.name, _STORE.lock_path.name}
+DATA_FILES = ("latest.json", "feed.xml", "atom.xml", "feed.json")
+DATA_DIRS = ("news",)
+# Assets whose own references are rewritten before they are hashed.
+TEXT_ASSETS = {".css", ".js"}
+COMPRESSIBLE = {".html", ".json", ".css", ".js", ".svg", ".xml", ".txt"}
+# Below this size the compressed file saves less than a request header.
+MIN_COMPRESS_SIZE = 512
+GZIP_LEVEL = 9
+ZSTD_LEVEL = 19
+
+# Relative asset URLs, and the absolute ones the news feeds use.
+ROOT_URL_RE = re.compile(r"(?<![\w/.-])(\./|" + re.escape(SITE_URL + "/") + r")?(assets/[^\s\"'`()<>,?#\\&]+)")
+SW_TEMPLATE = ROOT / "_sw.js"
+SW_NAME = "sw.js"
+# The shell every page needs, beyond the assets all pages happen to reference.
+SHELL_ASSETS = ("assets/css/site.css", "assets/icons.svg")
+# News data the home and news pages load first; the rest is cached as it is read.
+PRECACHE_DATA = ("latest.json", "news/manifest.json", "news/page-1.json")
+SW_REGISTER = (
+    '<script>if ("serviceWorker" in navigator) '
+    'addEventListener("load", () => navigator.serviceWorker.register("./sw.js"));</script>'
+)
+CSS_URL_RE = re.compile(r"url\(\s*([\"']?)([^\"')\s]+)\1\s*\)")
+
+
+def rel_path(path: Path) -> str:
+    return path.relative_to(ROOT).as_posix()
+
+
+def hashed_name(rel: str, digest: str) -> str:
+    stem, ext = posixpath.splitext(rel)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def load_cache() -> Dict[str, Any]:
+    try:
+        with CACHE_PATH.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_cache(files: Dict[str, Any]) -> None:
+    with CACHE_PATH.open("w", encoding="utf-8") as handle:
+        json.dump({"version": CACHE_VERSION, "files": files}, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def encodings() -> List[str]:
+    return ["gz", "zst"] if zstandard is not None else ["gz"]
+
+
+def compress(path: Path, encoding: str) -> bytes:
+    data = path.read_bytes()
+    if encoding == "gz":
+        # mtime=0 keeps the output identical across builds.
+        return gzip.compress(data, GZIP_LEVEL, mtime=0)
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def precompress(path: Path, encoding: str) -> Tuple[Path, str]:
+    """Write ``path.<encoding>`` if it is missing or older than ``path``.
+
+    Returns the sibling and "written", "fresh" or "skipped"; a sibling that
+    would not be smaller than the file is not kept.
+    """
+    target = path.with_name(f"{path.name}.{encoding}")
+    try:
+        if target.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            return target, "fresh"
+    except FileNotFoundError:
+        pass
+    data = compress(path, encoding)
+    if len(data) >= path.stat().st_size:
+        target.unlink(missing_ok=True)
+        return target, "skipped"
+    target.write_bytes(data)
+    return target, "written"
+
+
+def rewrite_urls(text: str, base: str, mapping: Dict[str, str], missing: Optional[Set[str]] = None) -> str:
+    """Point asset URLs in ``text`` at their hashed names.
+
+    ``base`` is the directory ``text`` lives in, relative to the site root;
+    only ``url()`` references in stylesheets are resolved against it. Asset
+    paths with no file behind them are added to ``missing``.
+    """
+
+    def swap(url: str, rel: str) -> str:
+        target = mapping.get(rel) or mapping.get(unquote(rel))
+        if not target:
+            if missing is not None and rel.startswith(f"{ASSETS_DIR}/") and not rel.startswith(LEGACY_DIRS):
+                missing.add(rel)
+            return url
+        # Replace only the file name so relative prefixes and spelling stay as written.
+        return url[: url.rfind("/") + 1] + posixpath.basename(target)
+
+    def root_url(match: re.Match[str]) -> str:
+        return (match.group(1) or "") + swap(match.group(2), match.group(2))
+
+    def css_url(match: re.Match[str]) -> str:
+        url = match.group(2)
+        if ":" in url or url.startswith(("/", "#")):
+            return match.group(0)
+        rel = posixpath.normpath(posixpath.join(base, url))
+        quote = match.group(1)
+        return f"url({quote}{swap(url, rel)}{quote})"
+
+    if base:
+        text = CSS_URL_RE.sub(css_url, text)
+    return ROOT_URL_RE.sub(root_url, text)
+
+
+class DistBuilder:
+    def __init__(self) -> None:
+        self.cache = load_cache()
+        self.files: Dict[str, Any] = {}
+        self.mapping: Dict[str, str] = {}
+        self.written: Set[str] = set()
+        self.missing: Set[str] = set()
+        self.changed: List[str] = []
+        self.page_assets: Dict[str, Set[str]] = {}
+        self.hashed = 0
+        self.compressed = 0
+
+    def digest(self, path: Path) -> str:
+        rel = rel_path(path)
+        stat = path.stat()
+        record = self.cache.get(rel)
+        if record and record["mtime"] == stat.st_mtime_ns and record["size"] == stat.st_size:
+            digest = record["hash"]
+        else:
+            hasher = hashlib.sha256()
+            with path.open("rb") as handle:
+                for chunk in iter(lambda: handle.read(1 << 16), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self.hashed += 1
+        self.files[rel] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": digest}
+        return digest
+
+    def emit(self, rel: str, data: bytes) -> None:
+        self.written.add(rel)
+        if write_if_changed(DIST_DIR / rel, data):
+            self.changed.append(rel)
+
+    def copy(self, source: Path, rel: str) -> None:
+        """Copy an unchanged file; an existing copy with the same size and time is kept."""
+        self.written.add(rel)
+        target = DIST_DIR / rel
+        stat = source.stat()
+        try:
+            current = target.stat()
+            if current.st_size == stat.st_size and current.st_mtime_ns == stat.st_mtime_ns:
+                return
+        except FileNotFoundError:
+            target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+        self.changed.append(rel)
+
+    def assets(self) -> None:
+        text_assets: List[Path] = []
+        for path in sorted((ROOT / ASSETS_DIR).rglob("*")):
+            rel = rel_path(path)
+            if not path.is_file() or rel in SKIP:
+                continue
+            if rel.startswith(LEGACY_DIRS):
+                self.copy(path, rel)
+            elif path.suffix.lower() in TEXT_ASSETS:
+                text_assets.append(path)
+            else:
+                target = hashed_name(rel, self.digest(path))
+                self.mapping[rel] = target
+                self.copy(path, target)
+        # Stylesheets and scripts may point at other assets, so they are hashed after rewriting.
+        for path in text_assets:
+            rel = rel_path(path)
+            text = path.read_text(encoding="utf-8")
+            data = rewrite_urls(text, posixpath.dirname(rel), self.mapping, self.missing).encode("utf-8")
+            target = hashed_name(rel, hashlib.sha256(data).hexdigest())
+            self.mapping[rel] = target
+            self.emit(target, data)
+
+    def pages(self) -> None:
+        sources = [path for path in sorted(ROOT.glob("*.html")) if not path.name.startswith("_")]
+        sources += [ROOT / name for name in DATA_FILES if (ROOT / name).exists()]
+        for folder in DATA_DIRS:
+            sources += sorted((ROOT / folder).rglob("*.json"))
+        for path in sources:
+            rel = rel_path(path)
+            if rel in SKIP:
+                continue
+            text = rewrite_urls(path.read_bytes().decode("utf-8"), "", self.mapping, self.missing)
+            if path.suffix == ".html":
+                self.page_assets[rel] = {match.group(2) for match in ROOT_URL_RE.finditer(text)} & self.written
+                text = text.replace("</body>", f"{SW_REGISTER}\n</body>", 1)
+            self.emit(rel, text.encode("utf-8"))
+
+    def service_worker(self) -> None:
+        """Write the precache manifest and ``sw.js`` for the pages and assets written so far."""
+        shell = set.intersection(*self.page_assets.values()) if self.page_assets else set()
+        shell |= {self.mapping[rel] for rel in SHELL_ASSETS if rel in self.mapping}
+
+        def revision(rel: str) -> str:
+            return hashlib.sha256((DIST_DIR / rel).read_bytes()).hexdigest()[:HASH_LENGTH]
+
+        # Hashed assets need no revision: their name changes with their content.
+        entries = [{"url": rel, "revision": revision(rel)} for rel in sorted(self.page_assets)]
+        entries += [{"url": rel, "revision": revision(rel)} for rel in PRECACHE_DATA if rel in self.written]
+        entries += [{"url": rel, "revision": None} for rel in sorted(shell)]
+        listing = json.dumps(entries, ensure_ascii=False, sort_keys=True)
+        version = hashlib.sha256(listing.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+        manifest_name = f"precache-manifest.{version}.json"
+        manifest = {"version": version, "entries": entries}
+        self.emit(manifest_name, (json.dumps(manifest, ensure_ascii=False, indent=2) + "\n").encode("utf-8"))
+        script = SW_TEMPLATE.read_text(encoding="utf-8")
+        for key, value in (("VERSION", version), ("MANIFEST", f"./{manifest_name}"), ("HASH_LENGTH", str(HASH_LENGTH))):
+            script = script.replace(f"{{{{{key}}}}}", value)
+        self.emit(SW_NAME, script.encode("utf-8"))
+
+    def compress(self, jobs: int) -> None:
+        """Precompress the text files in dist/; zlib and zstd release the GIL, so threads run in parallel."""
+        tasks = [
+            (DIST_DIR / rel, encoding)
+            for rel in sorted(self.written)
+            if posixpath.splitext(rel)[1] in COMPRESSIBLE and (DIST_DIR / rel).stat().st_size >= MIN_COMPRESS_SIZE
+            for encoding in encodings()
+        ]
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            for target, state in pool.map(lambda task: precompress(*task), tasks):
+                rel = target.relative_to(DIST_DIR).as_posix()
+                if state != "skipped":
+                    self.written.add(rel)
+                if state == "written":
+                    self.changed.append(rel)
+                    self.compressed += 1
+
+    def prune(self) -> List[str]:
+        removed: List[str] = []
+        for path in sorted(DIST_DIR.rglob("*"), reverse=True):
+            if path.is_dir():
+                if not any(path.iterdir()):
+                    path.rmdir()
+                continue
+            rel = path.relative_to(DIST_DIR).as_posix()
+            if rel not in self.written:
+                path.unlink()
+                removed.append(rel)
+        return removed
+
+    def run(self, jobs: int = 1) -> List[str]:
+        self.assets()
+        self.pages()
+        self.service_worker()
+        manifest = {"version": 1, "assets": self.mapping}
+        text = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+        self.emit(MANIFEST_NAME, text.encode("utf-8"))
+        self.compress(jobs)
+        removed = self.prune()
+        save_cache(self.files)
+        return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="สร้างโฟลเดอร์ dist/ ที่มีชื่อไฟล์แบบแฮชและไฟล์บีบอัดล่วงหน้า")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 4, help="จำนวนเธรดที่ใช้บีบอัดไฟล์")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    for path in build():
+        print(f"อัปเดต {rel_path(path)}")
+    if build_stylesheet():
+        print(f"อัปเดต {rel_path(CSS_PATH)}")
+    builder = DistBuilder()
+    removed = builder.run(args.jobs)
+    for rel in removed:
+        print(f"ลบ dist/{rel}")
+    for rel in sorted(builder.missing):
+        print(f"ไม่พบไฟล์ {rel} ที่หน้าเว็บอ้างถึง")
+    print(
+        f"dist/ พร้อมแล้ว: เขียน {len(builder.changed)} ไฟล์, ลบ {len(removed)} ไฟล์, "
+        f"แฮชใหม่ {builder.hashed}/{len(builder.mapping)} ไฟล์, "
+        f"บีบอัดใหม่ {builder.compressed} ไฟล์ ({', '.join(encodings())}) "
+        f"({time.perf_counter() - started:.2f} วินาที)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Turn Lucide icon placeholders into references to one SVG sprite.
+
+Pages and card templates write icons the way Lucide documents them,
+``<i data-lucide="calendar-days" class="w-4 h-4"></i>``, including inside
+the template literals of inline scripts. ``replace_icons()`` rewrites each
+one to ``<svg><use href="./assets/icons.svg#calendar-days"></use></svg>``
+with the same attributes, so the browser needs no icon library and no
+``createIcons()`` pass over the DOM. ``build_sprite()`` then writes
+``assets/icons.svg`` with a ``<symbol>`` for every icon the generated pages
+reference, taken from the vendored Lucide files in ``_icons/``.
+
+``build_site.py`` does both on every build; run this script to rebuild the
+sprite on its own.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Iterable, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+ICONS_DIR = ROOT / "_icons"
+SPRITE_PATH = ROOT / "assets" / "icons.svg"
+SPRITE_URL = "./assets/icons.svg"
+# Root attributes of a Lucide file that its shapes rely on.
+SYMBOL_ATTRIBUTES = ("viewBox", "fill", "stroke", "stroke-width", "stroke-linecap", "stroke-linejoin")
+
+ICON_RE = re.compile(r"<i\b([^>]*?)\bdata-lucide=\"([a-z0-9-]+)\"([^>]*)>\s*</i>")
+USE_RE = re.compile(re.escape(SPRITE_URL) + r"#([a-z0-9-]+)")
+SVG_RE = re.compile(r"<svg\b([^>]*)>(.*)</svg>", re.S)
+ATTRIBUTE_RE = re.compile(r"([\w:-]+)=\"([^\"]*)\"")
+
+
+class IconError(Exception):
+    """Raised when a page uses an icon that is not in ``_icons/``."""
+
+
+def icon_path(name: str) -> Path:
+    return ICONS_DIR / f"{name}.svg"
+
+
+def replace_icons(html: str) -> Tuple[str, List[str]]:
+    """Rewrite ``data-lucide`` placeholders in ``html``; returns it with the icon names used."""
+    names: List[str] = []
+
+    def replace(match: re.Match[str]) -> str:
+        name = match.group(2)
+        if not icon_path(name).exists():
+            raise IconError(f"ไม่พบไอคอน {name} ใน _icons/ (คัดลอกไฟล์ {name}.svg จาก Lucide มาไว้ก่อน)")
+        names.append(name)
+        attributes = " ".join((match.group(1) + match.group(3)).split())
+        attributes = f" {attributes}" if attributes else ""
+        return f'<svg{attributes} width="24" height="24" aria-hidden="true"><use href="{SPRITE_URL}#{name}"></use></svg>'
+
+    return ICON_RE.sub(replace, html), names
+
+
+def symbol(name: str) -> str:
+    text = icon_path(name).read_text(encoding="utf-8")
+    match = SVG_RE.search(text)
+    if not match:
+        raise IconError(f"อ่านไฟล์ _icons/{name}.svg ไม่ได้")
+    attributes = dict(ATTRIBUTE_RE.findall(match.group(1)))
+    kept = "".join(f' {key}="{attributes[key]}"' for key in SYMBOL_ATTRIBUTES if key in attributes)
+    shapes = "".join(line.strip().replace(" />", "/>") for line in match.group(2).splitlines())
+    return f'<symbol id="{name}"{kept}>{shapes}</symbol>'
+
+
+def render_sprite(names: Iterable[str]) -> str:
+    symbols = "\n".join(symbol(name) for name in sorted(set(names)))
+    return f'<svg xmlns="http://www.w3.org/2000/svg">\n{symbols}\n</svg>\n'
+
+
+def used_icons(pages: Iterable[Path]) -> Set[str]:
+    names: Set[str] = set()
+    for path in pages:
+        names.update(USE_RE.findall(path.read_text(encoding="utf-8")))
+    return names
+
+
+def site_pages() -> List[Path]:
+    return [path for path in sorted(ROOT.glob("*.html")) if not path.name.startswith("_")]
+
+
+def build_sprite() -> bool:
+    """Write the sprite for the icons the pages use. Returns True if it changed."""
+    sprite = render_sprite(used_icons(site_pages()))
+    if SPRITE_PATH.exists() and SPRITE_PATH.read_text(encoding="utf-8") == sprite:
+        return False
+    SPRITE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    SPRITE_PATH.write_text(sprite, encoding="utf-8")
+    return True
+
+
+def main() -> None:
+    names = used_icons(site_pages())
+    state = "อัปเดต" if build_sprite() else "ไม่เปลี่ยนแปลง"
+    print(f"{state} {SPRITE_PATH.relative_to(ROOT).as_posix()}: {len(names)} ไอคอน")
+
+
+if __name__ == "__main__":
+    main()
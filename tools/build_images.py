@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Build responsive WebP/AVIF variants for site images and wire them into the pages.
+
+For every local ``<img>`` in the page sources under ``_pages/`` and
+``_partials/`` the original is resized to a set of widths under
+``assets/responsive/`` and the tag is wrapped in a ``<picture>`` with
+``srcset``/``sizes``; the pages are then rebuilt with ``build_site.py``.
+Images below the fold get ``loading="lazy"`` and ``decoding="async"``.
+Sources whose content hash has not changed since the last run are skipped.
+
+Requires Pillow (``pip install Pillow``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from html import escape, unescape
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, features
+except ImportError:  # pragma: no cover - depends on the local environment
+    Image = None
+    features = None
+
+from build_site import PAGES_DIR, PARTIALS_DIR, build
+
+ROOT = Path(__file__).resolve().parents[1]
+OUTPUT_DIR = ROOT / "assets" / "responsive"
+MANIFEST_PATH = OUTPUT_DIR / "manifest.json"
+WIDTHS = (96, 192, 320, 480, 640, 960, 1280, 1920)
+QUALITY = {"avif": 55, "webp": 80}
+RASTER_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+# Images in the header and hero slider keep eager loading.
+ABOVE_THE_FOLD = {"assets/Mahidol_Logo.png", "assets/banner1.jpg", "assets/banner2.jpg"}
+
+# ``sizes`` hints by path prefix; the first match wins.
+SIZES = [
+    ("assets/Mahidol_Logo.png", "44px"),
+    ("assets/banner", "(min-width: 768px) 50vw, 100vw"),
+    ("assets/stand_model/", "(min-width: 768px) 320px, 60vw"),
+    ("assets/fastival/", "(min-width: 768px) 33vw, 100vw"),
+]
+DEFAULT_SIZES = "100vw"
+
+SKIP_REGIONS = re.compile(r"<!-- news-cards:start -->.*?<!-- news-cards:end -->|<script\b.*?</script>", re.S)
+PICTURE_RE = re.compile(r"<picture data-responsive[^>]*>.*?(<img\b[^>]*>).*?</picture>", re.S)
+IMG_RE = re.compile(r"<img\b[^>]*>", re.S)
+ATTR_RE = re.compile(r'\s([a-zA-Z_:][-a-zA-Z0-9_:.]*)(?:\s*=\s*"([^"]*)")?')
+
+
+def load_manifest() -> Dict[str, Any]:
+    if not MANIFEST_PATH.exists():
+        return {}
+    try:
+        with MANIFEST_PATH.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_manifest(manifest: Dict[str, Any]) -> None:
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with MANIFEST_PATH.open("w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def available_formats() -> List[str]:
+    return [fmt for fmt in ("avif", "webp") if features.check(fmt)]
+
+
+def local_asset(src: str) -> Optional[str]:
+    """Return the repo-relative path for a local raster ``src``, or None."""
+    if not src or "://" in src or src.startswith(("data:", "//", "${")):
+        return None
+    rel = src[2:] if src.startswith("./") else src.lstrip("/")
+    if Path(rel).suffix.lower() not in RASTER_SUFFIXES:
+        return None
+    return rel
+
+
+def variant_path(rel: str, width: int, fmt: str) -> Path:
+    stem = Path(rel).with_suffix("")
+    if stem.parts and stem.parts[0] == "assets":
+        stem = Path(*stem.parts[1:])
+    return OUTPUT_DIR / f"{stem.as_posix()}-{width}w.{fmt}"
+
+
+def target_widths(original: int) -> List[int]:
+    widths = [w for w in WIDTHS if w < original]
+    widths.append(min(original, WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def build_variants(rel: str, digest: str, formats: List[str]) -> Dict[str, Any]:
+    source = ROOT / rel
+    with Image.open(source) as image:
+        image.load()
+        width, height = image.size
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        variants: Dict[str, List[Tuple[int, str]]] = {fmt: [] for fmt in formats}
+        for w in target_widths(width):
+            h = max(1, round(height * w / width))
+            resized = image if w == width else image.resize((w, h), Image.LANCZOS)
+            for fmt in formats:
+                out = variant_path(rel, w, fmt)
+                out.parent.mkdir(parents=True, exist_ok=True)
+                resized.save(out, fmt.upper(), quality=QUALITY[fmt])
+                variants[fmt].append((w, out.relative_to(ROOT).as_posix()))
+    return {"sha256": digest, "width": width, "height": height, "variants": variants}
+
+
+def is_fresh(record: Optional[Dict[str, Any]], digest: str, formats: List[str]) -> bool:
+    if not record or record.get("sha256") != digest:
+        return False
+    variants = record.get("variants", {})
+    if any(fmt not in variants for fmt in formats):
+        return False
+    return all((ROOT / path).exists() for fmt in formats for _, path in variants[fmt])
+
+
+def sizes_for(rel: str) -> str:
+    for prefix, sizes in SIZES:
+        if rel.startswith(prefix):
+            return sizes
+    return DEFAULT_SIZES
+
+
+def parse_attrs(tag: str) -> Dict[str, Optional[str]]:
+    body = tag[len("<img") :].rstrip("/>").rstrip()
+    return {name: (unescape(value) if value is not None else None) for name, value in ATTR_RE.findall(" " + body)}
+
+
+def render_img(attrs: Dict[str, Optional[str]]) -> str:
+    parts = [name if value is None else f'{name}="{escape(value)}"' for name, value in attrs.items()]
+    return "<img " + " ".join(parts) + " />"
+
+
+def render_picture(img_tag: str, record: Dict[str, Any], rel: str) -> str:
+    attrs = parse_attrs(img_tag)
+    sizes = sizes_for(rel)
+    if rel in ABOVE_THE_FOLD:
+        attrs.pop("loading", None)
+    else:
+        attrs["loading"] = "lazy"
+    attrs["decoding"] = "async"
+    sources = []
+    for fmt in ("avif", "webp"):
+        entries = record["variants"].get(fmt)
+        if not entries:
+            continue
+        srcset = ", ".join(f"./{path} {w}w" for w, path in entries)
+        sources.append(f'<source type="image/{fmt}" srcset="{srcset}" sizes="{sizes}" />')
+    return (
+        '<picture data-responsive style="display: contents">'
+        + "".join(sources)
+        + render_img(attrs)
+        + "</picture>"
+    )
+
+
+def rewrite_html(html: str, records: Dict[str, Any]) -> str:
+    protected = [m.span() for m in SKIP_REGIONS.finditer(html)]
+
+    def inside_protected(pos: int) -> bool:
+        return any(start <= pos < end for start, end in protected)
+
+    def replace(match: re.Match[str]) -> str:
+        if inside_protected(match.start()):
+            return match.group(0)
+        img_tag = match.group(1) if match.re is PICTURE_RE else match.group(0)
+        rel = local_asset(parse_attrs(img_tag).get("src") or "")
+        record = records.get(rel) if rel else None
+        if not record:
+            return match.group(0)
+        return render_picture(img_tag, record, rel)
+
+    html = PICTURE_RE.sub(replace, html)
+    protected = [m.span() for m in SKIP_REGIONS.finditer(html)]
+    protected += [m.span() for m in PICTURE_RE.finditer(html)]
+    return IMG_RE.sub(replace, html)
+
+
+def collect_sources(pages: List[Path]) -> Dict[str, List[Path]]:
+    found: Dict[str, List[Path]] = {}
+    for page in pages:
+        html = SKIP_REGIONS.sub("", page.read_text(encoding="utf-8"))
+        for tag in IMG_RE.findall(html):
+            rel = local_asset(parse_attrs(tag).get("src") or "")
+            if rel:
+                found.setdefault(rel, []).append(page)
+    return found
+
+
+def html_pages() -> List[Path]:
+    # The top-level pages are generated by build_site.py, so rewrite their sources.
+    return sorted(PAGES_DIR.glob("*.html")) + sorted(PARTIALS_DIR.glob("*.html"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=4, help="จำนวนเธรดที่ใช้แปลงรูป")
+    parser.add_argument("--no-rewrite", action="store_true", help="สร้างไฟล์รูปอย่างเดียว ไม่แก้ไข HTML")
+    args = parser.parse_args()
+
+    if Image is None:
+        print("ต้องติดตั้ง Pillow ก่อน: pip install Pillow")
+        sys.exit(1)
+    formats = available_formats()
+    if not formats:
+        print("Pillow ที่ติดตั้งไม่รองรับ WebP หรือ AVIF")
+        sys.exit(1)
+
+    pages = html_pages()
+    sources = collect_sources(pages)
+    manifest = load_manifest()
+    pending: List[Tuple[str, str]] = []
+    for rel in sorted(sources):
+        path = ROOT / rel
+        if not path.exists():
+            print(f"ข้าม {rel}: ไม่พบไฟล์ (อ้างอิงจาก {', '.join(p.name for p in sources[rel])})")
+            continue
+        digest = file_hash(path)
+        if is_fresh(manifest.get(rel), digest, formats):
+            continue
+        pending.append((rel, digest))
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results = pool.map(lambda item: (item[0], build_variants(item[0], item[1], formats)), pending)
+        for rel, record in results:
+            manifest[rel] = record
+            print(f"สร้างรูปย่อ {rel} ({len(record['variants'][formats[0]])} ขนาด)")
+    if pending:
+        save_manifest(manifest)
+
+    if args.no_rewrite:
+        return
+    for page in pages:
+        with page.open("r", encoding="utf-8", newline="") as handle:
+            html = handle.read()
+        updated = rewrite_html(html, manifest)
+        if updated != html:
+            with page.open("w", encoding="utf-8", newline="") as handle:
+                handle.write(updated)
+            print(f"อัปเดต {page.relative_to(ROOT).as_posix()}")
+    for path in build():
+        print(f"อัปเดต {path.relative_to(ROOT).as_posix()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""Render the top-level HTML pages from layouts, shared partials and page fragments.
+
+Each ``_pages/<name>.html`` becomes ``<name>.html`` in the site root. A
+fragment starts with a comment holding ``key: value`` fields (``title``,
+``description``, ``heading``, ``subheading``, ``main_class``, ``layout``,
+``preload``) and continues with ``<!-- block: name -->`` sections such as ``content``,
+``extra_head``, ``style`` and ``scripts``.
+
+Layouts (``_template.html`` by default, ``_home.html`` for the home page)
+and the partials in ``_partials/`` use two kinds of placeholder:
+``{{NAME}}`` is replaced by the field or block of that name, and a line that
+holds only an empty one is dropped; ``{{> name}}`` includes
+``_partials/name.html``, unless the page defines its own block ``name``.
+The desktop nav link to the page being rendered gets ``class="active"``.
+The images listed in ``preload`` (their ``src`` as written) are the ones
+visible before scrolling: each gets ``fetchpriority="high"`` and a
+``<link rel="preload">`` in ``{{HINTS}}``, for the first ``<source>`` of its
+``<picture>`` when it has one so the browser fetches the format it will
+actually use. Then
+the news cards in index.html and news.html come from ``render_news.py``, and
+Lucide icon placeholders become references to ``assets/icons.svg`` (see
+``build_icons.py``), which is rebuilt after the pages.
+
+Every build records in ``.build_cache.json`` the hash of each source a page
+used, including news.json for the pages with news cards. A page is rendered
+again only when one of those sources or the output itself changed, and the
+output is rewritten only when its bytes differ.
+
+The programme pages under ``assets/images/program/`` are exports of the old
+TIS-620 site with their own template and are not generated here.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from build_icons import IconError, build_sprite, icon_path, replace_icons
+from news_store import NEWS_PATH, NewsStore
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGES_DIR = ROOT / "_pages"
+PARTIALS_DIR = ROOT / "_partials"
+CACHE_PATH = ROOT / ".build_cache.json"
+CACHE_VERSION = 1
+DEFAULT_FIELDS = {
+    "layout": "_template.html",
+    "main_class": "max-w-7xl mx-auto px-6 py-10",
+}
+# Pages that show news cards also depend on the news data.
+NEWS_SOURCES = (NEWS_PATH, NewsStore(NEWS_PATH).journal_path)
+MAX_DEPTH = 8
+
+FRONT_MATTER_RE = re.compile(r"\A<!--\n(.*?)\n-->\n", re.S)
+FIELD_RE = re.compile(r"^([a-z_]+)\s*:\s*(.*?)\s*$")
+BLOCK_RE = re.compile(r"^<!-- block: ([a-z_-]+) -->\n", re.M)
+TOKEN = r"\{\{(?:>\s*([a-z-]+)|([A-Z_]+))\}\}"
+# A placeholder alone on its line, or one inside a line.
+PLACEHOLDER_RE = re.compile(r"^[ \t]*" + TOKEN + r"[ \t]*\n|" + TOKEN, re.M)
+PRIMARY_NAV_RE = re.compile(r"<nav\b[^>]*\bprimary-nav\b.*?</nav>", re.S)
+PICTURE_RE = re.compile(r"<picture\b.*?</picture>", re.S)
+IMG_RE = re.compile(r"<img\b[^>]*>")
+ATTRIBUTE_RE = re.compile(r"([\w:-]+)=\"([^\"]*)\"")
+
+
+class BuildError(Exception):
+    """Raised when a fragment or template cannot be rendered."""
+
+
+@dataclass
+class Page:
+    source: Path
+    fields: Dict[str, str]
+    blocks: Dict[str, str]
+    # Sources read while rendering, relative to ROOT.
+    deps: List[str] = field(default_factory=list)
+
+    @property
+    def output(self) -> Path:
+        return ROOT / self.source.name
+
+
+def rel_path(path: Path) -> str:
+    return path.relative_to(ROOT).as_posix()
+
+
+def read_source(path: Path) -> str:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        return handle.read().replace("\r\n", "\n")
+
+
+def file_hash(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+def parse_page(path: Path) -> Page:
+    text = read_source(path)
+    fields = dict(DEFAULT_FIELDS)
+    match = FRONT_MATTER_RE.match(text)
+    if match:
+        for line in match.group(1).splitlines():
+            found = FIELD_RE.match(line)
+            if found:
+                fields[found.group(1)] = found.group(2)
+            elif line.strip():
+                raise BuildError(f"{path.name}: อ่านบรรทัดหัวไฟล์ไม่ได้: {line!r}")
+        text = text[match.end() :]
+    blocks: Dict[str, str] = {}
+    markers = list(BLOCK_RE.finditer(text))
+    if not markers:
+        blocks["content"] = text.rstrip("\n")
+    for number, marker in enumerate(markers):
+        end = markers[number + 1].start() if number + 1 < len(markers) else len(text)
+        body = text[marker.end() : end]
+        blocks[marker.group(1)] = body[:-1] if body.endswith("\n") else body
+    return Page(path, fields, blocks)
+
+
+def include(page: Page, name: str, depth: int) -> str:
+    if name in page.blocks:
+        return render(page, page.blocks[name], depth + 1)
+    path = PARTIALS_DIR / f"{name}.html"
+    if not path.exists():
+        raise BuildError(f"{page.source.name}: ไม่พบ partial {name} ({rel_path(path)})")
+    page.deps.append(rel_path(path))
+    return render(page, read_source(path).rstrip("\n"), depth + 1)
+
+
+def value(page: Page, partial: Optional[str], name: Optional[str], depth: int) -> str:
+    if partial:
+        return include(page, partial, depth)
+    key = name.lower()
+    if key in page.fields:
+        return page.fields[key]
+    if key in page.blocks:
+        return page.blocks[key]
+    return ""
+
+
+def render(page: Page, text: str, depth: int = 0) -> str:
+    if depth > MAX_DEPTH:
+        raise BuildError(f"{page.source.name}: partial ซ้อนกันลึกเกินไป (อาจเรียกตัวเองวนซ้ำ)")
+
+    def replace(match: re.Match[str]) -> str:
+        if match.group(3) or match.group(4):
+            return value(page, match.group(3), match.group(4), depth)
+        result = value(page, match.group(1), match.group(2), depth)
+        return result + "\n" if result else ""
+
+    # One pass, so text coming from fragments is never scanned for placeholders again.
+    return PLACEHOLDER_RE.sub(replace, text)
+
+
+def mark_active(html: str, name: str) -> str:
+    link = f'<a href="{name}"'
+    return PRIMARY_NAV_RE.sub(lambda match: match.group(0).replace(link, f'<a class="active" href="{name}"'), html, count=1)
+
+
+def image_tag(html: str, src: str) -> Optional[re.Match[str]]:
+    for match in IMG_RE.finditer(html):
+        if f'src="{src}"' in match.group(0):
+            return match
+    return None
+
+
+def preload_link(html: str, src: str) -> str:
+    """``<link rel="preload">`` for the image ``src``, matching the candidate the browser will pick."""
+    img = image_tag(html, src)
+    picture = None
+    if img:
+        picture = next((match for match in PICTURE_RE.finditer(html) if match.start() < img.start() < match.end()), None)
+    source = re.search(r"<source\b[^>]*>", picture.group(0)) if picture else None
+    if source:
+        attributes = dict(ATTRIBUTE_RE.findall(source.group(0)))
+        if "srcset" in attributes:
+            sizes = f' imagesizes="{attributes["sizes"]}"' if "sizes" in attributes else ""
+            kind = f' type="{attributes["type"]}"' if "type" in attributes else ""
+            return f'<link rel="preload" as="image"{kind} imagesrcset="{attributes["srcset"]}"{sizes} fetchpriority="high"/>'
+    return f'<link rel="preload" as="image" href="{src}" fetchpriority="high"/>'
+
+
+def preload_sources(page: Page) -> List[str]:
+    return page.fields.get("preload", "").replace(",", " ").split()
+
+
+def hint_links(page: Page) -> str:
+    """The ``{{HINTS}}`` value: preload links for the page's ``preload`` images."""
+    text = "\n".join(page.blocks.values())
+    for src in preload_sources(page):
+        if image_tag(text, src) is None:
+            raise BuildError(f"{page.source.name}: ไม่พบรูป {src} ที่ระบุใน preload")
+    return "\n".join(preload_link(text, src) for src in preload_sources(page))
+
+
+def prioritize(page: Page, html: str) -> str:
+    for src in preload_sources(page):
+        img = image_tag(html, src)
+        if img and "fetchpriority=" not in img.group(0):
+            tag = img.group(0).replace("<img ", '<img fetchpriority="high" ', 1)
+            html = html[: img.start()] + tag + html[img.end() :]
+    return html
+
+
+class NewsCards:
+    """Loads news.json and the card renderers only when a page with cards is built."""
+
+    def __init__(self, items: Optional[List[Dict[str, Any]]] = None) -> None:
+        self.items = items
+        self._targets: Optional[Dict[str, Any]] = None
+
+    def targets(self) -> Dict[str, Any]:
+        if self._targets is None:
+            from render_news import TARGETS
+
+            self._targets = {target.path.name: target for target in TARGETS}
+        return self._targets
+
+    def apply(self, page: Page, html: str) -> str:
+        target = self.targets().get(page.output.name)
+        if target is None:
+            return html
+        from render_news import replace_cards
+
+        if self.items is None:
+            from update_news import load_news
+
+            self.items = load_news()
+        page.deps.extend(rel_path(path) for path in NEWS_SOURCES)
+        return replace_cards(html, target, target.select(self.items))
+
+
+def render_page(page: Page, cards: NewsCards) -> str:
+    layout = ROOT / page.fields["layout"]
+    if not layout.exists():
+        raise BuildError(f"{page.source.name}: ไม่พบ layout {page.fields['layout']}")
+    page.deps[:] = [rel_path(page.source), rel_path(layout)]
+    page.fields["hints"] = hint_links(page)
+    html = prioritize(page, render(page, read_source(layout)))
+    html = cards.apply(page, mark_active(html, page.output.name))
+    html, icons = replace_icons(html)
+    page.deps.extend(rel_path(icon_path(name)) for name in icons)
+    return html.replace("\n", "\r\n")
+
+
+def load_cache() -> Dict[str, Any]:
+    try:
+        with CACHE_PATH.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return {}
+    return data
+
+
+def save_cache(pages: Dict[str, Any]) -> None:
+    with CACHE_PATH.open("w", encoding="utf-8") as handle:
+        json.dump({"version": CACHE_VERSION, "pages": pages}, handle, ensure_ascii=False, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def page_sources() -> List[Path]:
+    return sorted(PAGES_DIR.glob("*.html"))
+
+
+def build(items: Optional[List[Dict[str, Any]]] = None, force: bool = False) -> List[Path]:
+    """Render every page whose sources changed. Returns the outputs that were rewritten."""
+    cached = {} if force else load_cache().get("pages", {})
+    hashes: Dict[str, str] = {}
+
+    def current(rel: str) -> str:
+        if rel not in hashes:
+            hashes[rel] = file_hash(ROOT / rel)
+        return hashes[rel]
+
+    cards = NewsCards(items)
+    records: Dict[str, Any] = {}
+    changed: List[Path] = []
+    for source in page_sources():
+        name = source.name
+        record = cached.get(name)
+        if (
+            record
+            and all(current(rel) == digest for rel, digest in record["deps"].items())
+            and current(name) == record["output"]
+        ):
+            records[name] = record
+            continue
+        page = parse_page(source)
+        html = render_page(page, cards)
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if current(name) != digest:
+            page.output.write_bytes(data)
+            hashes[name] = digest
+            changed.append(page.output)
+        records[name] = {"deps": {rel: current(rel) for rel in dict.fromkeys(page.deps)}, "output": digest}
+    save_cache(records)
+    build_sprite()
+    return changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="สร้างหน้าเว็บจาก _template.html, _partials/ และ _pages/")
+    parser.add_argument("--force", action="store_true", help="เรนเดอร์ทุกหน้าใหม่โดยไม่ใช้แคช")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        changed = build(force=args.force)
+    except (BuildError, IconError) as exc:
+        print(exc)
+        raise SystemExit(1)
+    for path in changed:
+        print(f"อัปเดต {rel_path(path)}")
+    total = len(page_sources())
+    print(f"สร้างหน้าเว็บ {len(changed)}/{total} หน้า ใน {time.perf_counter() - started:.2f} วินาที")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Parse the display dates used in news.json into sortable ISO keys.
+
+Entries mix ``"17/11/2025"`` with Thai strings such as ``"17 ส.ค. 2567"``.
+``date_key()`` turns both into ``"2024-08-17"`` (Buddhist-era years are
+converted to CE) and ``apply_date_key()`` stores it as ``dateKey`` next to
+the display string. Years must have four digits: "17/11/25" could mean 2025
+CE or 2525 BE, so it is rejected rather than guessed.
+
+Run with ``--migrate`` to add ``dateKey`` to every entry and re-sort news.json.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+from datetime import date
+from typing import Any, Dict, Optional
+
+BE_OFFSET = 543
+
+THAI_MONTHS = {
+    "มค": 1, "มกราคม": 1,
+    "กพ": 2, "กุมภาพันธ์": 2,
+    "มีค": 3, "มีนาคม": 3,
+    "เมย": 4, "เมษายน": 4,
+    "พค": 5, "พฤษภาคม": 5,
+    "มิย": 6, "มิถุนายน": 6,
+    "กค": 7, "กรกฎาคม": 7,
+    "สค": 8, "สิงหาคม": 8,
+    "กย": 9, "กันยายน": 9,
+    "ตค": 10, "ตุลาคม": 10,
+    "พย": 11, "พฤศจิกายน": 11,
+    "ธค": 12, "ธันวาคม": 12,
+}
+
+NUMERIC_DMY = re.compile(r"^(\d{1,2})[/.\-](\d{1,2})[/.\-](\d{4})$")
+NUMERIC_ISO = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$")
+THAI_TEXT = re.compile(r"^(\d{1,2})\s*([^\d\s]+)\s*(?:พ\.?\s*ศ\.?|ค\.?\s*ศ\.?)?\s*(\d{4})$")
+THAI_DIGITS = str.maketrans("๐๑๒๓๔๕๖๗๘๙", "0123456789")
+
+DATE_HINT = "รองรับรูปแบบ 17/11/2025, 17/11/2568, 2025-11-17 หรือ 17 พ.ย. 2568 (ปีต้องมี 4 หลัก)"
+
+
+def _to_ce(year: int) -> int:
+    return year - BE_OFFSET if year > 2400 else year
+
+
+def parse_news_date(text: str) -> Optional[date]:
+    value = " ".join(str(text or "").translate(THAI_DIGITS).split())
+    if not value:
+        return None
+    try:
+        match = NUMERIC_ISO.match(value)
+        if match:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        match = NUMERIC_DMY.match(value)
+        if match:
+            day, month, year = (int(part) for part in match.groups())
+            return date(_to_ce(year), month, day)
+        match = THAI_TEXT.match(value)
+        if match:
+            month = THAI_MONTHS.get(match.group(2).replace(".", ""))
+            if month:
+                return date(_to_ce(int(match.group(3))), month, int(match.group(1)))
+    except ValueError:
+        return None
+    return None
+
+
+def date_key(text: str) -> str:
+    parsed = parse_news_date(text)
+    return parsed.isoformat() if parsed else ""
+
+
+def apply_date_key(entry: Dict[str, Any]) -> str:
+    key = date_key(entry.get("date", ""))
+    if key:
+        entry["dateKey"] = key
+    else:
+        entry.pop("dateKey", None)
+    return key
+
+
+def main() -> None:
+    from news_store import NewsStore, StoreError
+
+    parser = argparse.ArgumentParser(description="แปลงวันที่ของข่าวเป็นคีย์ ISO สำหรับเรียงลำดับ")
+    parser.add_argument("--migrate", action="store_true", help="เพิ่ม dateKey ให้ทุกข่าวและเรียง news.json ใหม่")
+    parser.add_argument("text", nargs="*", help="ข้อความวันที่ที่ต้องการทดสอบ")
+    args = parser.parse_args()
+
+    for text in args.text:
+        print(f"{text} -> {date_key(text) or 'อ่านไม่ได้'}")
+    if not args.migrate:
+        return
+
+    store = NewsStore()
+    try:
+        items = store.load()
+    except StoreError as exc:
+        print("อ่าน news.json ไม่ได้ กรุณาตรวจสอบว่าเป็นไฟล์ JSON ที่ถูกต้องก่อน")
+        print(exc)
+        raise SystemExit(1)
+    for entry in items:
+        if not apply_date_key(entry):
+            print(f"อ่านวันที่ไม่ได้: {entry.get('date', '-')} | {entry.get('title', '')} ({DATE_HINT})")
+    store.rewrite(items)
+    print(f"ย้ายข้อมูล {len(items)} รายการแล้ว")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,398 @@
 #!/usr/bin/env python3
-"""Simple Tkinter GUI to manage news entries in news.json."""
+"""Simple Tkinter GUI to manage news entries in news.json.
+
+``--trace FILE`` logs span timings and ``--profile`` writes a profile summary;
+see ``news_trace.py``.
+"""
 
 from __future__ import annotations
 
-import json
+import argparse
+import queue
+import threading
+import time
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, simpledialog, ttk
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from news_dates import DATE_HINT, parse_news_date
+from news_media import IngestError, attach_variants, ingest_image, make_variants, preview_png
+from news_schema import normalize_images, normalize_links
+from news_search import SearchIndex
+from news_store import NewsStore, StoreError
+from news_trace import add_arguments, profile_thread, session, traced
 
 ROOT = Path(__file__).resolve().parents[1]
 NEWS_PATH = ROOT / "news.json"
 
 
-def load_news_file() -> List[Dict[str, Any]]:
-    if not NEWS_PATH.exists():
-        return []
-    try:
-        with NEWS_PATH.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-            if isinstance(data, list):
-                return data
-    except json.JSONDecodeError as exc:
-        messagebox.showerror("อ่านไฟล์ไม่ได้", f"news.json ไม่ใช่ JSON ที่ถูกต้อง:\n{exc}")
-    return []
-
-
-def save_news_file(items: List[Dict[str, Any]]) -> None:
-    with NEWS_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(items, handle, ensure_ascii=False, indent=2)
-        handle.write("\n")
-
-
-def normalize_images(entry: Dict[str, Any]) -> List[str]:
-    value = entry.get("images")
-    if isinstance(value, list):
-        cleaned = [str(v).strip() for v in value if str(v).strip()]
-        if cleaned:
-            return cleaned
-    image = str(entry.get("image", "")).strip()
-    return [image] if image else []
-
-
-def normalize_links(entry: Dict[str, Any]) -> List[Dict[str, str]]:
-    result: List[Dict[str, str]] = []
-    value = entry.get("links")
-    if isinstance(value, list):
-        for item in value:
-            if isinstance(item, dict):
-                url = str(item.get("url", "")).strip()
-                label = str(item.get("label", "")).strip()
-                if url:
-                    result.append({"label": label, "url": url})
-            elif isinstance(item, str):
-                url = item.strip()
-                if url:
-                    result.append({"label": "", "url": url})
-    link = str(entry.get("link", "")).strip()
-    if link and not result:
-        label = str(entry.get("linkLabel", "")).strip()
-        result.append({"label": label, "url": link})
-    return result
+STORE = NewsStore(NEWS_PATH)
+AUTOSAVE_MS = 1500
+WATCH_MS = 1000
+POLL_MS = 50
+PREVIEW_DELAY_MS = 400
+
+
+@traced()
+def load_news_file() -> Tuple[List[Dict[str, Any]], SearchIndex]:
+    """Entries and their search index, both built on the IOWorker thread."""
+    items = list(STORE.load())
+    return items, SearchIndex.build(items)
+
+
+def check_news_file() -> Tuple[List[Dict[str, Any]], List[str]] | None:
+    """Entries changed on disk by another process, or None when nothing changed."""
+    if not STORE.changed_on_disk():
+        return None
+    return STORE.reload()
+
+
+@traced()
+def save_news_entry(entry: Dict[str, Any], images: List[str], links: List[Dict[str, str]]) -> Dict[str, Any]:
+    apply_media_fields(entry, images, links)
+    STORE.put(entry)
+    return entry
+
+
+def warm_variants(sources: List[str]) -> int:
+    return sum(1 for src in sources if make_variants(src))
+
+
+def ingest_images(paths: List[str]) -> Tuple[List[str], int, List[str]]:
+    """Site paths for the picked files, how many reused a stored copy, and the errors."""
+    sources: List[str] = []
+    reused = 0
+    errors: List[str] = []
+    for raw in paths:
+        try:
+            src, existed = ingest_image(Path(raw))
+        except (IngestError, OSError) as exc:
+            errors.append(str(exc))
+            continue
+        sources.append(src)
+        reused += existed
+    return sources, reused, errors
+
+
+def load_previews(sources: List[str]) -> List[bytes | None]:
+    return [preview_png(src) for src in sources]
+
+
+class IOWorker:
+    """One background thread for file and image work.
+
+    Jobs run in submission order, so all NewsStore access stays on this
+    thread. Results are queued and handed to the callbacks from the Tk event
+    loop by polling with ``after()``; Tk itself is never touched off the main
+    thread.
+    """
+
+    def __init__(self, root: tk.Misc) -> None:
+        self.root = root
+        self.jobs: queue.Queue = queue.Queue()
+        self.results: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="news-io", daemon=True)
+        self.thread.start()
+        self._poll_job = self.root.after(POLL_MS, self._poll)
+
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        self.jobs.put((func, args, on_done, on_error))
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Finish the queued jobs, then end the thread."""
+        self.root.after_cancel(self._poll_job)
+        self.jobs.put(None)
+        self.thread.join(timeout)
+
+    def _run(self) -> None:
+        with profile_thread():
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    return
+                func, args, on_done, on_error = job
+                try:
+                    result = func(*args)
+                except Exception as exc:  # reported back to the UI thread
+                    self.results.put((on_error, exc, True))
+                else:
+                    self.results.put((on_done, result, False))
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                callback, value, failed = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if callback is not None:
+                callback(value)
+            elif failed:
+                messagebox.showerror("เกิดข้อผิดพลาด", str(value))
+        self._poll_job = self.root.after(POLL_MS, self._poll)
 
 
+@traced()
 def apply_media_fields(entry: Dict[str, Any], images: List[str], links: List[Dict[str, str]]) -> None:
     entry["images"] = images
-    entry["image"] = images[0] if images else ""
+    attach_variants(entry, images)
     entry["links"] = links
-    if links:
-        entry["link"] = links[0]["url"]
-        entry["linkLabel"] = links[0].get("label", "")
-    else:
-        entry["link"] = ""
-        entry["linkLabel"] = ""
+
+
+# Reversed digits make newer ISO dates sort first inside an ascending key.
+DATE_DESCENDING = str.maketrans("0123456789", "9876543210")
+
+
+class NewsList(ttk.Frame):
+    """Treeview that only holds the rows currently in view.
+
+    A fixed pool of row items is reused while scrolling, so the widget cost
+    does not grow with the archive. Display values and sort keys are computed
+    once per entry and patched when that entry changes; re-rendering compares
+    each pooled row with what it already shows and touches only the rows that
+    differ.
+    """
+
+    COLUMNS = (("date", "วันที่", 100), ("tag", "ป้ายกำกับ", 100), ("title", "หัวข้อข่าว", 260))
+
+    def __init__(self, master: tk.Misc, on_select: Callable[[str], None]) -> None:
+        super().__init__(master)
+        self.on_select = on_select
+        self.tree = ttk.Treeview(
+            self, columns=[name for name, _, _ in self.COLUMNS], show="headings", selectmode="browse", height=30
+        )
+        for name, label, width in self.COLUMNS:
+            self.tree.heading(name, text=label, command=lambda column=name: self.sort_by(column))
+            self.tree.column(name, width=width, stretch=name == "title")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.values: Dict[str, Tuple[str, str, str]] = {}
+        self.keys: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self.filter: Set[str] | None = None
+        self.order: List[str] = []
+        self.shown: List[Tuple[str, Tuple[str, str, str]]] = []
+        self.offset = 0
+        self.page_rows = 30
+        self.selected: str | None = None
+        self.sort_column = "date"
+        self.sort_reverse = True
+        self._syncing = False
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, 3))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, 3))
+        self.tree.bind("<Up>", lambda e: self._step(-1))
+        self.tree.bind("<Down>", lambda e: self._step(1))
+
+    def _cache(self, entry: Dict[str, Any]) -> str:
+        entry_id = entry["id"]
+        title = entry.get("title", "") or "(ไม่มีชื่อข่าว)"
+        tag = entry.get("tag", "")
+        newest_first = (entry.get("dateKey") or "").translate(DATE_DESCENDING)
+        self.values[entry_id] = (entry.get("date", "-"), tag, title[:80])
+        self.keys[entry_id] = {
+            "date": (entry.get("dateKey") or "", entry_id),
+            "tag": (tag.casefold(), newest_first, entry_id),
+            "title": (title.casefold(), newest_first, entry_id),
+        }
+        return entry_id
+
+    @traced()
+    def set_entries(self, entries: List[Dict[str, Any]]) -> None:
+        self.values.clear()
+        self.keys.clear()
+        for entry in entries:
+            self._cache(entry)
+        self._resort()
+
+    def set_filter(self, ids: List[str] | None) -> None:
+        self.filter = set(ids) if ids is not None else None
+        self.offset = 0
+        self._resort()
+
+    def sort_by(self, column: str) -> None:
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = column == "date"
+        self._resort()
+
+    @traced()
+    def _resort(self) -> None:
+        ids = self.values if self.filter is None else [entry_id for entry_id in self.values if entry_id in self.filter]
+        self.order = sorted(ids, key=lambda entry_id: self.keys[entry_id][self.sort_column], reverse=self.sort_reverse)
+        for name, label, _ in self.COLUMNS:
+            arrow = (" ▼" if self.sort_reverse else " ▲") if name == self.sort_column else ""
+            self.tree.heading(name, text=label + arrow)
+        self._render()
+
+    def _position(self, entry_id: str) -> int:
+        key = self.keys[entry_id][self.sort_column]
+        lo, hi = 0, len(self.order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            other = self.keys[self.order[mid]][self.sort_column]
+            if (other > key) if self.sort_reverse else (other < key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def update_entry(self, entry: Dict[str, Any]) -> None:
+        """Re-cache one entry and move it to its sorted position."""
+        entry_id = self._cache(entry)
+        if entry_id in self.order:
+            self.order.remove(entry_id)
+        if self.filter is None or entry_id in self.filter:
+            self.order.insert(self._position(entry_id), entry_id)
+        self._render()
+
+    def remove_entry(self, entry_id: str) -> None:
+        self.values.pop(entry_id, None)
+        self.keys.pop(entry_id, None)
+        if entry_id in self.order:
+            self.order.remove(entry_id)
+        if self.selected == entry_id:
+            self.selected = None
+        self._render()
+
+    def select(self, entry_id: str | None) -> None:
+        self.selected = entry_id
+        if entry_id in self.order:
+            row = self.order.index(entry_id)
+            if not self.offset <= row < self.offset + self.page_rows:
+                self.offset = max(0, row - self.page_rows // 2)
+        self._render()
+
+    def scroll(self, direction: int, rows: int) -> str:
+        self._set_offset(self.offset + direction * rows)
+        return "break"
+
+    def _set_offset(self, offset: int) -> None:
+        offset = max(0, min(offset, len(self.order) - self.page_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str = "") -> None:
+        if action == "moveto":
+            self._set_offset(round(float(amount) * len(self.order)))
+        elif action == "scroll":
+            step = self.page_rows if unit == "pages" else 1
+            self._set_offset(self.offset + int(amount) * step)
+
+    def _on_configure(self, event: tk.Event[ttk.Treeview]) -> None:
+        row_height = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        # Leave room for the heading row.
+        rows = max(1, (event.height - row_height - 4) // row_height)
+        if rows != self.page_rows:
+            self.page_rows = rows
+            self._render()
+
+    def _render(self) -> None:
+        self.offset = max(0, min(self.offset, len(self.order) - self.page_rows))
+        window = self.order[self.offset : self.offset + self.page_rows]
+        for row, entry_id in enumerate(window):
+            content = (entry_id, self.values[entry_id])
+            if row < len(self.shown):
+                if self.shown[row] != content:
+                    self.tree.item(f"row{row}", values=content[1])
+                    self.shown[row] = content
+            else:
+                self.tree.insert("", "end", iid=f"row{row}", values=content[1])
+                self.shown.append(content)
+        while len(self.shown) > len(window):
+            self.shown.pop()
+            self.tree.delete(f"row{len(self.shown)}")
+
+        self._syncing = True
+        try:
+            if self.selected in window:
+                self.tree.selection_set(f"row{window.index(self.selected)}")
+            elif self.tree.selection():
+                self.tree.selection_remove(self.tree.selection())
+        finally:
+            self._syncing = False
+        if self.order:
+            self.scrollbar.set(self.offset / len(self.order), (self.offset + len(window)) / len(self.order))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _choose(self, entry_id: str) -> None:
+        if entry_id != self.selected:
+            self.selected = entry_id
+            self.on_select(entry_id)
+
+    def _step(self, direction: int) -> str:
+        # Arrow keys walk the whole list, not just the rows in the pool.
+        if not self.order:
+            return "break"
+        row = self.order.index(self.selected) + direction if self.selected in self.order else 0
+        row = max(0, min(row, len(self.order) - 1))
+        self._choose(self.order[row])
+        self.select(self.order[row])
+        return "break"
+
+    def _on_tree_select(self, _event: tk.Event[ttk.Treeview]) -> None:
+        # Selections made by ``_render`` arrive here later as events too; they
+        # always point at ``self.selected`` and are ignored by ``_choose``.
+        if self._syncing:
+            return
+        selection = self.tree.selection()
+        if not selection:
+            return
+        row = int(selection[0][len("row") :])
+        if row < len(self.shown):
+            self._choose(self.shown[row][0])
+
+
+class ImageStrip(ttk.Frame):
+    """Row of small previews for the image paths in the form.
+
+    Previews are made on the IOWorker thread by ``preview_png()``, which keeps
+    recent ones cached, and turned into ``PhotoImage`` objects here on the Tk
+    thread. Results for a list that has since changed are dropped.
+    """
+
+    def __init__(self, master: tk.Misc, worker: IOWorker) -> None:
+        super().__init__(master)
+        self.worker = worker
+        self.sources: List[str] = []
+        self.photos: List[tk.PhotoImage] = []
+        self._token = 0
+
+    def show(self, sources: List[str]) -> None:
+        if sources == self.sources:
+            return
+        self.sources = list(sources)
+        self._token += 1
+        token = self._token
+        self.worker.submit(load_previews, self.sources, on_done=lambda previews: self._fill(token, previews))
+
+    def _fill(self, token: int, previews: List[bytes | None]) -> None:
+        if token != self._token:
+            return
+        for child in self.winfo_children():
+            child.destroy()
+        self.photos = []
+        for src, data in zip(self.sources, previews):
+            if data is None:
+                ttk.Label(self, text="ไม่พบรูป", width=12, anchor="center", relief="solid").pack(side="left", padx=2, ipady=24)
+                continue
+            photo = tk.PhotoImage(data=data)
+            self.photos.append(photo)
+            ttk.Label(self, image=photo).pack(side="left", padx=2)
 
 
 class NewsEditor(tk.Tk):
@@ -80,34 +400,43 @@ class NewsEditor(tk.Tk):
         super().__init__()
         self.title("News Editor (news.json)")
         self.geometry("1100x700")
-        self.news: List[Dict[str, Any]] = []
-        self.current_index: int | None = None
+        self.news: Dict[str, Dict[str, Any]] = {}
+        self.current_id: str | None = None
+        self.search_index = SearchIndex()
+        self.worker = IOWorker(self)
+        self.dirty = False
+        self._form_loading = False
+        # Bumped whenever the form switches entry, so late save results for a
+        # new entry are not applied to whatever the form shows by then.
+        self._form_token = 0
+        self._autosave_job: str | None = None
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self._load_news()
+        self.after(WATCH_MS, self._watch)
 
     def _build_ui(self) -> None:
+        self.var_status = tk.StringVar()
+        ttk.Label(self, textvariable=self.var_status, anchor="w", padding=(12, 0, 12, 6)).pack(side="bottom", fill="x")
         main = ttk.Frame(self, padding=12)
         main.pack(fill="both", expand=True)
 
         # Left list
         left = ttk.Frame(main)
         left.pack(side="left", fill="y")
-        ttk.Label(left, text="รายการข่าว").pack(anchor="w")
+        ttk.Label(left, text="รายการข่าว (พิมพ์ด้านล่างเพื่อค้นหา)").pack(anchor="w")
+        self.var_filter = tk.StringVar()
+        ttk.Entry(left, textvariable=self.var_filter).pack(fill="x", pady=(2, 6))
+        self.var_filter.trace_add("write", lambda *_: self._refresh_list())
 
-        list_frame = ttk.Frame(left)
-        list_frame.pack(fill="y", expand=True)
-        self.listbox = tk.Listbox(list_frame, width=38, height=34)
-        self.listbox.pack(side="left", fill="y", expand=True)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.listbox.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.listbox.configure(yscrollcommand=scrollbar.set)
-        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.news_list = NewsList(left, self._on_select)
+        self.news_list.pack(fill="y", expand=True)
 
         btn_frame = ttk.Frame(left)
         btn_frame.pack(fill="x", pady=10)
         ttk.Button(btn_frame, text="ข่าวใหม่", command=self._new_entry).pack(side="left", fill="x", expand=True, padx=2)
         ttk.Button(btn_frame, text="ลบข่าว", command=self._delete_entry).pack(side="left", fill="x", expand=True, padx=2)
-        ttk.Button(btn_frame, text="รีเฟรช", command=self._load_news).pack(side="left", fill="x", expand=True, padx=2)
+        ttk.Button(btn_frame, text="รีเฟรช", command=self._reload_news).pack(side="left", fill="x", expand=True, padx=2)
 
         # Right form
         right = ttk.Frame(main, padding=(12, 0))
@@ -135,6 +464,9 @@ class NewsEditor(tk.Tk):
         self.images_text = tk.Text(images_frame, height=4, width=70)
         self.images_text.grid(row=0, column=0, sticky="ew")
         ttk.Button(images_frame, text="เพิ่มจากไฟล์...", command=self._add_image_from_dialog).grid(row=0, column=1, padx=6)
+        self.image_strip = ImageStrip(images_frame, self.worker)
+        self.image_strip.grid(row=1, column=0, columnspan=2, sticky="w", pady=(4, 0))
+        self._preview_job: str | None = None
 
         ttk.Label(form, text="สรุป (ข้อความสั้น)").grid(row=5, column=0, sticky="nw", pady=4)
         self.summary_text = tk.Text(form, height=4, width=70)
@@ -155,7 +487,12 @@ class NewsEditor(tk.Tk):
         action_frame = ttk.Frame(right)
         action_frame.grid(row=1, column=0, pady=10, sticky="ew")
         ttk.Button(action_frame, text="บันทึก", command=self._save_entry).pack(side="left", expand=True, fill="x", padx=4)
-        ttk.Button(action_frame, text="ปิด", command=self.destroy).pack(side="left", expand=True, fill="x", padx=4)
+        ttk.Button(action_frame, text="ปิด", command=self._on_close).pack(side="left", expand=True, fill="x", padx=4)
+
+        for variable in (self.var_title, self.var_date, self.var_tag, self.var_by):
+            variable.trace_add("write", lambda *_: self._on_form_change())
+        for widget in (self.images_text, self.summary_text, self.body_text, self.links_text):
+            widget.bind("<<Modified>>", self._on_text_modified)
 
     def _add_entry_field(self, parent: ttk.Frame, label: str, variable: tk.StringVar, row: int) -> None:
         ttk.Label(parent, text=label).grid(row=row, column=0, sticky="w", pady=4)
@@ -163,27 +500,132 @@ class NewsEditor(tk.Tk):
         entry.grid(row=row, column=1, sticky="ew", pady=4)
 
     def _load_news(self) -> None:
-        self.news = load_news_file()
+        self.var_status.set("กำลังโหลด news.json ...")
+        self.worker.submit(load_news_file, on_done=self._on_loaded, on_error=self._on_load_error)
+
+    def _on_loaded(self, result: Tuple[List[Dict[str, Any]], SearchIndex]) -> None:
+        items, self.search_index = result
+        self.news = {entry["id"]: entry for entry in items}
+        self.news_list.set_entries(items)
         self._refresh_list()
-        if not self.news:
+        if self.current_id not in self.news:
             self._new_entry()
+        self.var_status.set(f"โหลดข่าว {len(items)} รายการ")
 
-    def _refresh_list(self) -> None:
-        self.listbox.delete(0, tk.END)
-        for idx, entry in enumerate(self.news):
-            title = entry.get("title", "(ไม่มีชื่อข่าว)")
-            date = entry.get("date", "-")
-            self.listbox.insert(tk.END, f"{idx + 1:02d}. {date} | {title[:60]}")
-
-    def _on_select(self, event: tk.Event[tk.Listbox]) -> None:
-        selection = event.widget.curselection()
-        if not selection:
+    def _on_load_error(self, exc: Exception) -> None:
+        self.var_status.set("อ่าน news.json ไม่ได้")
+        if isinstance(exc, StoreError):
+            messagebox.showerror("อ่านไฟล์ไม่ได้", f"news.json ไม่ใช่ JSON ที่ถูกต้อง:\n{exc}")
+        else:
+            messagebox.showerror("อ่านไฟล์ไม่ได้", str(exc))
+
+    def _reload_news(self) -> None:
+        def done(result: Any) -> None:
+            if result is None:
+                self.var_status.set("news.json ไม่มีการเปลี่ยนแปลง")
+            self._on_reloaded(result)
+
+        self.worker.submit(check_news_file, on_done=done, on_error=self._on_load_error)
+
+    def _watch(self) -> None:
+        # The next check is scheduled only after this one reports back.
+        def done(result: Any) -> None:
+            self._on_reloaded(result)
+            self.after(WATCH_MS, self._watch)
+
+        def failed(_exc: Exception) -> None:
+            self.after(WATCH_MS, self._watch)
+
+        self.worker.submit(check_news_file, on_done=done, on_error=failed)
+
+    def _on_reloaded(self, result: Tuple[List[Dict[str, Any]], List[str]] | None) -> None:
+        if result is None:
             return
-        index = selection[0]
-        self.current_index = index
-        self._populate_form(self.news[index])
+        changed, removed = result
+        for entry in changed:
+            self.news[entry["id"]] = entry
+            self.search_index.add(entry)
+            self.news_list.update_entry(entry)
+        for entry_id in removed:
+            self.news.pop(entry_id, None)
+            self.search_index.remove(entry_id)
+            self.news_list.remove_entry(entry_id)
+        if self.var_filter.get().strip():
+            self._refresh_list()
+        if changed or removed:
+            self.var_status.set(f"อัปเดตจากไฟล์ {len(changed)} รายการ ลบ {len(removed)} รายการ")
+        if self.current_id in removed:
+            # Flushing the pending autosave would write the deleted entry back.
+            self._cancel_autosave()
+            self.dirty = False
+            self._new_entry()
+            self.var_status.set("ข่าวที่เปิดอยู่ถูกลบจากโปรแกรมอื่น")
+        elif any(entry["id"] == self.current_id for entry in changed):
+            if self.dirty:
+                self.var_status.set("ข่าวที่เปิดอยู่ถูกแก้ไขจากโปรแกรมอื่น การบันทึกครั้งถัดไปจะเขียนทับ")
+            else:
+                self._populate_form(self.news[self.current_id])
+
+    @traced()
+    def _refresh_list(self) -> None:
+        query = self.var_filter.get().strip()
+        self.news_list.set_filter(self.search_index.search(query) if query else None)
+        self.news_list.select(self.current_id)
 
+    def _on_select(self, entry_id: str) -> None:
+        self._flush_autosave()
+        self.current_id = entry_id
+        self._populate_form(self.news[entry_id])
+
+    def _on_text_modified(self, event: tk.Event[tk.Text]) -> None:
+        if not event.widget.edit_modified():
+            return
+        event.widget.edit_modified(False)
+        if event.widget is self.images_text:
+            self._schedule_previews()
+        self._on_form_change()
+
+    def _schedule_previews(self) -> None:
+        # Typing a path fires on every key; wait until it settles.
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+        self._preview_job = self.after(PREVIEW_DELAY_MS, self._update_previews)
+
+    def _update_previews(self) -> None:
+        self._preview_job = None
+        self.image_strip.show(self._get_images_from_text())
+
+    def _on_form_change(self) -> None:
+        if self._form_loading or self.current_id is None:
+            return
+        self.dirty = True
+        if self._autosave_job is not None:
+            self.after_cancel(self._autosave_job)
+        self._autosave_job = self.after(AUTOSAVE_MS, self._autosave)
+
+    def _flush_autosave(self) -> None:
+        if self._autosave_job is not None:
+            self.after_cancel(self._autosave_job)
+            self._autosave()
+
+    def _cancel_autosave(self) -> None:
+        if self._autosave_job is not None:
+            self.after_cancel(self._autosave_job)
+            self._autosave_job = None
+
+    @traced()
     def _populate_form(self, entry: Dict[str, Any]) -> None:
+        self._form_loading = True
+        try:
+            self._fill_form(entry)
+        finally:
+            self._form_loading = False
+        self._form_token += 1
+        self.dirty = False
+
+    def _fill_form(self, entry: Dict[str, Any]) -> None:
+        # Text widgets report <<Modified>> later, from the event loop; the
+        # autosave that may trigger finds nothing changed and skips the write.
         self.var_title.set(entry.get("title", ""))
         self.var_date.set(entry.get("date", ""))
         self.var_tag.set(entry.get("tag", "ข่าว/ประกาศ"))
@@ -193,6 +635,7 @@ class NewsEditor(tk.Tk):
         self.body_text.delete("1.0", tk.END)
         self.body_text.insert(tk.END, entry.get("body", ""))
         self._set_images_text(normalize_images(entry))
+        self.image_strip.show(normalize_images(entry))
         self._set_links_text(normalize_links(entry))
 
     def _set_images_text(self, items: List[str]) -> None:
@@ -236,16 +679,10 @@ class NewsEditor(tk.Tk):
         return results
 
     def _new_entry(self) -> None:
-        self.current_index = None
-        self.var_title.set("")
-        self.var_date.set("")
-        self.var_tag.set("ข่าว/ประกาศ")
-        self.var_by.set("")
-        self.summary_text.delete("1.0", tk.END)
-        self.body_text.delete("1.0", tk.END)
-        self._set_images_text([])
-        self._set_links_text([])
-        self.listbox.selection_clear(0, tk.END)
+        self._flush_autosave()
+        self.current_id = None
+        self._populate_form({})
+        self.news_list.select(None)
 
     def _add_image_from_dialog(self) -> None:
         paths = filedialog.askopenfilenames(
@@ -255,15 +692,27 @@ class NewsEditor(tk.Tk):
         )
         if not paths:
             return
+        self.var_status.set("กำลังนำเข้ารูป ...")
+        token = self._form_token
+        self.worker.submit(ingest_images, list(paths), on_done=lambda result: self._on_ingested(token, result))
+
+    def _on_ingested(self, token: int, result: Tuple[List[str], int, List[str]]) -> None:
+        sources, reused, errors = result
+        if errors:
+            messagebox.showwarning("นำเข้ารูปไม่ได้บางไฟล์", "\n".join(errors))
+        if token != self._form_token or not sources:
+            self.var_status.set("ไม่ได้เพิ่มรูป")
+            return
         current = self._get_images_from_text()
-        for raw in paths:
-            path = Path(raw)
-            try:
-                rel = path.relative_to(ROOT)
-                current.append("./" + rel.as_posix())
-            except ValueError:
-                current.append(path.as_posix())
+        current.extend(src for src in sources if src not in current)
         self._set_images_text(current)
+        copied = len(sources) - reused
+        self.var_status.set(f"นำเข้ารูปใหม่ {copied} รูป ใช้ไฟล์ที่มีอยู่แล้ว {reused} รูป กำลังเตรียมรูปย่อ ...")
+        self.worker.submit(
+            warm_variants,
+            current,
+            on_done=lambda count: self.var_status.set(f"เตรียมรูปย่อแล้ว {count} รูป"),
+        )
 
     def _add_link_via_dialog(self) -> None:
         url = simpledialog.askstring("เพิ่มลิงก์", "URL:", parent=self)
@@ -279,54 +728,120 @@ class NewsEditor(tk.Tk):
         self.links_text.delete("1.0", tk.END)
         self.links_text.insert(tk.END, current)
 
-    def _save_entry(self) -> None:
-        title = self.var_title.get().strip()
-        date = self.var_date.get().strip()
-        body = self.body_text.get("1.0", tk.END).strip()
-        if not title or not date or not body:
-            messagebox.showerror("ข้อมูลไม่ครบ", "กรุณากรอกหัวข้อ วันที่ และเนื้อหาหลักให้ครบ")
-            return
+    def _form_fields(self) -> Tuple[Dict[str, Any], List[str], List[Dict[str, str]]]:
         entry: Dict[str, Any] = {
-            "title": title,
+            "id": self.current_id or "",
+            "title": self.var_title.get().strip(),
             "date": self.var_date.get().strip(),
             "tag": self.var_tag.get().strip(),
             "by": self.var_by.get().strip(),
             "summary": self.summary_text.get("1.0", tk.END).strip(),
-            "body": body,
+            "body": self.body_text.get("1.0", tk.END).strip(),
         }
-        images = self._get_images_from_text()
-        links = self._get_links_from_text()
-        apply_media_fields(entry, images, links)
+        return entry, self._get_images_from_text(), self._get_links_from_text()
+
+    def _form_problem(self, entry: Dict[str, Any]) -> Tuple[str, str] | None:
+        if not entry["title"] or not entry["date"] or not entry["body"]:
+            return "ข้อมูลไม่ครบ", "กรุณากรอกหัวข้อ วันที่ และเนื้อหาหลักให้ครบ"
+        if parse_news_date(entry["date"]) is None:
+            return "วันที่ไม่ถูกต้อง", f"อ่านวันที่ไม่ได้\n{DATE_HINT}"
+        return None
+
+    def _save_entry(self) -> None:
+        self._cancel_autosave()
+        entry, images, links = self._form_fields()
+        problem = self._form_problem(entry)
+        if problem:
+            messagebox.showerror(*problem)
+            return
+        self._submit_save(entry, images, links, quiet=False)
+
+    def _autosave(self) -> None:
+        self._autosave_job = None
+        if self.current_id is None or not self.dirty:
+            return
+        entry, images, links = self._form_fields()
+        stored = self.news.get(self.current_id, {})
+        if (
+            all(entry[key] == stored.get(key, "") for key in ("title", "date", "tag", "by", "summary", "body"))
+            and images == normalize_images(stored)
+            and links == normalize_links(stored)
+        ):
+            self.dirty = False
+            return
+        problem = self._form_problem(entry)
+        if problem:
+            self.var_status.set(f"ยังไม่บันทึกอัตโนมัติ: {problem[1].splitlines()[-1]}")
+            return
+        self._submit_save(entry, images, links, quiet=True)
+
+    def _submit_save(self, entry: Dict[str, Any], images: List[str], links: List[Dict[str, str]], quiet: bool) -> None:
+        token = self._form_token
+        self.dirty = False
+        self.var_status.set("กำลังบันทึก ...")
+        self.worker.submit(
+            save_news_entry,
+            entry,
+            images,
+            links,
+            on_done=lambda saved: self._on_saved(saved, token, quiet),
+            on_error=self._on_save_error,
+        )
 
-        if self.current_index is None:
-            self.news.insert(0, entry)
-            self.current_index = 0
+    def _on_saved(self, entry: Dict[str, Any], token: int, quiet: bool) -> None:
+        self.news[entry["id"]] = entry
+        self.search_index.add(entry)
+        if token == self._form_token and self.current_id is None:
+            # A new entry got its id; keep editing (and autosaving) it.
+            self.current_id = entry["id"]
+        if self.var_filter.get().strip():
+            self._refresh_list()
         else:
-            self.news[self.current_index] = entry
-        save_news_file(self.news)
-        self._refresh_list()
-        self.listbox.selection_clear(0, tk.END)
-        if self.current_index is not None:
-            self.listbox.selection_set(self.current_index)
-        messagebox.showinfo("บันทึกแล้ว", "บันทึกข้อมูลข่าวเรียบร้อย")
+            self.news_list.update_entry(entry)
+            self.news_list.select(self.current_id)
+        self.var_status.set(f"{'บันทึกอัตโนมัติ' if quiet else 'บันทึก'}แล้ว {time.strftime('%H:%M:%S')}")
+        if not quiet:
+            messagebox.showinfo("บันทึกแล้ว", "บันทึกข้อมูลข่าวเรียบร้อย")
+
+    def _on_save_error(self, exc: Exception) -> None:
+        self.dirty = True
+        self.var_status.set("บันทึกไม่สำเร็จ")
+        messagebox.showerror("บันทึกไม่สำเร็จ", str(exc))
 
     def _delete_entry(self) -> None:
-        if self.current_index is None:
+        if self.current_id is None:
             messagebox.showwarning("ยังไม่ได้เลือก", "กรุณาเลือกรายการจากด้านซ้ายก่อน")
             return
         confirm = messagebox.askyesno("ยืนยันการลบ", "ต้องการลบข่าวนี้หรือไม่?")
         if not confirm:
             return
-        del self.news[self.current_index]
-        save_news_file(self.news)
-        self.current_index = None
-        self._refresh_list()
+        self._cancel_autosave()
+        entry_id = self.current_id
+        self.worker.submit(STORE.delete, entry_id, on_done=lambda _: self._on_deleted(entry_id), on_error=self._on_save_error)
+        self.dirty = False
         self._new_entry()
 
+    def _on_deleted(self, entry_id: str) -> None:
+        self.news.pop(entry_id, None)
+        self.search_index.remove(entry_id)
+        self.news_list.remove_entry(entry_id)
+        self.var_status.set("ลบข่าวแล้ว")
+
+    def _on_close(self) -> None:
+        self._flush_autosave()
+        self.var_status.set("กำลังบันทึก ...")
+        self.update_idletasks()
+        self.worker.stop()
+        self.destroy()
+
 
 def main() -> None:
-    app = NewsEditor()
-    app.mainloop()
+    parser = argparse.ArgumentParser(description="โปรแกรมแก้ไขข่าวใน news.json")
+    add_arguments(parser)
+    args = parser.parse_args()
+    with session("news_editor_gui", args):
+        app = NewsEditor()
+        app.mainloop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""RSS 2.0, Atom and JSON Feed files for the latest news.
+
+``publish_feeds()`` is called from ``publish()`` and writes ``feed.xml``
+(RSS), ``atom.xml`` and ``feed.json`` in the site root with the newest
+``FEED_COUNT`` entries. Each entry is identified by a ``tag:`` URI built
+from its news id, so readers never see an article twice, and links to
+``news.html#<id>``, which opens the article. Dates come from ``dateKey``
+(midnight, Bangkok time).
+
+A feed's content depends only on the entries it includes: the feed-level
+``updated``/``lastBuildDate`` is the newest entry date, not the build time.
+A file is therefore rewritten only when those entries change, so its
+``Last-Modified`` and ``ETag`` on the host stay put and polling readers get
+304s. ``<ttl>`` asks RSS readers to poll at most every ``FEED_TTL`` minutes.
+"""
+
+from __future__ import annotations
+
+import json
+import mimetypes
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from xml.sax.saxutils import escape as xml_escape
+
+from news_media import local_path, medium_for
+from news_schema import normalize_images, published
+
+ROOT = Path(__file__).resolve().parents[1]
+SITE_URL = "https://fourgame.github.io/website_Health_Education_MU"
+RSS_PATH = ROOT / "feed.xml"
+ATOM_PATH = ROOT / "atom.xml"
+JSON_FEED_PATH = ROOT / "feed.json"
+FEED_COUNT = 20
+FEED_TTL = 60
+FEED_TITLE = "ข่าว/ประกาศ ภาควิชาสุขศึกษาและพฤติกรรมศาสตร์"
+FEED_DESCRIPTION = "ข่าวและประกาศจากภาควิชาสุขศึกษาและพฤติกรรมศาสตร์ คณะสาธารณสุขศาสตร์ มหาวิทยาลัยมหิดล"
+FEED_LANGUAGE = "th"
+# Entry ids never change, so neither does this prefix.
+ID_PREFIX = "tag:fourgame.github.io,2025:news/"
+BANGKOK = timezone(timedelta(hours=7))
+
+
+def absolute_url(path: str) -> str:
+    if "://" in path:
+        return path
+    return f"{SITE_URL}/{path[2:] if path.startswith('./') else path.lstrip('/')}"
+
+
+def entry_time(entry: Dict[str, Any]) -> Optional[datetime]:
+    key = entry.get("dateKey", "")
+    try:
+        return datetime.fromisoformat(key).replace(tzinfo=BANGKOK) if key else None
+    except ValueError:
+        return None
+
+
+def content_html(entry: Dict[str, Any], image: str) -> str:
+    paragraphs = [part.strip() for part in (entry.get("body") or entry.get("summary") or "").split("\n\n") if part.strip()]
+    html = "".join(f"<p>{escape(part).replace(chr(10), '<br>')}</p>" for part in paragraphs)
+    if image:
+        html = f'<p><img src="{escape(image)}" alt=""></p>' + html
+    return html
+
+
+def feed_entries(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The fields every feed format needs, for the newest ``FEED_COUNT`` entries."""
+    entries = []
+    for entry in items[:FEED_COUNT]:
+        images = normalize_images(entry)
+        image = medium_for(entry, images[0]) if images else ""
+        entries.append({
+            "id": ID_PREFIX + entry["id"],
+            "url": f"{SITE_URL}/news.html#{entry['id']}",
+            "title": entry.get("title") or "ยังไม่ระบุหัวข้อ",
+            "summary": entry.get("summary", ""),
+            "html": content_html(entry, absolute_url(image) if image else ""),
+            "author": entry.get("by", ""),
+            "tag": entry.get("tag", ""),
+            "time": entry_time(entry),
+            "image": absolute_url(image) if image else "",
+            "image_path": local_path(image) if image else None,
+        })
+    return entries
+
+
+def newest(entries: List[Dict[str, Any]]) -> datetime:
+    times = [entry["time"] for entry in entries if entry["time"]]
+    return max(times) if times else datetime(2000, 1, 1, tzinfo=BANGKOK)
+
+
+def render_rss(entries: List[Dict[str, Any]]) -> str:
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">',
+        "<channel>",
+        f"<title>{xml_escape(FEED_TITLE)}</title>",
+        f"<link>{SITE_URL}/news.html</link>",
+        f"<description>{xml_escape(FEED_DESCRIPTION)}</description>",
+        f"<language>{FEED_LANGUAGE}</language>",
+        f"<lastBuildDate>{format_datetime(newest(entries))}</lastBuildDate>",
+        f"<ttl>{FEED_TTL}</ttl>",
+        f'<atom:link href="{SITE_URL}/{RSS_PATH.name}" rel="self" type="application/rss+xml"/>',
+    ]
+    for entry in entries:
+        lines.append("<item>")
+        lines.append(f"<title>{xml_escape(entry['title'])}</title>")
+        lines.append(f"<link>{entry['url']}</link>")
+        lines.append(f'<guid isPermaLink="false">{entry["id"]}</guid>')
+        if entry["time"]:
+            lines.append(f"<pubDate>{format_datetime(entry['time'])}</pubDate>")
+        if entry["tag"]:
+            lines.append(f"<category>{xml_escape(entry['tag'])}</category>")
+        lines.append(f"<description>{xml_escape(entry['html'] or escape(entry['summary']))}</description>")
+        if entry["image_path"]:
+            kind = mimetypes.guess_type(entry["image_path"].name)[0] or "image/webp"
+            size = entry["image_path"].stat().st_size
+            lines.append(f'<enclosure url="{xml_escape(entry["image"])}" length="{size}" type="{kind}"/>')
+        lines.append("</item>")
+    lines += ["</channel>", "</rss>"]
+    return "\n".join(lines) + "\n"
+
+
+def render_atom(entries: List[Dict[str, Any]]) -> str:
+    updated = newest(entries)
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        f'<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="{FEED_LANGUAGE}">',
+        f"<id>{ID_PREFIX}feed</id>",
+        f"<title>{xml_escape(FEED_TITLE)}</title>",
+        f"<subtitle>{xml_escape(FEED_DESCRIPTION)}</subtitle>",
+        f"<updated>{updated.isoformat()}</updated>",
+        f'<link href="{SITE_URL}/news.html" rel="alternate" type="text/html"/>',
+        f'<link href="{SITE_URL}/{ATOM_PATH.name}" rel="self" type="application/atom+xml"/>',
+    ]
+    for entry in entries:
+        lines.append("<entry>")
+        lines.append(f"<id>{entry['id']}</id>")
+        lines.append(f"<title>{xml_escape(entry['title'])}</title>")
+        lines.append(f'<link href="{entry["url"]}" rel="alternate" type="text/html"/>')
+        lines.append(f"<updated>{(entry['time'] or updated).isoformat()}</updated>")
+        if entry["time"]:
+            lines.append(f"<published>{entry['time'].isoformat()}</published>")
+        if entry["author"]:
+            lines.append(f"<author><name>{xml_escape(entry['author'])}</name></author>")
+        if entry["tag"]:
+            lines.append(f'<category term="{xml_escape(entry["tag"], {chr(34): "&quot;"})}"/>')
+        if entry["summary"]:
+            lines.append(f"<summary>{xml_escape(entry['summary'])}</summary>")
+        if entry["html"]:
+            lines.append(f'<content type="html">{xml_escape(entry["html"])}</content>')
+        lines.append("</entry>")
+    lines.append("</feed>")
+    return "\n".join(lines) + "\n"
+
+
+def render_json_feed(entries: List[Dict[str, Any]]) -> str:
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": FEED_TITLE,
+        "home_page_url": f"{SITE_URL}/news.html",
+        "feed_url": f"{SITE_URL}/{JSON_FEED_PATH.name}",
+        "description": FEED_DESCRIPTION,
+        "language": FEED_LANGUAGE,
+        "items": [
+            published({
+                "id": entry["id"],
+                "url": entry["url"],
+                "title": entry["title"],
+                "summary": entry["summary"],
+                "content_html": entry["html"],
+                "image": entry["image"],
+                "date_published": entry["time"].isoformat() if entry["time"] else "",
+                "authors": [{"name": entry["author"]}] if entry["author"] else [],
+                "tags": [entry["tag"]] if entry["tag"] else [],
+            })
+            for entry in entries
+        ],
+    }
+    return json.dumps(feed, ensure_ascii=False, indent=1) + "\n"
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def publish_feeds(items: List[Dict[str, Any]]) -> List[Path]:
+    entries = feed_entries(items)
+    changed: List[Path] = []
+    for path, render in ((RSS_PATH, render_rss), (ATOM_PATH, render_atom), (JSON_FEED_PATH, render_json_feed)):
+        if write_if_changed(path, render(entries)):
+            changed.append(path)
+    return changed
+
+
+def main() -> None:
+    from update_news import load_news
+
+    changed = publish_feeds(load_news())
+    for path in changed:
+        print(f"อัปเดต {path.relative_to(ROOT).as_posix()}")
+    if not changed:
+        print("ฟีดข่าวเป็นปัจจุบันอยู่แล้ว")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Thumbnail and medium-size variants for news images.
+
+``attach_variants()`` is called from ``apply_media_fields()`` in both editors.
+Variants are WebP files named after the source content hash under
+``assets/news/variants/`` and are recorded on the entry as::
+
+    "imageVariants": {"./assets/x.jpg": {"thumb": "...", "medium": "..."}}
+
+Cards use the thumbnail and the modal the medium file. Run this module
+directly to backfill every entry in news.json in parallel.
+
+``ingest_image()`` brings a picked file into the site: files outside
+``assets/`` are copied once to ``assets/news/originals/<hash>.<ext>``, named
+after their content, so picking the same photo again reuses the copy.
+Originals longer than ``ORIGINAL_MAX`` pixels on a side are downscaled on the
+way in. ``preview_png()`` makes the small previews the GUI editor shows and
+keeps the last ``PREVIEW_CACHE`` of them in memory.
+
+Needs Pillow; without it entries are saved without variants, picked files
+are copied at full size and the editor shows no previews.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - depends on the local environment
+    Image = None
+    ImageOps = None
+
+from news_schema import normalize_images
+
+ROOT = Path(__file__).resolve().parents[1]
+ASSETS_DIR = ROOT / "assets"
+VARIANTS_DIR = ASSETS_DIR / "news" / "variants"
+ORIGINALS_DIR = ASSETS_DIR / "news" / "originals"
+# Cards are 176 px tall (``h-44``) and about 400 px wide; thumbnails are 2x.
+THUMB_SIZE = (800, 352)
+# The modal is ``max-w-3xl`` with images capped at ``max-h-[60vh]``.
+MEDIUM_SIZE = (1600, 1200)
+QUALITY = 80
+# Longest side kept for ingested originals; twice the medium variant's width
+# leaves room for future variants without storing camera-sized files.
+ORIGINAL_MAX = 3200
+ORIGINAL_QUALITY = 88
+# Pillow formats re-encoded when downscaling; anything else (GIF) is copied as is.
+RESAVE_FORMATS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+PREVIEW_SIZE = (96, 72)
+PREVIEW_CACHE = 256
+
+
+class IngestError(Exception):
+    """Raised when a picked file cannot be read as an image."""
+
+
+def local_path(src: str) -> Optional[Path]:
+    if not src or "://" in src or src.startswith(("data:", "//")):
+        return None
+    path = (ROOT / (src[2:] if src.startswith("./") else src.lstrip("/"))).resolve()
+    try:
+        path.relative_to(ROOT)
+    except ValueError:
+        return None
+    return path if path.is_file() else None
+
+
+def content_key(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def site_path(path: Path) -> str:
+    return "./" + path.relative_to(ROOT).as_posix()
+
+
+def _existing_original(key: str) -> Optional[Path]:
+    matches = sorted(ORIGINALS_DIR.glob(f"{key}.*"))
+    return matches[0] if matches else None
+
+
+def _downscaled(source: Path) -> Optional[Tuple[bytes, str]]:
+    """Re-encoded bytes and suffix for an oversized ``source``, or None to copy it as is."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(source) as image:
+            kind = image.format
+            if kind not in RESAVE_FORMATS or max(image.size) <= ORIGINAL_MAX:
+                return None
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((ORIGINAL_MAX, ORIGINAL_MAX), Image.LANCZOS)
+            if kind == "JPEG" and image.mode != "RGB":
+                image = image.convert("RGB")
+            buffer = io.BytesIO()
+            image.save(buffer, kind, quality=ORIGINAL_QUALITY, optimize=True)
+    except OSError as exc:
+        raise IngestError(f"{source.name} ไม่ใช่ไฟล์รูปภาพที่อ่านได้ ({exc})") from exc
+    return buffer.getvalue(), RESAVE_FORMATS[kind]
+
+
+def _write_original(source: Path, key: str) -> Path:
+    ORIGINALS_DIR.mkdir(parents=True, exist_ok=True)
+    scaled = _downscaled(source)
+    suffix = scaled[1] if scaled else source.suffix.lower().replace(".jpeg", ".jpg")
+    target = ORIGINALS_DIR / f"{key}{suffix}"
+    # Write beside the target and rename, so a half-copied file never matches a hash.
+    tmp = target.with_name(f".{target.name}.tmp")
+    if scaled:
+        tmp.write_bytes(scaled[0])
+    else:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+    return target
+
+
+def _verify(source: Path) -> None:
+    if Image is None:
+        return
+    try:
+        with Image.open(source) as image:
+            image.verify()
+        # verify() checks little for JPEG; decoding catches truncated files.
+        with Image.open(source) as image:
+            image.load()
+    except (OSError, SyntaxError) as exc:
+        # Pillow reports some corrupt PNG chunks as SyntaxError.
+        raise IngestError(f"{source.name} ไม่ใช่ไฟล์รูปภาพที่อ่านได้ ({exc})") from exc
+
+
+def ingest_image(path: Path) -> Tuple[str, bool]:
+    """Site path for the picked file ``path``, and whether an existing file was reused.
+
+    Files already under ``assets/`` are used where they are. Others are
+    stored once by content hash, so the same photo picked twice, or from
+    two folders, ends up as one asset. Every file is checked with Pillow
+    first; one it cannot read raises ``IngestError``.
+    """
+    source = path.resolve()
+    if not source.is_file():
+        raise IngestError(f"ไม่พบไฟล์ {path}")
+    _verify(source)
+    try:
+        source.relative_to(ASSETS_DIR)
+    except ValueError:
+        pass
+    else:
+        return site_path(source), True
+    key = content_key(source)
+    existing = _existing_original(key)
+    if existing is not None:
+        return site_path(existing), True
+    return site_path(_write_original(source, key)), False
+
+
+@lru_cache(maxsize=PREVIEW_CACHE)
+def _preview(path: Path, stamp: Tuple[int, int]) -> Optional[bytes]:
+    try:
+        with Image.open(path) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail(PREVIEW_SIZE, Image.LANCZOS)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            buffer = io.BytesIO()
+            image.save(buffer, "PNG")
+    except OSError:
+        return None
+    return buffer.getvalue()
+
+
+def preview_png(src: str) -> Optional[bytes]:
+    """PNG bytes of a ``PREVIEW_SIZE`` preview of ``src``, or None if it cannot be shown.
+
+    Cached by path, modification time and size, so an edited file gets a
+    new preview.
+    """
+    if Image is None:
+        return None
+    source = local_path(src)
+    if source is None:
+        return None
+    info = source.stat()
+    return _preview(source, (info.st_mtime_ns, info.st_size))
+
+
+def _save_webp(image: Any, target: Path) -> None:
+    # Variants are reused whenever they exist, so a partly written one must never appear under its name.
+    handle, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.stem}.", suffix=".tmp")
+    os.close(handle)
+    try:
+        image.save(tmp, "WEBP", quality=QUALITY)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def make_variants(src: str) -> Optional[Dict[str, str]]:
+    """Create (or reuse) the thumbnail and medium files for ``src``.
+
+    Returns None when ``src`` is not a local image Pillow can read, so the
+    entry is saved without variants for it.
+    """
+    if Image is None:
+        return None
+    source = local_path(src)
+    if source is None:
+        return None
+    try:
+        key = content_key(source)
+        thumb = VARIANTS_DIR / f"{key}-thumb.webp"
+        medium = VARIANTS_DIR / f"{key}-medium.webp"
+        if not (thumb.exists() and medium.exists()):
+            VARIANTS_DIR.mkdir(parents=True, exist_ok=True)
+            with Image.open(source) as image:
+                image = ImageOps.exif_transpose(image)
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+                _save_webp(ImageOps.fit(image, THUMB_SIZE, Image.LANCZOS), thumb)
+                scaled = image.copy()
+                scaled.thumbnail(MEDIUM_SIZE, Image.LANCZOS)
+                _save_webp(scaled, medium)
+    except OSError:
+        # Not a raster image (an SVG), truncated or unreadable; UnidentifiedImageError is an OSError.
+        return None
+    return {"thumb": site_path(thumb), "medium": site_path(medium)}
+
+
+def attach_variants(entry: Dict[str, Any], images: List[str]) -> None:
+    previous = entry.get("imageVariants")
+    previous = previous if isinstance(previous, dict) else {}
+    variants: Dict[str, Dict[str, str]] = {}
+    for src in images:
+        if src in variants:
+            continue
+        made = make_variants(src)
+        if made:
+            variants[src] = made
+        elif src in previous:
+            variants[src] = previous[src]
+    if variants:
+        entry["imageVariants"] = variants
+    else:
+        entry.pop("imageVariants", None)
+
+
+def thumb_for(entry: Dict[str, Any], src: str) -> str:
+    record = (entry.get("imageVariants") or {}).get(src)
+    return record.get("thumb", src) if isinstance(record, dict) else src
+
+
+def medium_for(entry: Dict[str, Any], src: str) -> str:
+    record = (entry.get("imageVariants") or {}).get(src)
+    return record.get("medium", src) if isinstance(record, dict) else src
+
+
+def backfill(items: List[Dict[str, Any]], jobs: int) -> List[Dict[str, Any]]:
+    """Attach variants to every entry; returns the entries whose variants changed."""
+    sources = sorted({src for entry in items for src in normalize_images(entry)})
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        made = dict(zip(sources, pool.map(make_variants, sources)))
+    updated: List[Dict[str, Any]] = []
+    for entry in items:
+        before = entry.get("imageVariants")
+        variants = {src: made[src] for src in normalize_images(entry) if made.get(src)}
+        if variants:
+            entry["imageVariants"] = variants
+        else:
+            entry.pop("imageVariants", None)
+        if entry.get("imageVariants") != before:
+            updated.append(entry)
+    return updated
+
+
+def main() -> None:
+    from update_news import load_news, save_news
+
+    parser = argparse.ArgumentParser(description="สร้างรูปย่อของข่าวทุกรายการใน news.json")
+    parser.add_argument("--jobs", type=int, default=4, help="จำนวนเธรดที่ใช้แปลงรูป")
+    args = parser.parse_args()
+    if Image is None:
+        print("ต้องติดตั้ง Pillow ก่อน: pip install Pillow")
+        raise SystemExit(1)
+    items = load_news()
+    updated = backfill(items, args.jobs)
+    if updated:
+        save_news(updated)
+    print(f"อัปเดตรูปย่อ {len(updated)} รายการ")
+
+
+if __name__ == "__main__":
+    main()
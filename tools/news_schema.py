@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Versioned schema for news.json and the compact form the website downloads.
+
+Schema 1 (the original file) is a bare list of entries that store each
+image and link twice: ``images`` plus ``image``, and ``links`` plus
+``link``/``linkLabel``. Schema 2 wraps the list as
+``{"schema": 2, "items": [...]}`` and keeps only ``images`` and ``links``.
+``NewsStore`` migrates schema 1 on load with ``migrate_entry()``; no
+information is lost because the legacy fields are always derivable from the
+lists (``legacy_entry()`` rebuilds them).
+
+news.json stays indented for authors. ``published()`` is what
+``publish_news.py`` writes: minified, with empty fields left out.
+
+Run directly to migrate news.json, or with ``--legacy OUT`` to write a
+schema 1 copy for older tools.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+SCHEMA_VERSION = 2
+LEGACY_FIELDS = ("image", "link", "linkLabel")
+
+
+class SchemaError(ValueError):
+    """Raised for a news.json document this version cannot read."""
+
+
+def normalize_images(entry: Dict[str, Any]) -> List[str]:
+    value = entry.get("images")
+    if isinstance(value, list):
+        items = [str(v).strip() for v in value if str(v).strip()]
+        if items:
+            return items
+    single = str(entry.get("image", "")).strip()
+    return [single] if single else []
+
+
+def normalize_links(entry: Dict[str, Any]) -> List[Dict[str, str]]:
+    result: List[Dict[str, str]] = []
+    value = entry.get("links")
+    if isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict):
+                url = str(item.get("url", "")).strip()
+                label = str(item.get("label", "")).strip()
+                if url:
+                    result.append({"label": label, "url": url})
+            elif isinstance(item, str):
+                url = item.strip()
+                if url:
+                    result.append({"label": "", "url": url})
+    link = str(entry.get("link", "")).strip()
+    if link and not result:
+        label = str(entry.get("linkLabel", "")).strip()
+        result.append({"label": label, "url": link})
+    return result
+
+
+def migrate_entry(entry: Dict[str, Any]) -> bool:
+    """Bring one entry to the current schema in place. Returns True if it changed."""
+    before = {key: entry.get(key) for key in ("images", "links", *LEGACY_FIELDS)}
+    entry["images"] = normalize_images(entry)
+    entry["links"] = normalize_links(entry)
+    for key in LEGACY_FIELDS:
+        entry.pop(key, None)
+    return before != {key: entry.get(key) for key in before}
+
+
+def legacy_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema 1 copy of ``entry`` with the duplicated fields filled in again."""
+    images = normalize_images(entry)
+    links = normalize_links(entry)
+    legacy = dict(entry)
+    legacy["image"] = images[0] if images else ""
+    legacy["link"] = links[0]["url"] if links else ""
+    legacy["linkLabel"] = links[0]["label"] if links else ""
+    return legacy
+
+
+def read_document(data: Any) -> Tuple[List[Dict[str, Any]], int]:
+    """Entries and schema version of a parsed news.json document."""
+    if isinstance(data, list):
+        return [entry for entry in data if isinstance(entry, dict)], 1
+    if isinstance(data, dict) and isinstance(data.get("items"), list):
+        version = data.get("schema")
+        if not isinstance(version, int) or version > SCHEMA_VERSION:
+            raise SchemaError(f"news.json ใช้ schema {version} ซึ่งเครื่องมือนี้ยังไม่รองรับ")
+        return [entry for entry in data["items"] if isinstance(entry, dict)], version
+    raise SchemaError("news.json ต้องเป็นลิสต์หรือออบเจ็กต์ที่มี items")
+
+
+def source_document(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"schema": SCHEMA_VERSION, "items": items}
+
+
+def published(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop empty values; the site already falls back for missing fields."""
+    result: Dict[str, Any] = {}
+    for key, value in record.items():
+        if value in ("", None, [], {}):
+            continue
+        if key == "links":
+            value = [{k: v for k, v in link.items() if v} for link in value]
+        result[key] = value
+    return result
+
+
+def main() -> None:
+    from news_store import NEWS_PATH, NewsStore, StoreError
+
+    parser = argparse.ArgumentParser(description="ย้าย news.json ไปเป็น schema ล่าสุด")
+    parser.add_argument("--legacy", type=Path, help="เขียนสำเนา schema 1 (ลิสต์ที่มี image/link/linkLabel) ไปที่ไฟล์นี้")
+    args = parser.parse_args()
+
+    before = NEWS_PATH.stat().st_size if NEWS_PATH.exists() else 0
+    store = NewsStore()
+    try:
+        items = store.load()
+    except StoreError as exc:
+        print("อ่าน news.json ไม่ได้ กรุณาตรวจสอบว่าเป็นไฟล์ JSON ที่ถูกต้องก่อน")
+        print(exc)
+        raise SystemExit(1)
+    if args.legacy:
+        with args.legacy.open("w", encoding="utf-8") as handle:
+            json.dump([legacy_entry(entry) for entry in items], handle, ensure_ascii=False, indent=2)
+            handle.write("\n")
+        print(f"เขียนสำเนา schema 1 ไปที่ {args.legacy}")
+        return
+    store.compact()
+    after = NEWS_PATH.stat().st_size
+    print(f"news.json ใช้ schema {SCHEMA_VERSION} แล้ว ({len(items)} รายการ, {before:,} -> {after:,} ไบต์)")
+
+
+if __name__ == "__main__":
+    main()
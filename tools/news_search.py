@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""Full-text search over news entries, shared by the editors and the website.
+
+Text is lower-cased and split into Latin/digit words and Thai runs. Thai has
+no spaces between words, so each run is segmented by dictionary maximal
+matching (the split with the fewest unknown characters, then the fewest
+words) against ``thai_words.txt``. Characters the dictionary does not cover
+are indexed as overlapping bigrams, so names and new terms still match.
+
+``SearchIndex`` is the in-memory index used by ``update_news.py`` and
+``news_editor_gui.py``. ``build_shards()`` turns the same postings into the
+files written by ``publish_news.py`` under ``news/search/``: one shard per
+first character of the term plus ``meta.json``. The browser reads the meta
+file, segments the query with the dictionary words listed there and fetches
+only the shards its terms start with.
+
+Run directly to try a query against news.json.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from news_dates import THAI_DIGITS
+
+WORDS_PATH = Path(__file__).with_name("thai_words.txt")
+INDEX_VERSION = 1
+# Score added per occurrence of a term in each field.
+FIELD_WEIGHTS = {"title": 5, "tag": 3, "by": 3, "summary": 2, "body": 1}
+RUN_RE = re.compile(r"[a-z0-9]+|[ก-๎]+")
+# Repetition and abbreviation marks carry no meaning on their own.
+NOISE = {"ๆ", "ฯ"}
+
+
+@lru_cache(maxsize=1)
+def dictionary() -> Tuple[FrozenSet[str], int]:
+    words = set()
+    if WORDS_PATH.exists():
+        for line in WORDS_PATH.read_text(encoding="utf-8").splitlines():
+            word = normalize(line.strip())
+            if word and not word.startswith("#"):
+                words.add(word)
+    return frozenset(words), max((len(word) for word in words), default=1)
+
+
+def normalize(text: str) -> str:
+    # SARA AM is sometimes typed as NIKHAHIT + SARA AA; fold it to one code point.
+    text = unicodedata.normalize("NFC", str(text or "")).lower().translate(THAI_DIGITS)
+    return text.replace("ํา", "ำ")
+
+
+def segment_thai(run: str) -> List[Tuple[str, bool]]:
+    """Split a Thai run into ``(piece, known)`` pairs by maximal matching."""
+    words, max_len = dictionary()
+    size = len(run)
+    # best[i] = (unknown characters, pieces) for run[:i]; back[i] = (start, known).
+    best: List[Any] = [None] * (size + 1)
+    back: List[Tuple[int, bool]] = [(0, False)] * (size + 1)
+    best[0] = (0, 0)
+    for start in range(size):
+        if best[start] is None:
+            continue
+        unknown, pieces = best[start]
+        for end in range(start + 1, min(size, start + max_len) + 1):
+            if run[start:end] in words:
+                cost = (unknown, pieces + 1)
+                if best[end] is None or cost < best[end]:
+                    best[end] = cost
+                    back[end] = (start, True)
+        cost = (unknown + 1, pieces + 1)
+        if best[start + 1] is None or cost < best[start + 1]:
+            best[start + 1] = cost
+            back[start + 1] = (start, False)
+
+    result: List[Tuple[str, bool]] = []
+    end = size
+    while end > 0:
+        start, known = back[end]
+        piece = run[start:end]
+        if not known and result and not result[-1][1]:
+            # Merge consecutive unknown characters into one chunk.
+            piece += result.pop()[0]
+        result.append((piece, known))
+        end = start
+    result.reverse()
+    return result
+
+
+def tokenize(text: str) -> List[str]:
+    tokens: List[str] = []
+    for run in RUN_RE.findall(normalize(text)):
+        if run.isascii():
+            tokens.append(run)
+            continue
+        for piece, known in segment_thai(run):
+            if known or len(piece) == 1:
+                if piece not in NOISE:
+                    tokens.append(piece)
+            else:
+                tokens.extend(piece[i : i + 2] for i in range(len(piece) - 1))
+    return tokens
+
+
+def entry_terms(entry: Dict[str, Any]) -> Dict[str, int]:
+    scores: Dict[str, int] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in tokenize(entry.get(field, "")):
+            scores[term] = scores.get(term, 0) + weight
+    return scores
+
+
+class SearchIndex:
+    """Inverted index ``term -> {entry id: score}`` that can be updated per entry."""
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.doc_terms: Dict[str, Dict[str, int]] = {}
+        self.dates: Dict[str, str] = {}
+
+    @classmethod
+    def build(cls, items: List[Dict[str, Any]]) -> "SearchIndex":
+        index = cls()
+        for entry in items:
+            index.add(entry)
+        return index
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        entry_id = entry["id"]
+        self.remove(entry_id)
+        terms = entry_terms(entry)
+        self.doc_terms[entry_id] = terms
+        self.dates[entry_id] = entry.get("dateKey", "")
+        for term, score in terms.items():
+            self.postings.setdefault(term, {})[entry_id] = score
+
+    def remove(self, entry_id: str) -> None:
+        for term in self.doc_terms.pop(entry_id, {}):
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(entry_id, None)
+            if not docs:
+                del self.postings[term]
+        self.dates.pop(entry_id, None)
+
+    def _matches(self, term: str, prefix: bool) -> Dict[str, int]:
+        if not prefix:
+            return self.postings.get(term, {})
+        found: Dict[str, int] = {}
+        for candidate, docs in self.postings.items():
+            if candidate.startswith(term):
+                for entry_id, score in docs.items():
+                    found[entry_id] = max(found.get(entry_id, 0), score)
+        return found
+
+    def _score(self, terms: List[str]) -> Dict[str, int]:
+        scores: Dict[str, int] = {}
+        for position, term in enumerate(terms):
+            matches = self._matches(term, prefix=position == len(terms) - 1)
+            if position == 0:
+                scores = dict(matches)
+            else:
+                scores = {entry_id: total + matches[entry_id] for entry_id, total in scores.items() if entry_id in matches}
+            if not scores:
+                break
+        return scores
+
+    def search(self, query: str) -> List[str]:
+        """Ids of entries containing every query term, best match first.
+
+        The last term also matches as a prefix so results show up while typing.
+        """
+        scores: Dict[str, int] = {}
+        for terms in query_plans(query):
+            for entry_id, score in self._score(terms).items():
+                scores[entry_id] = max(scores.get(entry_id, 0), score)
+        ranked = sorted(scores, key=lambda entry_id: self.dates.get(entry_id, ""), reverse=True)
+        return sorted(ranked, key=lambda entry_id: scores[entry_id], reverse=True)
+
+
+def query_plans(query: str) -> List[List[str]]:
+    """Term lists to try for ``query``; any of them matching is a hit.
+
+    A half-typed Thai word ("สุขภ") segments into a known word plus stray
+    characters, so the unsegmented last run is also tried as a prefix.
+    """
+    plans = [tokenize(query)]
+    runs = RUN_RE.findall(normalize(query))
+    if runs and not runs[-1].isascii():
+        alternative = tokenize(" ".join(runs[:-1])) + [runs[-1]]
+        if alternative != plans[0]:
+            plans.append(alternative)
+    return [terms for terms in plans if terms]
+
+
+def shard_name(term: str) -> str:
+    return f"{ord(term[0]):04x}"
+
+
+def build_shards(items: List[Dict[str, Any]], page_size: int) -> Tuple[Dict[str, Any], Dict[str, Dict[str, List[int]]]]:
+    """Published form of the index.
+
+    Postings refer to entries by their position in ``items``, which is also
+    their position across the page shards, so the browser finds a card on
+    page ``n // pageSize``. Each posting list is flattened to
+    ``[doc, score, doc, score, ...]``.
+    """
+    index = SearchIndex.build(items)
+    position = {entry["id"]: number for number, entry in enumerate(items)}
+    shards: Dict[str, Dict[str, List[int]]] = {}
+    for term in sorted(index.postings):
+        flat: List[int] = []
+        for entry_id, score in sorted(index.postings[term].items(), key=lambda pair: position[pair[0]]):
+            flat.extend((position[entry_id], score))
+        shards.setdefault(shard_name(term), {})[term] = flat
+    words, _ = dictionary()
+    used = sorted(term for term in index.postings if term in words and not term.isascii())
+    meta = {
+        "version": INDEX_VERSION,
+        "docs": len(items),
+        "pageSize": page_size,
+        "shards": sorted(shards),
+        "words": used,
+    }
+    return meta, shards
+
+
+def main() -> None:
+    from update_news import load_news
+
+    parser = argparse.ArgumentParser(description="ค้นหาข่าวใน news.json")
+    parser.add_argument("query", nargs="+", help="คำค้น")
+    parser.add_argument("--tokens", action="store_true", help="แสดงผลการตัดคำของคำค้น")
+    args = parser.parse_args()
+
+    query = " ".join(args.query)
+    if args.tokens:
+        print(" | ".join(tokenize(query)))
+    items = load_news()
+    by_id = {entry["id"]: entry for entry in items}
+    results = SearchIndex.build(items).search(query)
+    for entry_id in results:
+        entry = by_id[entry_id]
+        print(f"{entry.get('date', '-')} | {entry.get('title', '')}")
+    print(f"พบ {len(results)} รายการ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""Journaled storage for news.json shared by update_news.py and news_editor_gui.py.
+
+``news.json`` is the snapshot. Each add, edit or delete is appended as one JSON
+line to ``news.journal.jsonl`` and fsynced, so a save costs time in proportion
+to the change rather than the archive. Once the journal grows past
+``COMPACT_OPS`` operations (or its size passes the snapshot's), the state is
+replayed from disk and written back to ``news.json`` with an atomic rename,
+then the journal is removed. A lock file keeps the CLI and the GUI from
+writing at the same time.
+
+Run directly to compact the journal into news.json.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List
+
+from news_dates import apply_date_key
+from news_schema import SCHEMA_VERSION, SchemaError, migrate_entry, read_document, source_document
+from news_trace import span, traced
+
+ROOT = Path(__file__).resolve().parents[1]
+NEWS_PATH = ROOT / "news.json"
+COMPACT_OPS = 200
+LOCK_TIMEOUT = 10.0
+
+
+class StoreError(Exception):
+    """Raised when the snapshot cannot be read."""
+
+
+def ensure_entry_id(entry: Dict[str, Any]) -> bool:
+    """Give ``entry`` a stable ``id`` if it has none. Returns True when one was added."""
+    if str(entry.get("id", "")).strip():
+        return False
+    seed = f"{entry.get('title', '')}\n{entry.get('date', '')}\n{time.time_ns()}"
+    entry["id"] = hashlib.sha1(seed.encode("utf-8")).hexdigest()[:10]
+    return True
+
+
+def _fsync_dir(path: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@traced("store.write")
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write ``text`` to a temporary sibling, fsync it and rename it over ``path``."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8", newline="\n") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold an exclusive lock on ``path`` (created if missing) for the block."""
+    handle = path.open("a+b")
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                if os.name == "nt":
+                    import msvcrt
+
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    import fcntl
+
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"รอล็อก {path.name} นานเกิน {timeout:.0f} วินาที")
+                time.sleep(0.05)
+        yield
+    finally:
+        try:
+            if os.name == "nt":
+                import msvcrt
+
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+        handle.close()
+
+
+@traced("store.dump")
+def dump_snapshot(items: List[Dict[str, Any]]) -> str:
+    return json.dumps(source_document(items), ensure_ascii=False, indent=2) + "\n"
+
+
+def sort_key(entry: Dict[str, Any]) -> str:
+    return entry.get("dateKey") or ""
+
+
+def date_keys(items: List[Dict[str, Any]]) -> Dict[str, str]:
+    return {entry["id"]: sort_key(entry) for entry in items}
+
+
+def insert_position(items: List[Dict[str, Any]], key: str) -> int:
+    """Binary search in newest-first ``items``; equal dates go before existing ones."""
+    lo, hi = 0, len(items)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if sort_key(items[mid]) > key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def find_entry(items: List[Dict[str, Any]], entry_id: str, key: str) -> int:
+    """Index of ``entry_id`` in newest-first ``items``, last stored with date ``key``; -1 if absent.
+
+    Only the entries dated ``key`` are looked at, found by binary search. An
+    entry whose date was edited in place no longer sits where its key says,
+    so that case falls back to a scan.
+    """
+    idx = insert_position(items, key)
+    while idx < len(items) and sort_key(items[idx]) == key:
+        if items[idx].get("id") == entry_id:
+            return idx
+        idx += 1
+    for idx, entry in enumerate(items):
+        if entry.get("id") == entry_id:
+            return idx
+    return -1
+
+
+class NewsStore:
+    """In-memory list of entries backed by a snapshot plus an append-only journal.
+
+    ``items`` is a live list kept newest-first by ``dateKey``: ``put``/``delete``
+    update it in place with a binary-search insert, so callers holding the list
+    returned by ``load()`` always see the current, ordered state and queries
+    by date never need a full scan and sort. Existing entries are found the
+    same way, by the date they were stored with, so a save only touches the
+    entries it is given.
+    """
+
+    def __init__(self, path: Path = NEWS_PATH) -> None:
+        self.path = path
+        self.journal_path = path.with_name(path.stem + ".journal.jsonl")
+        self.lock_path = path.with_name(path.name + ".lock")
+        self.items: List[Dict[str, Any]] = []
+        # Serialized form of each entry as last written, so reload() can tell what changed on disk.
+        self._saved: Dict[str, str] = {}
+        # id -> dateKey each entry of ``items`` was placed by, to find it without a scan.
+        self._keys: Dict[str, str] = {}
+        self._journal_ops = 0
+        self._stamp: tuple = ()
+
+    def disk_stamp(self) -> tuple:
+        """Modification time and size of the snapshot and the journal."""
+        stamp = []
+        for path in (self.path, self.journal_path):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                stamp.append(None)
+            else:
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamp)
+
+    def changed_on_disk(self) -> bool:
+        """True if another process has written since this store last loaded or saved."""
+        return self.disk_stamp() != self._stamp
+
+    def _read_state(self) -> tuple[List[Dict[str, Any]], int, bool]:
+        with span("store.read") as timer:
+            items, ops, outdated = self._read_files()
+            timer.set(items=len(items), journal_ops=ops)
+        return items, ops, outdated
+
+    def _read_files(self) -> tuple[List[Dict[str, Any]], int, bool]:
+        items: List[Dict[str, Any]] = []
+        if self.path.exists():
+            try:
+                with self.path.open("r", encoding="utf-8") as handle:
+                    data = json.load(handle)
+                items, version = read_document(data)
+            except (json.JSONDecodeError, SchemaError) as exc:
+                raise StoreError(str(exc)) from exc
+            # Old files: give entries ids and move them to the current schema.
+            assigned = any([ensure_entry_id(entry) for entry in items])
+            migrated = any([migrate_entry(entry) for entry in items])
+            outdated = assigned or migrated or version < SCHEMA_VERSION
+        else:
+            outdated = False
+        keys = [sort_key(entry) for entry in items]
+        if any(a < b for a, b in zip(keys, keys[1:])):
+            items.sort(key=sort_key, reverse=True)
+        ops = 0
+        if self.journal_path.exists():
+            positions = date_keys(items)
+            with self.journal_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash mid-append leaves at most one partial line.
+                        continue
+                    if isinstance(op, dict):
+                        self._apply(items, op, positions)
+                        ops += 1
+        return items, ops, outdated
+
+    @staticmethod
+    def _apply(items: List[Dict[str, Any]], op: Dict[str, Any], keys: Dict[str, str]) -> None:
+        """Apply one journal operation to ``items``; ``keys`` is its ``date_keys()`` and is kept in step."""
+        kind = op.get("op")
+        if kind == "put" and isinstance(op.get("entry"), dict):
+            entry = op["entry"]
+            entry_id = entry.get("id")
+            key = sort_key(entry)
+            idx = find_entry(items, entry_id, keys[entry_id]) if entry_id in keys else -1
+            keys[entry_id] = key
+            if idx >= 0:
+                # Keep the slot when the date still fits between the neighbours.
+                if (idx == 0 or sort_key(items[idx - 1]) >= key) and (
+                    idx == len(items) - 1 or key >= sort_key(items[idx + 1])
+                ):
+                    items[idx] = entry
+                    return
+                del items[idx]
+            items.insert(insert_position(items, key), entry)
+        elif kind == "delete" and op.get("id") in keys:
+            idx = find_entry(items, op["id"], keys.pop(op["id"]))
+            if idx >= 0:
+                del items[idx]
+
+    def load(self) -> List[Dict[str, Any]]:
+        with file_lock(self.lock_path):
+            items, ops, outdated = self._read_state()
+            if outdated:
+                # Persist assigned ids and schema migrations right away.
+                self._write_snapshot(items)
+                ops = 0
+        self.items[:] = items
+        self._journal_ops = ops
+        self._remember(items)
+        self._stamp = self.disk_stamp()
+        return self.items
+
+    def reload(self) -> tuple[List[Dict[str, Any]], List[str]]:
+        """Re-read from disk and return ``(changed or new entries, removed ids)``."""
+        before = self._saved
+        self.load()
+        changed = [entry for entry in self.items if before.get(entry["id"]) != self._saved[entry["id"]]]
+        removed = [entry_id for entry_id in before if entry_id not in self._saved]
+        return changed, removed
+
+    @staticmethod
+    def _fingerprint(entry: Dict[str, Any]) -> str:
+        return json.dumps(entry, ensure_ascii=False, sort_keys=True)
+
+    def _remember(self, items: List[Dict[str, Any]]) -> None:
+        self._saved = {entry["id"]: self._fingerprint(entry) for entry in items}
+        self._keys = date_keys(items)
+
+    def index_of(self, entry_id: str) -> int:
+        return find_entry(self.items, entry_id, self._keys[entry_id]) if entry_id in self._keys else -1
+
+    def latest(self, count: int) -> List[Dict[str, Any]]:
+        return self.items[:count]
+
+    def between(self, start: str, end: str) -> List[Dict[str, Any]]:
+        """Entries whose ``dateKey`` falls in ``start``..``end`` (ISO dates, inclusive)."""
+        lo = insert_position(self.items, end)
+        # Step back over entries dated exactly ``end``: they sort before the insert point.
+        while lo > 0 and sort_key(self.items[lo - 1]) <= end:
+            lo -= 1
+        hi = insert_position(self.items, start)
+        while hi < len(self.items) and sort_key(self.items[hi]) == start:
+            hi += 1
+        return self.items[lo:hi]
+
+    def year(self, year: int) -> List[Dict[str, Any]]:
+        return self.between(f"{year:04d}-01-01", f"{year:04d}-12-31")
+
+    @staticmethod
+    def _encode(op: Dict[str, Any]) -> bytes:
+        return (json.dumps(op, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def _open_journal(self) -> IO[bytes]:
+        handle = self.journal_path.open("a+b")
+        handle.seek(0, os.SEEK_END)
+        if handle.tell():
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) != b"\n":
+                handle.write(b"\n")
+        return handle
+
+    def _after_append(self, count: int) -> None:
+        self._journal_ops += count
+        if self._should_compact():
+            self._compact_locked()
+        self._stamp = self.disk_stamp()
+
+    def _append(self, ops: List[Dict[str, Any]]) -> None:
+        with span("store.append", ops=len(ops)), file_lock(self.lock_path):
+            with self._open_journal() as handle:
+                handle.write(b"".join(self._encode(op) for op in ops))
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._after_append(len(ops))
+
+    def _should_compact(self) -> bool:
+        if self._journal_ops >= COMPACT_OPS:
+            return True
+        try:
+            journal_size = self.journal_path.stat().st_size
+            snapshot_size = self.path.stat().st_size if self.path.exists() else 0
+        except FileNotFoundError:
+            return False
+        return journal_size > max(snapshot_size, 64 * 1024)
+
+    @staticmethod
+    def _prepare(entry: Dict[str, Any]) -> Dict[str, Any]:
+        ensure_entry_id(entry)
+        apply_date_key(entry)
+        migrate_entry(entry)
+        return {"op": "put", "entry": entry}
+
+    def put(self, entry: Dict[str, Any]) -> int:
+        """Insert or replace ``entry`` (matched by id) at its date position; returns its index."""
+        op = self._prepare(entry)
+        self._append([op])
+        self._apply(self.items, op, self._keys)
+        self._saved[entry["id"]] = self._fingerprint(entry)
+        return self.index_of(entry["id"])
+
+    def delete(self, entry_id: str) -> None:
+        op = {"op": "delete", "id": entry_id}
+        self._append([op])
+        self._apply(self.items, op, self._keys)
+        self._saved.pop(entry_id, None)
+
+    def put_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace entries as one batch: one lock, one fsync.
+
+        ``entries`` may be a generator; each entry is written to the journal as
+        it arrives, so the batch is never held in memory twice. Returns the
+        number of entries written.
+        """
+        count = 0
+        with file_lock(self.lock_path):
+            with self._open_journal() as handle:
+                for entry in entries:
+                    op = self._prepare(entry)
+                    handle.write(self._encode(op))
+                    self._apply(self.items, op, self._keys)
+                    self._saved[entry["id"]] = self._fingerprint(entry)
+                    count += 1
+                handle.flush()
+                os.fsync(handle.fileno())
+            if count:
+                self._after_append(count)
+            elif not self.journal_path.stat().st_size:
+                self.journal_path.unlink()
+        return count
+
+    def rewrite(self, items: List[Dict[str, Any]]) -> None:
+        """Replace the whole archive with ``items`` (sorted by date) in one atomic snapshot."""
+        for entry in items:
+            ensure_entry_id(entry)
+        ordered = sorted(items, key=sort_key, reverse=True)
+        with file_lock(self.lock_path):
+            self._write_snapshot(ordered)
+        self.items[:] = ordered
+        self._remember(ordered)
+
+    def _write_snapshot(self, items: List[Dict[str, Any]]) -> None:
+        atomic_write_text(self.path, dump_snapshot(items))
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._journal_ops = 0
+        self._stamp = self.disk_stamp()
+
+    def _compact_locked(self) -> None:
+        # Replay from disk so operations journaled by another process survive.
+        items, _, _ = self._read_state()
+        self._write_snapshot(items)
+
+    def compact(self) -> None:
+        with file_lock(self.lock_path):
+            self._compact_locked()
+
+
+def main() -> None:
+    store = NewsStore()
+    try:
+        items = store.load()
+    except StoreError as exc:
+        print("อ่าน news.json ไม่ได้ กรุณาตรวจสอบว่าเป็นไฟล์ JSON ที่ถูกต้องก่อน")
+        print(exc)
+        raise SystemExit(1)
+    store.compact()
+    print(f"รวมบันทึกการแก้ไขลง {NEWS_PATH.name} แล้ว ({len(items)} รายการ)")
+
+
+if __name__ == "__main__":
+    main()
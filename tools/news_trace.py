@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Span timers and a profiling mode for update_news.py and news_editor_gui.py.
+
+Hot paths are wrapped with ``@traced()`` or ``with span(...)``. Tracing is
+off by default: a traced call then costs one global check, and ``span()``
+returns a shared no-op object. It is switched on by ``--trace FILE`` on
+either tool, or the ``NEWS_TRACE`` environment variable, and writes one JSON
+line per finished span::
+
+    {"ts": 1760688000.123, "span": "store.read", "ms": 41.2, "thread": "news-io", "parent": "load_news_file", "items": 812}
+
+``FILE`` may be ``-`` for stderr. ``--profile`` runs the session under
+cProfile and tracemalloc (the IOWorker thread included, through
+``profile_thread()``) and writes ``.profile/<tool>-<time>.txt`` with the top
+sites by cumulative and own time, the top allocation sites and a per-span
+total, plus the raw ``.prof`` for pstats or snakeviz.
+
+Run directly to summarize a trace log by span.
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+ROOT = Path(__file__).resolve().parents[1]
+PROFILE_DIR = ROOT / ".profile"
+ENV_VAR = "NEWS_TRACE"
+TOP_SITES = 25
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_lock = threading.Lock()
+_local = threading.local()
+_sink: Optional[IO[str]] = None
+# name -> [count, total seconds, max seconds]; kept while a profile session runs.
+_totals: Optional[Dict[str, List[float]]] = None
+_active = False
+_profilers: List[cProfile.Profile] = []
+
+
+class Span:
+    __slots__ = ("name", "fields", "start", "parent")
+
+    def __init__(self, name: str, fields: Dict[str, Any]) -> None:
+        self.name = name
+        self.fields = fields
+        self.start = 0.0
+        self.parent: Optional[str] = None
+
+    def set(self, **fields: Any) -> None:
+        """Attach fields such as item counts, known only once the work ran."""
+        self.fields.update(fields)
+
+    def __enter__(self) -> "Span":
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, kind: Any, exc: Any, tb: Any) -> None:
+        elapsed = time.perf_counter() - self.start
+        _stack().pop()
+        if kind is not None:
+            self.fields["error"] = kind.__name__
+        _record(self, elapsed)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def set(self, **fields: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, kind: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+def _stack() -> List[str]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _record(span: Span, elapsed: float) -> None:
+    with _lock:
+        if _totals is not None:
+            total = _totals.setdefault(span.name, [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += elapsed
+            total[2] = max(total[2], elapsed)
+        if _sink is not None:
+            record = {
+                "ts": round(time.time(), 3),
+                "span": span.name,
+                "ms": round(elapsed * 1000, 3),
+                "thread": threading.current_thread().name,
+            }
+            if span.parent:
+                record["parent"] = span.parent
+            record.update(span.fields)
+            _sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+            _sink.flush()
+
+
+def enabled() -> bool:
+    return _active
+
+
+def span(name: str, **fields: Any) -> Any:
+    """Time a block: ``with span("store.read") as s: ... s.set(items=n)``."""
+    return Span(name, fields) if _active else NO_SPAN
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator form of ``span()``, named after the function unless ``name`` is given."""
+
+    def decorate(func: F) -> F:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _active:
+                return func(*args, **kwargs)
+            with Span(label, {}):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def _update_active() -> None:
+    global _active
+    _active = _sink is not None or _totals is not None
+
+
+def enable(target: str) -> None:
+    """Log spans to ``target``, a file path (appended to) or ``-`` for stderr."""
+    global _sink
+    with _lock:
+        _sink = sys.stderr if target == "-" else open(target, "a", encoding="utf-8")
+    _update_active()
+
+
+def disable() -> None:
+    global _sink
+    with _lock:
+        if _sink is not None and _sink is not sys.stderr:
+            _sink.close()
+        _sink = None
+    _update_active()
+
+
+@contextmanager
+def profile_thread() -> Iterator[None]:
+    """Profile the current thread too while a ``--profile`` session runs."""
+    if _totals is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        with _lock:
+            _profilers.append(profiler)
+
+
+def _time_section(stats: pstats.Stats, order: str) -> str:
+    out = io.StringIO()
+    stats.stream = out  # type: ignore[attr-defined]
+    stats.sort_stats(order).print_stats(TOP_SITES)
+    return out.getvalue().strip()
+
+
+def _allocation_section(snapshot: tracemalloc.Snapshot) -> str:
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    lines = []
+    for stat in snapshot.statistics("lineno")[:TOP_SITES]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:>10.1f} KiB {stat.count:>9} blocks  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines) or "(ไม่มี)"
+
+
+def _span_section(totals: Dict[str, List[float]]) -> str:
+    lines = [f"{'span':<32} {'calls':>7} {'total ms':>11} {'mean ms':>9} {'max ms':>9}"]
+    for name, (count, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        lines.append(f"{name:<32} {count:>7} {total * 1000:>11.1f} {total * 1000 / count:>9.2f} {longest * 1000:>9.1f}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def profile_session(tool: str) -> Iterator[Path]:
+    """Run the block under cProfile and tracemalloc, then write the summary."""
+    global _totals
+    PROFILE_DIR.mkdir(exist_ok=True)
+    path = PROFILE_DIR / f"{tool}-{datetime.now():%Y%m%d-%H%M%S}.txt"
+    _totals = {}
+    _update_active()
+    tracemalloc.start()
+    started = time.perf_counter()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        wall = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with _lock:
+            totals, _totals = _totals, None
+            others = list(_profilers)
+            _profilers.clear()
+        _update_active()
+
+        stats = pstats.Stats(profiler)
+        for other in others:
+            stats.add(other)
+        stats.dump_stats(str(path.with_suffix(".prof")))
+        sections = [
+            f"{tool}: {wall:.2f} วินาที, หน่วยความจำสูงสุด {peak / 1024 / 1024:.1f} MiB, {len(others) + 1} เธรดที่วัด",
+            "== span ==\n" + _span_section(totals or {}),
+            f"== เวลาสะสม (cumulative) {TOP_SITES} อันดับแรก ==\n" + _time_section(stats, "cumulative"),
+            f"== เวลาในตัวฟังก์ชัน (tottime) {TOP_SITES} อันดับแรก ==\n" + _time_section(stats, "tottime"),
+            f"== จุดจองหน่วยความจำที่ยังค้างอยู่ {TOP_SITES} อันดับแรก ==\n" + _allocation_section(snapshot),
+        ]
+        path.write_text("\n\n".join(sections) + "\n", encoding="utf-8")
+        print(f"บันทึกผลโปรไฟล์ที่ {path.relative_to(ROOT).as_posix()}", file=sys.stderr)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--trace", metavar="FILE", help=f"บันทึกเวลาแต่ละช่วงเป็น JSON ต่อบรรทัด (- คือ stderr, หรือตั้ง {ENV_VAR})")
+    parser.add_argument("--profile", action="store_true", help="วัดด้วย cProfile และ tracemalloc แล้วเขียนสรุปใน .profile/")
+
+
+@contextmanager
+def session(tool: str, args: argparse.Namespace) -> Iterator[None]:
+    """Apply ``--trace``/``--profile`` (from ``add_arguments``) around a tool's run."""
+    target = args.trace or os.environ.get(ENV_VAR)
+    if target:
+        enable(target)
+    try:
+        if args.profile:
+            with profile_session(tool):
+                yield
+        else:
+            yield
+    finally:
+        if target:
+            disable()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="สรุปไฟล์ log จาก --trace ตามชื่อ span")
+    parser.add_argument("log", type=Path, help="ไฟล์ JSON ต่อบรรทัด")
+    args = parser.parse_args()
+
+    totals: Dict[str, List[float]] = {}
+    for line in args.log.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        seconds = record.get("ms", 0) / 1000
+        total = totals.setdefault(record.get("span", "?"), [0, 0.0, 0.0])
+        total[0] += 1
+        total[1] += seconds
+        total[2] = max(total[2], seconds)
+    if not totals:
+        print("ไม่พบข้อมูล span ในไฟล์")
+        return
+    print(_span_section(totals))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""Serve the site locally the way a good static host would, with live reload.
+
+Unlike ``python -m http.server`` this server:
+
+* handles requests on a fixed thread pool (``--jobs``);
+* sends a strong ``ETag`` (SHA-256 of the bytes sent) and answers
+  ``If-None-Match`` with 304;
+* sends ``Cache-Control``. With ``--dist`` it serves ``dist/``, and the
+  fingerprinted files listed in ``asset-manifest.json`` are
+  ``immutable`` for a year. Everything else is ``no-cache``, so the
+  browser revalidates it with the ETag;
+* serves single byte ranges (``Range``/``If-Range``) for video seeking;
+* sends the ``.zst``/``.gz`` sibling written by ``build_dist.py`` when the
+  client accepts it and the sibling is up to date.
+
+Live reload: a watcher thread polls the sources (news.json and its
+journal, ``_pages/``, ``_partials/``, the layouts and ``_icons/``) and
+rebuilds the site when they change (publish, pages, stylesheet and, with
+``--dist``, ``dist/``). When a served file changes, connected pages are
+told over Server-Sent Events at ``/__reload`` and reload themselves. The
+small client script is added to HTML responses, which are then sent
+uncompressed; ``--no-reload`` serves the files byte for byte.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlsplit
+
+from build_css import build_stylesheet
+from build_dist import DIST_DIR, MANIFEST_NAME, SKIP, DistBuilder
+from build_site import PAGES_DIR, PARTIALS_DIR, BuildError, build
+from build_icons import ICONS_DIR, IconError
+from news_store import NEWS_PATH, NewsStore
+from publish_news import publish
+from update_news import load_news
+
+ROOT = Path(__file__).resolve().parents[1]
+RELOAD_PATH = "/__reload"
+RELOAD_SCRIPT = f"<script>new EventSource('{RELOAD_PATH}').onmessage = () => location.reload();</script>\n"
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Best first: (Content-Encoding, file suffix written by build_dist.py).
+ENCODINGS = (("zstd", ".zst"), ("gzip", ".gz"))
+CHUNK_SIZE = 1 << 16
+POLL_SECONDS = 0.5
+# An open event stream holds a worker; it is closed after this long and the
+# browser reconnects on its own.
+STREAM_SECONDS = 30
+KEEPALIVE_SECONDS = 10
+SOURCE_FILES = (ROOT / "_template.html", ROOT / "_home.html", NEWS_PATH, NewsStore(NEWS_PATH).journal_path)
+SOURCE_DIRS = (PAGES_DIR, PARTIALS_DIR, ICONS_DIR)
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+mimetypes.add_type("image/avif", ".avif")
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("application/json", ".json")
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("text/javascript", ".js")
+
+
+@dataclass
+class Representation:
+    """The bytes chosen for one response: a file on disk, or an in-memory body."""
+
+    path: Path
+    size: int
+    etag: str
+    encoding: Optional[str] = None
+    body: Optional[bytes] = None
+
+
+class Reloader:
+    """A version number that changes whenever the served site does."""
+
+    def __init__(self) -> None:
+        self.version = int(time.time() * 1000)
+        self._changed = threading.Condition()
+
+    def notify(self) -> None:
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+
+    def wait(self, version: int, timeout: float) -> int:
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class ETagCache:
+    """Content hashes by path, modification time and size, so files are hashed once."""
+
+    def __init__(self) -> None:
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, stat: os.stat_result) -> str:
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._hashes.get(key)
+        if cached:
+            return cached
+        hasher = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        etag = f'"{hasher.hexdigest()[:32]}"'
+        with self._lock:
+            self._hashes[key] = etag
+        return etag
+
+
+def accepted_encodings(header: str) -> Set[str]:
+    accepted: Set[str] = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = re.search(r"q=([\d.]+)", params)
+        if name and not (quality and float(quality.group(1)) == 0):
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """``(first, last)`` for a single ``bytes=`` range; None when it cannot be satisfied.
+
+    Raises ValueError for headers this server does not handle (several
+    ranges, other units), which are answered with the whole file.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        raise ValueError(header)
+    if not match.group(1):
+        length = int(match.group(2))
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+    first = int(match.group(1))
+    last = int(match.group(2)) if match.group(2) else size - 1
+    if first >= size or last < first:
+        return None
+    return first, min(last, size - 1)
+
+
+def inject_reload(html: bytes) -> bytes:
+    script = RELOAD_SCRIPT.encode("utf-8")
+    index = html.lower().rfind(b"</body>")
+    return html + script if index < 0 else html[:index] + script + html[index:]
+
+
+def snapshot(paths: Iterable[Path]) -> Dict[str, Tuple[int, int]]:
+    state: Dict[str, Tuple[int, int]] = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        state[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def source_files() -> List[Path]:
+    files = list(SOURCE_FILES)
+    for folder in SOURCE_DIRS:
+        files += sorted(path for path in folder.rglob("*") if path.is_file())
+    return files
+
+
+def served_files(root: Path) -> List[Path]:
+    files = [path for path in sorted(root.glob("*.html")) + sorted(root.glob("*.json")) if not path.name.startswith(".")]
+    for folder in ("assets", "news"):
+        files += sorted(path for path in (root / folder).rglob("*") if path.is_file())
+    return files
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands each connection to a fixed pool of worker threads."""
+
+    def __init__(self, address: Tuple[str, int], root: Path, workers: int, live_reload: bool) -> None:
+        super().__init__(address, PreviewHandler)
+        self.root = root
+        self.live_reload = live_reload
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="preview")
+        self.etags = ETagCache()
+        self.reloader = Reloader()
+        self.immutable: Set[str] = set()
+        self.load_manifest()
+
+    def load_manifest(self) -> None:
+        try:
+            with (self.root / MANIFEST_NAME).open("r", encoding="utf-8") as handle:
+                assets = json.load(handle).get("assets", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            assets = {}
+        self.immutable = set(assets.values())
+
+    def process_request(self, request, client_address) -> None:  # type: ignore[override]
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    server: PooledHTTPServer
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections give their worker back after this long.
+    timeout = 15
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - BaseHTTPRequestHandler's signature
+        print(f"{self.address_string()} {format % args}")
+
+    def do_GET(self) -> None:
+        self.respond(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self.respond(send_body=False)
+
+    def resolve(self) -> Optional[Path]:
+        path = unquote(urlsplit(self.path).path)
+        parts = [part for part in posixpath.normpath(path).split("/") if part]
+        # Dotfiles (.git, caches) and traversal are never served.
+        if any(part.startswith(".") for part in parts):
+            return None
+        # Nor are the news journal, its lock file or build bookkeeping.
+        if "/".join(parts) in SKIP:
+            return None
+        target = self.server.root.joinpath(*parts)
+        if target.is_dir():
+            target = target / "index.html"
+        return target if target.is_file() else None
+
+    def representation(self, path: Path) -> Representation:
+        stat = path.stat()
+        if self.server.live_reload and path.suffix == ".html":
+            body = inject_reload(path.read_bytes())
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            return Representation(path, len(body), etag, body=body)
+        if not self.headers.get("Range"):
+            accepted = accepted_encodings(self.headers.get("Accept-Encoding", ""))
+            for encoding, suffix in ENCODINGS:
+                sibling = path.with_name(path.name + suffix)
+                if encoding not in accepted:
+                    continue
+                try:
+                    sibling_stat = sibling.stat()
+                except FileNotFoundError:
+                    continue
+                if sibling_stat.st_mtime_ns >= stat.st_mtime_ns:
+                    etag = self.server.etags.get(sibling, sibling_stat)
+                    return Representation(sibling, sibling_stat.st_size, etag, encoding)
+        return Representation(path, stat.st_size, self.server.etags.get(path, stat))
+
+    def cache_control(self, path: Path) -> str:
+        rel = path.relative_to(self.server.root).as_posix()
+        return IMMUTABLE if rel in self.server.immutable else REVALIDATE
+
+    def respond(self, send_body: bool) -> None:
+        if urlsplit(self.path).path == RELOAD_PATH:
+            self.stream_reloads()
+            return
+        path = self.resolve()
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+        rep = self.representation(path)
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/json", "image/svg+xml", "text/javascript"):
+            content_type += "; charset=utf-8"
+
+        if_none_match = self.headers.get("If-None-Match", "")
+        if rep.etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_common_headers(path, rep)
+            self.end_headers()
+            return
+
+        first, last = 0, rep.size - 1
+        status = HTTPStatus.OK
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and rep.encoding is None and (not if_range or if_range.strip() == rep.etag):
+            try:
+                requested = parse_range(range_header, rep.size)
+            except ValueError:
+                requested = (first, last)
+            else:
+                if requested is None:
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{rep.size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = HTTPStatus.PARTIAL_CONTENT
+            first, last = requested
+
+        self.send_response(status)
+        self.send_common_headers(path, rep)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(max(0, last - first + 1)))
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header("Content-Range", f"bytes {first}-{last}/{rep.size}")
+        self.end_headers()
+        if send_body:
+            self.send_bytes(rep, first, last)
+
+    def send_common_headers(self, path: Path, rep: Representation) -> None:
+        self.send_header("ETag", rep.etag)
+        self.send_header("Cache-Control", self.cache_control(path))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Vary", "Accept-Encoding")
+        if rep.encoding:
+            self.send_header("Content-Encoding", rep.encoding)
+
+    def send_bytes(self, rep: Representation, first: int, last: int) -> None:
+        if rep.body is not None:
+            self.wfile.write(rep.body[first : last + 1])
+            return
+        remaining = last - first + 1
+        with rep.path.open("rb") as handle:
+            handle.seek(first)
+            while remaining > 0:
+                chunk = handle.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+    def stream_reloads(self) -> None:
+        reloader = self.server.reloader
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        # A reconnecting browser sends the last version it saw; reload at once if it is stale.
+        seen = self.headers.get("Last-Event-ID")
+        version = reloader.version
+        try:
+            if seen and seen != str(version):
+                self.wfile.write(f"id: {version}\ndata: reload\n\n".encode("utf-8"))
+                return
+            self.wfile.write(f"retry: 1000\nid: {version}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            deadline = time.monotonic() + STREAM_SECONDS
+            while time.monotonic() < deadline:
+                current = reloader.wait(version, KEEPALIVE_SECONDS)
+                if current != version:
+                    self.wfile.write(f"id: {current}\ndata: reload\n\n".encode("utf-8"))
+                    return
+                self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class Watcher(threading.Thread):
+    """Rebuilds the site when its sources change and tells the pages when served files do."""
+
+    def __init__(self, server: PooledHTTPServer, rebuild: bool, dist: bool, jobs: int) -> None:
+        super().__init__(name="preview-watcher", daemon=True)
+        self.server = server
+        self.rebuild_sources = rebuild
+        self.dist = dist
+        self.jobs = jobs
+        self.stop = threading.Event()
+
+    def rebuild(self) -> None:
+        started = time.perf_counter()
+        try:
+            items = load_news()
+            changed = publish(items) + build(items)
+            build_stylesheet()
+            if self.dist:
+                DistBuilder().run(self.jobs)
+                self.server.load_manifest()
+        except (BuildError, IconError, OSError, ValueError) as exc:
+            print(f"สร้างหน้าเว็บไม่สำเร็จ: {exc}")
+            return
+        print(f"สร้างหน้าเว็บใหม่ ({len(changed)} ไฟล์, {time.perf_counter() - started:.2f} วินาที)")
+
+    def run(self) -> None:
+        sources = snapshot(source_files())
+        served = snapshot(served_files(self.server.root))
+        while not self.stop.wait(POLL_SECONDS):
+            if self.rebuild_sources:
+                current = snapshot(source_files())
+                if current != sources:
+                    sources = current
+                    self.rebuild()
+            current = snapshot(served_files(self.server.root))
+            if current != served:
+                names = {path for path, _ in set(current.items()) ^ set(served.items())}
+                served = current
+                print(f"ไฟล์เปลี่ยน {len(names)} รายการ: สั่งให้หน้าเว็บโหลดใหม่")
+                self.server.reloader.notify()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="เซิร์ฟเวอร์สำหรับดูตัวอย่างเว็บไซต์ในเครื่อง")
+    parser.add_argument("--port", type=int, default=8000, help="พอร์ต (ค่าเริ่มต้น 8000)")
+    parser.add_argument("--bind", default="127.0.0.1", help="ที่อยู่ที่รับการเชื่อมต่อ")
+    parser.add_argument("--dist", action="store_true", help="เสิร์ฟโฟลเดอร์ dist/ แทนไฟล์ต้นฉบับ")
+    parser.add_argument("--jobs", type=int, default=16, help="จำนวนเธรดที่ใช้ตอบคำขอ")
+    parser.add_argument("--no-reload", action="store_true", help="ไม่โหลดหน้าเว็บใหม่อัตโนมัติ")
+    parser.add_argument("--no-build", action="store_true", help="ไม่สร้างหน้าเว็บใหม่เมื่อไฟล์ต้นฉบับเปลี่ยน")
+    args = parser.parse_args()
+
+    root = DIST_DIR if args.dist else ROOT
+    if args.dist and not (DIST_DIR / MANIFEST_NAME).exists():
+        print("ยังไม่มี dist/ ให้รัน python tools/build_dist.py ก่อน")
+        raise SystemExit(1)
+    server = PooledHTTPServer((args.bind, args.port), root, args.jobs, not args.no_reload)
+    watcher = Watcher(server, rebuild=not args.no_build, dist=args.dist, jobs=args.jobs)
+    if not (args.no_reload and args.no_build):
+        watcher.start()
+    print(f"เปิด http://{args.bind}:{args.port}/ (เสิร์ฟ {root}, กด Ctrl+C เพื่อหยุด)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
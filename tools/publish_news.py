@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Publish news.json into small files that the website loads on demand.
+
+Writes ``latest.json`` (card fields for the home page), fixed-size page
+shards ``news/page-N.json`` holding card fields only, one
+``news/items/<id>.json`` per article for the modal, and
+``news/manifest.json`` describing the shards. The search index from
+``news_search.py`` goes to ``news/search/`` and the RSS, Atom and JSON
+feeds from ``news_feeds.py`` to the site root.
+
+Everything here is what visitors download, so it is written minified and in
+the compact form from ``news_schema.published()``.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from news_feeds import publish_feeds
+from news_media import medium_for, thumb_for
+from news_schema import SCHEMA_VERSION, normalize_images, normalize_links, published
+from news_search import build_shards
+from update_news import ROOT, STORE, load_news
+
+PUBLISH_DIR = ROOT / "news"
+ITEMS_DIR = PUBLISH_DIR / "items"
+SEARCH_DIR = PUBLISH_DIR / "search"
+LATEST_PATH = ROOT / "latest.json"
+MANIFEST_PATH = PUBLISH_DIR / "manifest.json"
+PAGE_SIZE = 9
+LATEST_COUNT = 3
+
+
+def card_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
+    images = normalize_images(entry)
+    return published({
+        "id": entry.get("id", ""),
+        "title": entry.get("title", ""),
+        "date": entry.get("date", ""),
+        "tag": entry.get("tag", ""),
+        "by": entry.get("by", ""),
+        "summary": entry.get("summary", ""),
+        "image": thumb_for(entry, images[0]) if images else "",
+    })
+
+
+def full_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return published({
+        "id": entry.get("id", ""),
+        "title": entry.get("title", ""),
+        "date": entry.get("date", ""),
+        "tag": entry.get("tag", ""),
+        "by": entry.get("by", ""),
+        "summary": entry.get("summary", ""),
+        "body": entry.get("body", ""),
+        "images": [medium_for(entry, src) for src in normalize_images(entry)],
+        "links": normalize_links(entry),
+    })
+
+
+def page_path(number: int) -> Path:
+    return PUBLISH_DIR / f"page-{number}.json"
+
+
+def item_path(entry_id: str) -> Path:
+    return ITEMS_DIR / f"{entry_id}.json"
+
+
+def write_json(path: Path, data: Any) -> bool:
+    """Write ``data`` minified to ``path`` unless the file already holds the same bytes."""
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def build_pages(items: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    return [
+        [card_fields(entry) for entry in items[start : start + PAGE_SIZE]]
+        for start in range(0, len(items), PAGE_SIZE)
+    ]
+
+
+def build_latest(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [card_fields(entry) for entry in items[:LATEST_COUNT]]
+
+
+def publish_search(items: List[Dict[str, Any]]) -> List[Path]:
+    changed: List[Path] = []
+    meta, shards = build_shards(items, PAGE_SIZE)
+    current = {"meta.json"}
+    for name, terms in shards.items():
+        path = SEARCH_DIR / f"{name}.json"
+        current.add(path.name)
+        if write_json(path, terms):
+            changed.append(path)
+    if SEARCH_DIR.exists():
+        for path in sorted(SEARCH_DIR.glob("*.json")):
+            if path.name not in current:
+                path.unlink()
+                changed.append(path)
+    if write_json(SEARCH_DIR / "meta.json", meta):
+        changed.append(SEARCH_DIR / "meta.json")
+    return changed
+
+
+def publish(items: List[Dict[str, Any]]) -> List[Path]:
+    # Fold pending journal entries into news.json so the committed snapshot matches the site.
+    if STORE.journal_path.exists():
+        STORE.compact()
+    changed: List[Path] = []
+    pages = build_pages(items)
+    for number, page in enumerate(pages, start=1):
+        if write_json(page_path(number), page):
+            changed.append(page_path(number))
+
+    stale = len(pages) + 1
+    while page_path(stale).exists():
+        page_path(stale).unlink()
+        changed.append(page_path(stale))
+        stale += 1
+
+    current = set()
+    for entry in items:
+        path = item_path(entry["id"])
+        current.add(path.name)
+        if write_json(path, full_fields(entry)):
+            changed.append(path)
+    if ITEMS_DIR.exists():
+        for path in sorted(ITEMS_DIR.glob("*.json")):
+            if path.name not in current:
+                path.unlink()
+                changed.append(path)
+
+    manifest = {
+        "version": 3,
+        "schema": SCHEMA_VERSION,
+        "pageSize": PAGE_SIZE,
+        "total": len(items),
+        "pages": [f"news/{page_path(number).name}" for number in range(1, len(pages) + 1)],
+        "items": "news/items/{id}.json",
+        "search": "news/search/meta.json",
+    }
+    if write_json(MANIFEST_PATH, manifest):
+        changed.append(MANIFEST_PATH)
+    if write_json(LATEST_PATH, build_latest(items)):
+        changed.append(LATEST_PATH)
+    changed.extend(publish_search(items))
+    changed.extend(publish_feeds(items))
+    return changed
+
+
+def main() -> None:
+    items = load_news()
+    changed = publish(items)
+    if not changed:
+        print("ไฟล์ที่เผยแพร่เป็นปัจจุบันอยู่แล้ว")
+        return
+    for path in changed:
+        print(f"อัปเดต {path.relative_to(ROOT).as_posix()}")
+    print(f"เผยแพร่ข่าว {len(items)} รายการแล้ว")
+
+
+if __name__ == "__main__":
+    main()
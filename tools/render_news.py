@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Pre-render news cards from news.json into index.html and news.html.
+
+Cards are written between ``<!-- news-cards:start -->`` and
+``<!-- news-cards:end -->`` inside ``#home-news-list`` and
+``#news-list-page`` so the first paint needs no JavaScript or fetch.
+``build_site.py`` fills them in while it renders the two pages; running this
+script publishes news.json and then rebuilds whatever changed.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from html import escape
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from build_site import build
+from publish_news import LATEST_COUNT, PAGE_SIZE, build_latest, card_fields, publish
+from update_news import ROOT, load_news
+
+START_MARKER = "<!-- news-cards:start -->"
+END_MARKER = "<!-- news-cards:end -->"
+FALLBACK_IMAGE = "./assets/images/img/error_load_picture.jpg"
+DEFAULT_TITLE = "ยังไม่ระบุหัวข้อ"
+DEFAULT_TAG = "ไม่ระบุหมวดหมู่"
+
+
+def render_news_card(n: Dict[str, Any], indent: str) -> List[str]:
+    title = n.get("title") or DEFAULT_TITLE
+    tag = n.get("tag") or DEFAULT_TAG
+    date = n.get("date") or "-"
+    by = f"โดย {n['by']}" if n.get("by") else ""
+    return [
+        f'{indent}<article class="rounded-xl overflow-hidden shadow hover:shadow-xl transition-shadow bg-white cursor-pointer"',
+        f'{indent}  data-id="{escape(n.get("id", ""))}">',
+        f'{indent}  <img src="{escape(n.get("image") or FALLBACK_IMAGE)}" alt="news" class="h-44 w-full object-cover" loading="lazy"/>',
+        f'{indent}  <div class="p-5">',
+        f'{indent}    <div class="flex items-center gap-2 text-xs text-blue-200">',
+        f'{indent}      <span class="inline-flex items-center rounded-full bg-slate-100 px-2 py-0.5">{escape(tag)}</span>',
+        f'{indent}      <span class="flex items-center gap-1"><i data-lucide="calendar-days" class="w-3.5 h-3.5"></i>{escape(date)}</span>',
+        f"{indent}    </div>",
+        f'{indent}    <h3 class="mt-2 font-semibold leading-snug">{escape(title)}</h3>',
+        f'{indent}    <p class="text-sm text-slate-600 mt-2">{escape(n.get("summary") or "")}</p>',
+        f'{indent}    <div class="mt-3 flex items-center justify-between">',
+        f'{indent}      <span class="text-xs text-blue-200">{escape(by)}</span>',
+        f'{indent}      <span class="text-sm inline-flex items-center gap-1 text-blue-700 hover:text-blue-900">',
+        f'{indent}        อ่านรายละเอียด <i data-lucide="external-link" class="w-4 h-4"></i>',
+        f"{indent}      </span>",
+        f"{indent}    </div>",
+        f"{indent}  </div>",
+        f"{indent}</article>",
+    ]
+
+
+def render_home_card(n: Dict[str, Any], indent: str) -> List[str]:
+    title = n.get("title") or DEFAULT_TITLE
+    tag = n.get("tag") or DEFAULT_TAG
+    date = n.get("date") or "-"
+    by = f"โดย {n['by']}" if n.get("by") else ""
+    return [
+        f'{indent}<article class="rounded-xl overflow-hidden shadow hover:shadow-xl transition-shadow bg-white cursor-pointer"',
+        f'{indent}  data-id="{escape(n.get("id", ""))}">',
+        f'{indent}  <img src="{escape(n.get("image") or FALLBACK_IMAGE)}" alt="news" class="h-44 w-full object-cover"/>',
+        f'{indent}  <div class="p-5">',
+        f'{indent}    <div class="flex items-center gap-2 text-xs text-[#C9DAFF]">',
+        f'{indent}      <span class="inline-flex items-center rounded-full bg-slate-100 px-2 py-0.5">{escape(tag)}</span>',
+        f'{indent}      <span class="flex items-center gap-1"><i data-lucide="calendar-days" class="w-3.5 h-3.5"></i>{escape(date)}</span>',
+        f"{indent}    </div>",
+        f'{indent}    <h3 class="mt-2 font-semibold leading-snug">{escape(title)}</h3>',
+        f'{indent}    <div class="mt-3 flex items-center justify-between">',
+        f'{indent}      <span class="text-xs text-[#C9DAFF]">{escape(by)}</span>',
+        f'{indent}      <span class="text-sm inline-flex items-center gap-1 text-[#1D4699] hover:text-[#10254F]">',
+        f'{indent}        อ่านรายละเอียด <i data-lucide="external-link" class="w-4 h-4"></i>',
+        f"{indent}      </span>",
+        f"{indent}    </div>",
+        f"{indent}  </div>",
+        f"{indent}</article>",
+    ]
+
+
+@dataclass
+class CardTarget:
+    path: Path
+    container_id: str
+    select: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+    render: Callable[[Dict[str, Any], str], List[str]]
+
+
+TARGETS = [
+    CardTarget(
+        ROOT / "index.html",
+        "home-news-list",
+        build_latest,
+        render_home_card,
+    ),
+    CardTarget(
+        ROOT / "news.html",
+        "news-list-page",
+        lambda items: [card_fields(entry) for entry in items[:PAGE_SIZE]],
+        render_news_card,
+    ),
+]
+
+
+def replace_cards(html: str, target: CardTarget, cards: List[Dict[str, Any]]) -> str:
+    pattern = re.compile(
+        r'(id="' + re.escape(target.container_id) + r'"[^>]*>.*?)([ \t]*)'
+        + re.escape(START_MARKER) + r".*?" + re.escape(END_MARKER),
+        re.S,
+    )
+    match = pattern.search(html)
+    if not match:
+        raise ValueError(
+            f"ไม่พบ {START_MARKER} ใน #{target.container_id} ของ {target.path.name}"
+        )
+    newline = "\r\n" if "\r\n" in html else "\n"
+    indent = match.group(2)
+    lines = [indent + START_MARKER]
+    for card in cards:
+        lines.extend(target.render(card, indent))
+    lines.append(indent + END_MARKER)
+    return html[: match.start()] + match.group(1) + newline.join(lines) + html[match.end() :]
+
+
+def main() -> None:
+    items = load_news()
+    changed = publish(items) + build(items)
+    if not changed:
+        print("หน้าเว็บและไฟล์ข่าวเป็นปัจจุบันอยู่แล้ว")
+        return
+    for path in changed:
+        print(f"อัปเดต {path.relative_to(ROOT).as_posix()}")
+    print(f"เรนเดอร์การ์ดข่าว {min(len(items), PAGE_SIZE)} รายการ (หน้าแรก {min(len(items), LATEST_COUNT)} รายการ)")
+
+
+if __name__ == "__main__":
+    main()
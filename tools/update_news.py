@@ -1,38 +1,66 @@
 #!/usr/bin/env python3
-"""Interactive helper to add or edit news entries stored in news.json."""
+"""Add, edit, search, import and export news entries stored in news.json.
+
+Without arguments an interactive menu starts. Bulk work uses subcommands::
+
+    python tools/update_news.py import old-archive.jsonl
+    python tools/update_news.py import posts.csv --dry-run
+    python tools/update_news.py export news-backup.csv
+    python tools/update_news.py search อบรม ครั้งที่ 1
+
+JSONL has one entry object per line. CSV uses the columns in ``CSV_FIELDS``;
+``images`` holds one path per line and ``links`` one ``label|url`` per line,
+the same format as the GUI editor.
+
+``--trace FILE`` logs span timings of loads and saves and ``--profile``
+writes a profile summary of the session; see ``news_trace.py``.
+"""
 
 from __future__ import annotations
 
+import argparse
+import csv
+import hashlib
 import json
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterator, List, Set, Tuple
+
+from news_dates import DATE_HINT, parse_news_date
+from news_media import IngestError, attach_variants, ingest_image
+from news_schema import normalize_images, normalize_links
+from news_search import SearchIndex
+from news_store import NewsStore, StoreError
+from news_trace import add_arguments, session, traced
 
 ROOT = Path(__file__).resolve().parents[1]
 NEWS_PATH = ROOT / "news.json"
+STORE = NewsStore(NEWS_PATH)
 
 
+@traced()
 def load_news() -> List[Dict[str, Any]]:
     if not NEWS_PATH.exists():
         print(f"ไม่พบไฟล์ {NEWS_PATH} เมื่อบันทึกจะสร้างไฟล์ใหม่ให้อัตโนมัติ")
-        return []
     try:
-        with NEWS_PATH.open("r", encoding="utf-8") as handle:
-            data = json.load(handle)
-    except json.JSONDecodeError as exc:
+        return STORE.load()
+    except StoreError as exc:
         print("อ่าน news.json ไม่ได้ กรุณาตรวจสอบว่าเป็นไฟล์ JSON ที่ถูกต้องก่อน")
         print(exc)
         sys.exit(1)
-    if not isinstance(data, list):
-        print("รูปแบบ news.json ต้องเป็นลิสต์ของข่าว จะรีเซ็ตเป็นลิสต์ว่าง")
-        return []
-    return data
 
 
-def save_news(items: List[Dict[str, Any]]) -> None:
-    with NEWS_PATH.open("w", encoding="utf-8") as handle:
-        json.dump(items, handle, ensure_ascii=False, indent=2)
-        handle.write("\n")
+@traced()
+def save_news(entries: List[Dict[str, Any]]) -> None:
+    """Journal the changed ``entries`` as one batch; the rest of the archive is not touched."""
+    STORE.put_many(entries)
+    print(f"บันทึกข้อมูลลง {NEWS_PATH} แล้ว")
+
+
+@traced()
+def save_entry(entry: Dict[str, Any]) -> None:
+    STORE.put(entry)
     print(f"บันทึกข้อมูลลง {NEWS_PATH} แล้ว")
 
 
@@ -48,6 +76,27 @@ def list_news(items: List[Dict[str, Any]]) -> None:
     print("")
 
 
+def search_news(items: List[Dict[str, Any]]) -> None:
+    query = input("คำค้น: ").strip()
+    if query:
+        show_search_results(items, query)
+
+
+def show_search_results(items: List[Dict[str, Any]], query: str) -> int:
+    """Print the entries matching ``query``, best first; returns how many matched."""
+    positions = {entry["id"]: idx for idx, entry in enumerate(items, start=1)}
+    results = SearchIndex.build(items).search(query)
+    if not results:
+        print("ไม่พบข่าวที่ตรงกับคำค้น")
+        return 0
+    print(f"\nพบ {len(results)} รายการ (หมายเลขตามรายการข่าว ใช้กับเมนูแก้ไขได้):")
+    for entry_id in results:
+        entry = items[positions[entry_id] - 1]
+        print(f" {positions[entry_id]:>2}. {entry.get('date', '-')} | {entry.get('title', '(ไม่มีชื่อข่าว)')}")
+    print("")
+    return len(results)
+
+
 def prompt_text(label: str, default: str = "", required: bool = False) -> str:
     while True:
         hint = f" [{default}]" if default else ""
@@ -62,6 +111,14 @@ def prompt_text(label: str, default: str = "", required: bool = False) -> str:
         return value
 
 
+def prompt_date(label: str, default: str = "") -> str:
+    while True:
+        value = prompt_text(label, default, required=True)
+        if parse_news_date(value):
+            return value
+        print(f"อ่านวันที่ไม่ได้ {DATE_HINT}")
+
+
 def prompt_multiline(label: str, default: str = "", required: bool = False) -> str:
     while True:
         print(f"{label}:")
@@ -91,37 +148,6 @@ def prompt_multiline(label: str, default: str = "", required: bool = False) -> s
         print("ข้อความต้องไม่ว่าง")
 
 
-def normalize_images(entry: Dict[str, Any]) -> List[str]:
-    value = entry.get("images")
-    if isinstance(value, list):
-        items = [str(v).strip() for v in value if str(v).strip()]
-        if items:
-            return items
-    single = str(entry.get("image", "")).strip()
-    return [single] if single else []
-
-
-def normalize_links(entry: Dict[str, Any]) -> List[Dict[str, str]]:
-    result: List[Dict[str, str]] = []
-    value = entry.get("links")
-    if isinstance(value, list):
-        for item in value:
-            if isinstance(item, dict):
-                url = str(item.get("url", "")).strip()
-                label = str(item.get("label", "")).strip()
-                if url:
-                    result.append({"label": label, "url": url})
-            elif isinstance(item, str):
-                url = item.strip()
-                if url:
-                    result.append({"label": "", "url": url})
-    link = str(entry.get("link", "")).strip()
-    if link and not result:
-        label = str(entry.get("linkLabel", "")).strip()
-        result.append({"label": label, "url": link})
-    return result
-
-
 def show_images(images: List[str]) -> None:
     if not images:
         print("  - ยังไม่มีรูปภาพ")
@@ -146,11 +172,20 @@ def prompt_images(current: List[str]) -> List[str]:
     if answer != "y":
         return current
     print("พิมพ์พาธรูปภาพทีละบรรทัด (เช่น ./assets/images/news-4.jpg). กด Enter เปล่าเพื่อจบ")
+    print("ไฟล์ที่อยู่นอก assets/ จะถูกคัดลอกเข้า assets/news/originals/ ให้อัตโนมัติ")
     items: List[str] = []
     while True:
         path = input("รูปภาพ: ").strip()
         if not path:
             break
+        picked = Path(path).expanduser()
+        if "://" not in path and picked.is_file():
+            try:
+                path, reused = ingest_image(picked)
+            except IngestError as exc:
+                print(exc)
+                continue
+            print(f"  ใช้ไฟล์ที่มีอยู่แล้ว {path}" if reused else f"  คัดลอกเป็น {path}")
         items.append(path)
     return items
 
@@ -174,22 +209,17 @@ def prompt_links(current: List[Dict[str, str]]) -> List[Dict[str, str]]:
     return items
 
 
+@traced()
 def apply_media_fields(entry: Dict[str, Any], images: List[str], links: List[Dict[str, str]]) -> None:
     entry["images"] = images
-    entry["image"] = images[0] if images else ""
+    attach_variants(entry, images)
     entry["links"] = links
-    if links:
-        entry["link"] = links[0]["url"]
-        entry["linkLabel"] = links[0].get("label", "")
-    else:
-        entry["link"] = ""
-        entry["linkLabel"] = ""
 
 
 def add_entry(items: List[Dict[str, Any]]) -> None:
     print("\n== เพิ่มข่าวใหม่ ==")
     title = prompt_text("หัวข้อข่าว", required=True)
-    date = prompt_text("วันที่ (เช่น 17 พ.ย. 2567)", required=True)
+    date = prompt_date("วันที่ (เช่น 17 พ.ย. 2567)")
     tag = prompt_text("ป้ายกำกับ", "ข่าว/ประกาศ")
     author = prompt_text("ผู้เขียน/ผู้เผยแพร่")
     summary = prompt_text("สรุปสั้น ๆ 1 ย่อหน้า")
@@ -206,8 +236,7 @@ def add_entry(items: List[Dict[str, Any]]) -> None:
         "body": body,
     }
     apply_media_fields(entry, images, links)
-    items.insert(0, entry)
-    save_news(items)
+    save_entry(entry)
 
 
 def select_entry(items: List[Dict[str, Any]]) -> int:
@@ -235,7 +264,7 @@ def edit_entry(items: List[Dict[str, Any]]) -> None:
         return
     entry = items[idx]
     entry["title"] = prompt_text("หัวข้อข่าว", entry.get("title", ""), required=True)
-    entry["date"] = prompt_text("วันที่", entry.get("date", ""), required=True)
+    entry["date"] = prompt_date("วันที่", entry.get("date", ""))
     entry["tag"] = prompt_text("ป้ายกำกับ", entry.get("tag", "ข่าว/ประกาศ"))
     entry["by"] = prompt_text("ผู้เขียน/ผู้เผยแพร่", entry.get("by", ""))
     entry["summary"] = prompt_text("สรุปสั้น ๆ", entry.get("summary", ""))
@@ -243,17 +272,198 @@ def edit_entry(items: List[Dict[str, Any]]) -> None:
     images = prompt_images(normalize_images(entry))
     links = prompt_links(normalize_links(entry))
     apply_media_fields(entry, images, links)
-    save_news(items)
+    save_entry(entry)
 
 
-def main() -> None:
+CSV_FIELDS = ["id", "title", "date", "tag", "by", "summary", "body", "images", "links"]
+
+
+def content_hash(entry: Dict[str, Any]) -> str:
+    """Identity of an entry's content, used to spot re-imported posts without an id."""
+    key = "\n".join(" ".join(str(entry.get(field, "")).split()) for field in ("title", "date", "body"))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def record_hash(record: Dict[str, Any]) -> str:
+    fields = {key: record.get(key, "") for key in ("title", "date", "tag", "by", "summary", "body", "images", "links")}
+    return hashlib.sha1(json.dumps(fields, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def csv_to_record(row: Dict[str, str]) -> Dict[str, Any]:
+    record: Dict[str, Any] = {key: (value or "").strip() for key, value in row.items() if key}
+    record["images"] = [line.strip() for line in record.get("images", "").splitlines() if line.strip()]
+    links = []
+    for line in record.get("links", "").splitlines():
+        label, _, url = line.rpartition("|") if "|" in line else ("", "", line)
+        if url.strip():
+            links.append({"label": label.strip(), "url": url.strip()})
+    record["links"] = links
+    return record
+
+
+def record_to_csv(entry: Dict[str, Any]) -> Dict[str, str]:
+    row = {field: str(entry.get(field, "")) for field in CSV_FIELDS}
+    row["images"] = "\n".join(normalize_images(entry))
+    row["links"] = "\n".join(
+        f"{link['label']}|{link['url']}" if link.get("label") else link["url"] for link in normalize_links(entry)
+    )
+    return row
+
+
+@contextmanager
+def open_stream(path: str, mode: str, encoding: str = "utf-8") -> Iterator[IO[str]]:
+    if path == "-":
+        yield sys.stdin if mode == "r" else sys.stdout
+        return
+    with open(path, mode, encoding=encoding, newline="") as handle:
+        yield handle
+
+
+def detect_format(path: str, fmt: str | None) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(path: str, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield ``(line number, record)`` one at a time; bad JSON lines yield the error text."""
+    if fmt == "csv":
+        with open_stream(path, "r", encoding="utf-8-sig") as handle:
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, csv_to_record(row)
+        return
+    with open_stream(path, "r") as handle:
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield number, f"JSON ไม่ถูกต้อง: {exc.msg}"
+
+
+def import_entries(
+    records: Iterator[Tuple[int, Any]], existing: List[Dict[str, Any]], stats: Dict[str, int]
+) -> Iterator[Tuple[Dict[str, Any], List[str], List[Dict[str, str]]]]:
+    """Validate and de-duplicate records, yielding ``(entry, images, links)`` to write.
+
+    Records with a known ``id`` replace that entry when anything in it differs.
+    Records without one are skipped when the same title, date and body is
+    already stored or appeared earlier in the input. Only hashes are kept per
+    record, so memory does not grow with the size of the input text.
+    """
+    stored = {entry["id"]: record_hash(export_record(entry)) for entry in existing}
+    seen_hashes: Set[str] = {content_hash(entry) for entry in existing}
+    seen_ids: Set[str] = set()
+    for number, record in records:
+        if not isinstance(record, dict):
+            stats["invalid"] += 1
+            print(f"บรรทัด {number}: {record if isinstance(record, str) else 'ไม่ใช่ออบเจ็กต์ข่าว'}")
+            continue
+        entry: Dict[str, Any] = {
+            "id": str(record.get("id", "") or "").strip(),
+            "title": str(record.get("title", "") or "").strip(),
+            "date": str(record.get("date", "") or "").strip(),
+            "tag": str(record.get("tag", "") or "").strip() or "ข่าว/ประกาศ",
+            "by": str(record.get("by", "") or "").strip(),
+            "summary": str(record.get("summary", "") or "").strip(),
+            "body": str(record.get("body", "") or "").strip(),
+        }
+        if not entry["title"] or not entry["body"]:
+            stats["invalid"] += 1
+            print(f"บรรทัด {number}: ต้องมี title และ body")
+            continue
+        if parse_news_date(entry["date"]) is None:
+            stats["invalid"] += 1
+            print(f"บรรทัด {number}: อ่านวันที่ไม่ได้ '{entry['date']}' ({DATE_HINT})")
+            continue
+        images, links = normalize_images(record), normalize_links(record)
+        digest = content_hash(entry)
+        if entry["id"]:
+            if entry["id"] in seen_ids:
+                stats["duplicate"] += 1
+                continue
+            seen_ids.add(entry["id"])
+            if stored.get(entry["id"]) == record_hash({**entry, "images": images, "links": links}):
+                stats["unchanged"] += 1
+                continue
+            stats["updated" if entry["id"] in stored else "added"] += 1
+        else:
+            if digest in seen_hashes:
+                stats["duplicate"] += 1
+                continue
+            stats["added"] += 1
+        seen_hashes.add(digest)
+        yield entry, images, links
+
+
+def with_media(batch: Iterator[Tuple[Dict[str, Any], List[str], List[Dict[str, str]]]]) -> Iterator[Dict[str, Any]]:
+    for entry, images, links in batch:
+        apply_media_fields(entry, images, links)
+        yield entry
+
+
+def run_import(path: str, fmt: str | None, dry_run: bool) -> None:
+    items = load_news()
+    stats = {"added": 0, "updated": 0, "unchanged": 0, "duplicate": 0, "invalid": 0}
+    batch = import_entries(read_records(path, detect_format(path, fmt)), items, stats)
+    if dry_run:
+        for _ in batch:
+            pass
+    else:
+        # One journal batch for the whole file: a single lock and fsync.
+        STORE.put_many(with_media(batch))
+    prefix = "ทดลองนำเข้า (ไม่บันทึก)" if dry_run else "นำเข้าเสร็จ"
+    print(
+        f"{prefix}: เพิ่ม {stats['added']} แก้ไข {stats['updated']} เหมือนเดิม {stats['unchanged']} "
+        f"ซ้ำ {stats['duplicate']} ไม่ถูกต้อง {stats['invalid']}"
+    )
+    if stats["invalid"] and not dry_run:
+        print("รายการที่ไม่ถูกต้องถูกข้าม แก้ไขแล้วนำเข้าซ้ำได้ รายการที่นำเข้าแล้วจะไม่ซ้ำ")
+
+
+def export_record(entry: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": entry.get("id", ""),
+        "title": entry.get("title", ""),
+        "date": entry.get("date", ""),
+        "tag": entry.get("tag", ""),
+        "by": entry.get("by", ""),
+        "summary": entry.get("summary", ""),
+        "body": entry.get("body", ""),
+        "images": normalize_images(entry),
+        "links": normalize_links(entry),
+    }
+
+
+def run_export(path: str, fmt: str | None) -> None:
+    items = load_news()
+    fmt = detect_format(path, fmt)
+    # Excel needs the BOM to read Thai text in a CSV file as UTF-8.
+    encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+    with open_stream(path, "w", encoding=encoding) as handle:
+        if fmt == "csv":
+            writer = csv.DictWriter(handle, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for entry in items:
+                writer.writerow(record_to_csv(entry))
+        else:
+            for entry in items:
+                handle.write(json.dumps(export_record(entry), ensure_ascii=False) + "\n")
+    if path != "-":
+        print(f"ส่งออกข่าว {len(items)} รายการไปที่ {path}", file=sys.stderr)
+
+
+def interactive() -> None:
     items = load_news()
     while True:
         print("\n====== เมนูจัดการข่าว ======")
         print("1. แสดงรายการข่าว")
         print("2. เพิ่มข่าวใหม่")
         print("3. แก้ไขข่าวที่มีอยู่")
-        print("4. ออกจากโปรแกรม")
+        print("4. ค้นหาข่าว")
+        print("5. ออกจากโปรแกรม")
         choice = input("เลือกหมายเลขเมนู: ").strip()
         if choice == "1":
             list_news(items)
@@ -262,10 +472,39 @@ def main() -> None:
         elif choice == "3":
             edit_entry(items)
         elif choice == "4":
+            search_news(items)
+        elif choice == "5":
             print("จบการทำงาน")
             break
         else:
-            print("กรุณาเลือกเมนู 1-4")
+            print("กรุณาเลือกเมนู 1-5")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="จัดการข่าวใน news.json (ไม่ใส่คำสั่งเพื่อเปิดเมนู)")
+    add_arguments(parser)
+    commands = parser.add_subparsers(dest="command")
+    importer = commands.add_parser("import", help="นำเข้าข่าวจากไฟล์ JSONL หรือ CSV")
+    importer.add_argument("path", help="ไฟล์ต้นทาง (ใช้ - สำหรับ stdin)")
+    importer.add_argument("--format", choices=["jsonl", "csv"], help="ระบุรูปแบบไฟล์ (ค่าเริ่มต้นดูจากนามสกุล)")
+    importer.add_argument("--dry-run", action="store_true", help="ตรวจสอบอย่างเดียว ไม่บันทึก")
+    exporter = commands.add_parser("export", help="ส่งออกข่าวเป็น JSONL หรือ CSV")
+    exporter.add_argument("path", help="ไฟล์ปลายทาง (ใช้ - สำหรับ stdout)")
+    exporter.add_argument("--format", choices=["jsonl", "csv"], help="ระบุรูปแบบไฟล์ (ค่าเริ่มต้นดูจากนามสกุล)")
+    searcher = commands.add_parser("search", help="ค้นหาข่าว (ไม่พบจะจบด้วยสถานะ 1)")
+    searcher.add_argument("query", nargs="+", help="คำค้น")
+    args = parser.parse_args()
+
+    with session("update_news", args):
+        if args.command == "import":
+            run_import(args.path, args.format, args.dry_run)
+        elif args.command == "export":
+            run_export(args.path, args.format)
+        elif args.command == "search":
+            if not show_search_results(load_news(), " ".join(args.query)):
+                sys.exit(1)
+        else:
+            interactive()
 
 
 if __name__ == "__main__":